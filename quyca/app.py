@@ -9,6 +9,8 @@ from sentry_sdk.integrations.flask import FlaskIntegration
 
 from application.routes.router import router, limiter
 from config import Settings
+from quyca.domain.services import plot_cache_service, query_profile_service
+from quyca.infrastructure.repositories import hierarchy_repository, loader_repository
 
 
 def create_app() -> Flask:
@@ -32,9 +34,18 @@ def create_app() -> Flask:
 
     JWTManager(app_factory)
 
+    app_factory.before_request(loader_repository.start_loader_cache)
+    app_factory.before_request(query_profile_service.start_request_profile)
+    app_factory.before_request(plot_cache_service.start_plot_cache_outcome)
+    app_factory.after_request(plot_cache_service.set_plot_cache_header)
+    app_factory.teardown_request(loader_repository.clear_loader_cache)
+    hierarchy_repository.load_hierarchy_index()
+
     CORS(app_factory)
     app_factory.register_blueprint(router)
     Compress(app_factory)
+    # Registered after Compress so it runs before it and the body it wraps is not compressed yet.
+    app_factory.after_request(query_profile_service.set_profile_headers)
     return app_factory
 
 
@@ -10,6 +10,7 @@ from domain.services import (
     affiliation_service,
     project_service,
     affiliation_plot_service,
+    plot_batch_service,
     csv_service,
     patent_service,
     news_service,
@@ -88,6 +89,33 @@ def get_affiliation_research_products(affiliation_type: str, affiliation_id: str
         return jsonify({"error": str(e)}), 400
 
 
+"""
+@api {get} /app/affiliations/:affiliation_type/:affiliation_id/research/products/plots Get plots batch by affiliation
+@apiName GetAffiliationResearchProductsPlots
+@apiGroup Affiliation
+@apiVersion 1.0.0
+@apiDescription Calcula varios gráficos de los productos de una afiliación en paralelo y los envía en formato NDJSON,
+una línea {"plot", "data"} (o {"plot", "error"}) por gráfico a medida que cada uno termina.
+
+@apiParam {String} affiliation_type Tipo de afiliación (ej. "institution", "department").
+@apiParam {String} affiliation_id ID de la afiliación.
+@apiQuery {String} plots Nombres de los gráficos separados por comas (ej. "annual_citation_count,products_by_subject").
+"""
+
+
+@affiliation_app_router.route("/<affiliation_type>/<affiliation_id>/research/products/plots", methods=["GET"])
+def get_affiliation_research_products_plots(
+    affiliation_type: str, affiliation_id: str
+) -> Response | Tuple[Response, int]:
+    try:
+        query_params = QueryParams(**request.args)
+        data = plot_batch_service.get_affiliation_plots(affiliation_id, affiliation_type, query_params)
+        return Response(data, content_type="application/x-ndjson")
+    except Exception as e:
+        capture_exception(e)
+        return jsonify({"error": str(e)}), 400
+
+
 """
 @api {get} /app/affiliations/:affiliation_type/:affiliation_id/research/products/filters Get works filters by affiliation
 @apiName GetAffiliationResearchProductsFilters
@@ -122,6 +150,9 @@ def get_affiliation_research_products_filters(
 
 @apiParam {String} affiliation_type Tipo de afiliación (ej. "institution", "department").
 @apiParam {String} affiliation_id ID de la afiliación.
+@apiQuery {String="csv","ndjson","parquet","arrow"} [format=csv] Formato del archivo; parquet y arrow requieren pyarrow.
+@apiQuery {String} [columns] Columnas a exportar separadas por comas; por defecto todas.
+@apiQuery {String="gzip"} [compression] Comprime el CSV o NDJSON con gzip mientras se envía.
 """
 
 
@@ -130,8 +161,10 @@ def get_works_csv_by_affiliation(affiliation_type: str, affiliation_id: str) ->
     try:
         query_params = QueryParams(**request.args)
         data = csv_service.get_works_csv_by_affiliation(affiliation_id, query_params)
-        response = Response(data, content_type="text/csv")
-        response.headers["Content-Disposition"] = "attachment; filename=affiliation.csv"
+        response = Response(data, content_type=csv_service.get_content_type(query_params))
+        response.headers["Content-Disposition"] = (
+            f"attachment; filename={csv_service.get_file_name('affiliation', query_params)}"
+        )
         return response
     except Exception as e:
         capture_exception(e)
@@ -9,6 +9,7 @@ from quyca.domain.services import (
     person_service,
     project_service,
     person_plot_service,
+    plot_batch_service,
     csv_service,
     patent_service,
     news_service,
@@ -62,6 +63,30 @@ def get_person_research_products(person_id: str) -> Response | Tuple[Response, i
         return jsonify({"error": str(e)}), 400
 
 
+"""
+@api {get} /app/person/:person_id/research/products/plots Get plots batch by person
+@apiName GetPersonResearchProductsPlots
+@apiGroup Person
+@apiVersion 1.0.0
+@apiDescription Calcula varios gráficos de los productos de un autor en paralelo y los envía en formato NDJSON,
+una línea {"plot", "data"} (o {"plot", "error"}) por gráfico a medida que cada uno termina.
+
+@apiParam {String} person_id ID del autor.
+@apiQuery {String} plots Nombres de los gráficos separados por comas (ej. "annual_citation_count,products_by_subject").
+"""
+
+
+@person_app_router.route("/<person_id>/research/products/plots", methods=["GET"])
+def get_person_research_products_plots(person_id: str) -> Response | Tuple[Response, int]:
+    try:
+        query_params = QueryParams(**request.args)
+        data = plot_batch_service.get_person_plots(person_id, query_params)
+        return Response(data, content_type="application/x-ndjson")
+    except Exception as e:
+        capture_exception(e)
+        return jsonify({"error": str(e)}), 400
+
+
 """
 @api {get} /app/person/:person_id/research/products/filters Get person research products filters
 @apiName GetPersonResearchProductsFilters
@@ -92,6 +117,9 @@ def get_person_research_products_filters(person_id: str) -> Response | Tuple[Res
 @apiDescription Obtiene los productos bibliográficos de un autor en formato CSV.
 
 @apiParam {String} person_id ID del autor.
+@apiQuery {String="csv","ndjson","parquet","arrow"} [format=csv] Formato del archivo; parquet y arrow requieren pyarrow.
+@apiQuery {String} [columns] Columnas a exportar separadas por comas; por defecto todas.
+@apiQuery {String="gzip"} [compression] Comprime el CSV o NDJSON con gzip mientras se envía.
 """
 
 
@@ -100,8 +128,10 @@ def get_works_csv_by_person(person_id: str) -> Response | Tuple[Response, int]:
     try:
         query_params = QueryParams(**request.args)
         data = csv_service.get_works_csv_by_person(person_id, query_params)
-        response = Response(data, content_type="text/csv")
-        response.headers["Content-Disposition"] = "attachment; filename=affiliation.csv"
+        response = Response(data, content_type=csv_service.get_content_type(query_params))
+        response.headers["Content-Disposition"] = (
+            f"attachment; filename={csv_service.get_file_name('affiliation', query_params)}"
+        )
         return response
     except Exception as e:
         capture_exception(e)
@@ -128,6 +128,7 @@ def get_source_by_id(source_id: str) -> Response | Tuple[Response, int]:
 @apiQuery {Number} [page=1] Número de la página.
 @apiQuery {Number} [max=10] Número máximo de resultados.
 @apiQuery {String} [sort] Campo a ordenar (citations, products, alphabetical). dirección del ordenamiento (asc/desc).
+@apiQuery {String} [cursor] Paginación por cursor: vacío para la primera página y luego el valor de next_cursor de la respuesta anterior.
 
 @apiSuccessExample {json} Respues exitosa:
 HTTP/1.1 200 OK
@@ -423,6 +424,9 @@ def get_source_products_filters(source_id: str) -> Response | Tuple[Response, in
 @apiDescription Obtiene los productos bibliográficos de una fuente en formato CSV.
 
 @apiParam {String} source_id ID de la afiliación.
+@apiQuery {String="csv","ndjson","parquet","arrow"} [format=csv] Formato del archivo; parquet y arrow requieren pyarrow.
+@apiQuery {String} [columns] Columnas a exportar separadas por comas; por defecto todas.
+@apiQuery {String="gzip"} [compression] Comprime el CSV o NDJSON con gzip mientras se envía.
 
 @apiSuccessExample {csv} Success-Response:
 HTTP/1.1 200 OK
@@ -436,8 +440,10 @@ def get_works_csv_by_source(source_id: str) -> Response | Tuple[Response, int]:
     try:
         query_params = QueryParams(**request.args)
         data = csv_service.get_works_csv_by_source(source_id, query_params)
-        response = Response(data, content_type="text/csv")
-        response.headers["Content-Disposition"] = "attachment; filename=source_works.csv"
+        response = Response(data, content_type=csv_service.get_content_type(query_params))
+        response.headers["Content-Disposition"] = (
+            f"attachment; filename={csv_service.get_file_name('source_works', query_params)}"
+        )
         return response
     except Exception as e:
         capture_exception(e)
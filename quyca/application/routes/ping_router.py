@@ -1,6 +1,8 @@
 from flask import Blueprint
 
 from config import settings
+from quyca.domain.services import plot_cache_service
+from quyca.infrastructure.mongo import get_pool_metrics
 
 ping_router = Blueprint("ping_router", __name__)
 
@@ -10,3 +12,15 @@ def read_root() -> dict:
     """Ping the API."""
     result = {"ping": str(settings.MONGO_URI)}
     return result
+
+
+@ping_router.route("/ping/mongo", methods=["GET"])
+def read_mongo_pool() -> dict:
+    """Live connection pool metrics of the MongoDB client in this worker."""
+    return get_pool_metrics()
+
+
+@ping_router.route("/ping/plots", methods=["GET"])
+def read_plot_cache() -> dict:
+    """Hit and miss counters of the plot cache in this worker."""
+    return plot_cache_service.get_plot_cache_stats()
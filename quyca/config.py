@@ -39,6 +39,29 @@ class Settings(BaseSettings):
     MONGO_CALCULATIONS_DATABASE: str
     MONGO_IMPACTU_DATABASE: str
     MONGO_URI: Optional[MongoDsn] = None
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MIN_POOL_SIZE: int = 0
+    MONGO_MAX_IDLE_TIME_MS: Optional[int] = None
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = None
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 30000
+    MONGO_CONNECT_TIMEOUT_MS: int = 20000
+    MONGO_COMPRESSORS: str = ""
+    MONGO_READ_PREFERENCE: str = "primary"
+
+    DB_UPDATE_CHECK_SECONDS: int = 60
+    PAGE_FACET_MAX_MATCH_SIZE: int = 20000
+    PAGE_FACET_ESTIMATES_CACHE_SIZE: int = 50000
+    PLOT_BATCH_MAX_WORKERS: int = 4
+    PLOT_BATCH_MAX_PLOTS: int = 30
+    PLOT_CACHE_ENABLED: bool = True
+    PLOT_CACHE_MAX_BYTES: int = 33554432
+    PLOT_CACHE_MAX_ENTRY_BYTES: int = 4194304
+    EXPORT_BATCH_SIZE: int = 2000
+    EXPORT_RAW_ROWS: bool = True
+    QUERY_PROFILE_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: int = 2000
+    SLOW_QUERY_MODULES: str = "work_repository,plot_repository,news_repository"
+    SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS: int = 3600
 
     ES_SERVER: str
     ES_USERNAME: str
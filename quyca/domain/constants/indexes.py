@@ -0,0 +1,75 @@
+"""
+Declarative catalog of the indexes the repositories rely on, by database ("main" for MONGO_DATABASE and
+"calculations" for MONGO_CALCULATIONS_DATABASE) and collection.
+
+Each index is its list of (field, direction) keys, with "text" as direction for text indexes. A collection
+holds a single text index, whose fields are owned by the ETL, so any text index satisfies a text entry.
+quyca_indexes.py compares the catalog with a database and builds the missing indexes.
+"""
+
+ASCENDING = 1
+DESCENDING = -1
+TEXT = "text"
+
+SORT_KEYS_INDEXES: dict[str, list[list[tuple]]] = {
+    "works": [
+        [(prefix, ASCENDING), (sort_key, DESCENDING), ("_id", DESCENDING)]
+        for prefix in ["authors.affiliations.id", "authors.id", "source.id"]
+        for sort_key in ["citations_count_openalex", "sort_year", "sort_title"]
+    ]
+    + [[(sort_key, DESCENDING), ("_id", DESCENDING)] for sort_key in ["citations_count_openalex", "sort_year"]],
+    "sources": [
+        [("citations_count_openalex", DESCENDING), ("_id", DESCENDING)],
+        [("sort_name", ASCENDING), ("_id", ASCENDING)],
+    ],
+}
+
+index_catalog: dict[str, dict[str, list[list[tuple]]]] = {
+    "main": {
+        "works": [
+            [("authors.id", ASCENDING)],
+            [("authors.affiliations.id", ASCENDING)],
+            [("groups.id", ASCENDING)],
+            [("source.id", ASCENDING)],
+            [("year_published", ASCENDING)],
+            [("types.source", ASCENDING), ("types.type", ASCENDING), ("types.code", ASCENDING)],
+            [("primary_topic.id", ASCENDING)],
+            [("titles.title", TEXT)],
+            *SORT_KEYS_INDEXES["works"],
+        ],
+        "person": [
+            [("affiliations.id", ASCENDING)],
+            [("_id_old", ASCENDING)],
+            [("full_name", TEXT)],
+        ],
+        "affiliations": [
+            [("relations.id", ASCENDING)],
+            [("types.type", ASCENDING)],
+            [("names.name", TEXT)],
+        ],
+        "sources": [
+            [("types.type", ASCENDING)],
+            [("names.name", TEXT)],
+            *SORT_KEYS_INDEXES["sources"],
+        ],
+        "patents": [
+            [("authors.affiliations.id", ASCENDING)],
+            [("titles.title", TEXT)],
+        ],
+        "projects": [
+            [("authors.affiliations.id", ASCENDING)],
+            [("titles.title", TEXT)],
+        ],
+        "news_professors_collection": [[("professor_id", ASCENDING)]],
+        "news_urls_collection": [[("url_id", ASCENDING)]],
+        "news_media_collection": [[("medium_id", ASCENDING)]],
+    },
+    "calculations": {
+        "plots_cache": [[("db_update", ASCENDING)]],
+        "works_filters": [[("db_update", ASCENDING)]],
+        "sources_profile": [[("db_update", ASCENDING)]],
+        "affiliations_groups": [[("db_update", ASCENDING)]],
+        "postcalculations": [[("db_update", ASCENDING)]],
+        "query_diagnostics": [[("total_ms", DESCENDING)]],
+    },
+}
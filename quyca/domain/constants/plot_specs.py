@@ -0,0 +1,140 @@
+"""
+Declarative specs of the plots computed server side over the works collection.
+
+Each spec holds the "match" applied after the entity and product filters and the "stages" that fold the
+matching works into the final buckets of the plot. Buckets come out with the keys the parsers expect
+("x"/"y"/"type" for bar plots and "name"/"value" for pie plots), so the parsers only label them and add
+percentages. Missing values are emitted as "no_info" or "no_year" and labelled by the parsers.
+"""
+
+from quyca.domain.constants.articles_types import articles_types_list
+
+
+IS_OPEN_ACCESS = {"$ifNull": ["$open_access.is_open_access", None]}
+YEAR_PUBLISHED = {"$ifNull": ["$year_published", None]}
+
+plot_specs: dict[str, dict] = {
+    "annual_evolution_by_scienti_classification": {
+        "match": {"year_published": {"$nin": [None, 0, ""]}},
+        "stages": [
+            {"$unwind": "$types"},
+            {"$match": {"types.source": "scienti", "types.level": 2}},
+            {"$group": {"_id": {"x": "$year_published", "type": "$types.type"}, "y": {"$sum": 1}}},
+            {"$project": {"_id": 0, "x": "$_id.x", "type": "$_id.type", "y": 1}},
+            {"$sort": {"x": -1, "y": -1, "type": 1}},
+        ],
+    },
+    "annual_citation_count": {
+        "match": {},
+        "stages": [
+            {"$unwind": {"path": "$citations_by_year", "preserveNullAndEmptyArrays": True}},
+            {
+                "$group": {
+                    "_id": {
+                        "$cond": [
+                            {"$eq": [{"$type": "$citations_by_year"}, "object"]},
+                            "$citations_by_year.year",
+                            "no_info",
+                        ]
+                    },
+                    "citations": {"$sum": "$citations_by_year.cited_by_count"},
+                    "works": {"$sum": 1},
+                }
+            },
+            {
+                "$project": {
+                    "_id": 0,
+                    "x": "$_id",
+                    "y": {"$cond": [{"$eq": ["$_id", "no_info"]}, "$works", "$citations"]},
+                }
+            },
+        ],
+    },
+    "annual_articles_open_access": {
+        "match": {"types.type": {"$in": articles_types_list}},
+        "stages": [
+            {
+                "$group": {
+                    "_id": {
+                        "x": {
+                            "$cond": [
+                                {"$eq": [IS_OPEN_ACCESS, None]},
+                                {"$cond": [{"$in": [YEAR_PUBLISHED, [None, 0, ""]]}, "no_year", "$year_published"]},
+                                {"$ifNull": ["$year_published", "no_year"]},
+                            ]
+                        },
+                        "type": {
+                            "$switch": {
+                                "branches": [
+                                    {"case": {"$eq": [IS_OPEN_ACCESS, None]}, "then": "no_info"},
+                                    {"case": {"$eq": [IS_OPEN_ACCESS, True]}, "then": "open"},
+                                ],
+                                "default": "closed",
+                            }
+                        },
+                    },
+                    "y": {"$sum": 1},
+                }
+            },
+            {"$project": {"_id": 0, "x": "$_id.x", "type": "$_id.type", "y": 1}},
+        ],
+    },
+    "annual_articles_by_top_publishers": {
+        "match": {
+            "types.type": {"$in": articles_types_list},
+            "source.publisher.name": {"$ne": None},
+            "year_published": {"$ne": None},
+        },
+        "stages": [
+            {"$group": {"_id": {"x": "$year_published", "type": "$source.publisher.name"}, "y": {"$sum": 1}}},
+            {"$project": {"_id": 0, "x": "$_id.x", "type": "$_id.type", "y": 1}},
+            {"$sort": {"x": -1, "y": -1, "type": 1}},
+        ],
+    },
+    "articles_by_publisher": {
+        "match": {"types.type": {"$in": articles_types_list}},
+        "stages": [
+            {
+                "$group": {
+                    "_id": {
+                        "$cond": [
+                            {"$eq": [{"$type": "$source.publisher.name"}, "string"]},
+                            "$source.publisher.name",
+                            "no_info",
+                        ]
+                    },
+                    "value": {"$sum": 1},
+                }
+            },
+            {"$project": {"_id": 0, "name": "$_id", "value": 1}},
+            {"$sort": {"value": -1, "name": 1}},
+        ],
+    },
+    "products_by_subject": {
+        "match": {"primary_topic.display_name": {"$nin": [None, ""]}},
+        "stages": [
+            {"$group": {"_id": "$primary_topic.display_name", "value": {"$sum": 1}}},
+            {"$project": {"_id": 0, "name": "$_id", "value": 1}},
+            {"$sort": {"value": -1, "name": 1}},
+        ],
+    },
+    "articles_by_access_route": {
+        "match": {"types.type": {"$in": articles_types_list}},
+        "stages": [
+            {
+                "$group": {
+                    "_id": {
+                        "$cond": [
+                            {"$in": [{"$ifNull": ["$open_access.open_access_status", ""]}, [""]]},
+                            "no_info",
+                            "$open_access.open_access_status",
+                        ]
+                    },
+                    "value": {"$sum": 1},
+                }
+            },
+            {"$project": {"_id": 0, "name": "$_id", "value": 1}},
+            {"$sort": {"value": -1, "name": 1}},
+        ],
+    },
+}
@@ -0,0 +1,175 @@
+"""
+Vocabularies of the synthetic dataset written by quyca_gen_dataset.py: names, places, catalogs of product
+types and the words titles are made of. Values follow the ones the ETL writes, so the repositories, filters
+and plots find the same shapes they find in production.
+"""
+
+FIRST_NAMES: list[str] = (
+    "Ana Andrés Camila Carlos Carolina Daniel Diana Diego Felipe Gloria Hernán Isabel Jorge José Juan Juliana Laura "
+    "Luis Luz Manuela María Mario Natalia Óscar Pablo Paula Ricardo Sandra Santiago Sofía Valentina"
+).split()
+
+LAST_NAMES: list[str] = (
+    "Álvarez Arango Botero Cardona Castaño Castro Díaz Duque Gaviria Giraldo Gómez González Hernández Jaramillo "
+    "López Martínez Mejía Montoya Muñoz Ocampo Ospina Pérez Quintero Ramírez Restrepo Rodríguez Salazar Sánchez "
+    "Toro Uribe Vélez Zapata"
+).split()
+
+FOREIGN_FIRST_NAMES: list[str] = (
+    "Anna Chen David Emma Hans Hiroshi James Jean Li Lucas Maria Mei Michael Olga Pierre Priya Sarah Thomas Wei Yuki"
+).split()
+
+FOREIGN_LAST_NAMES: list[str] = (
+    "Brown Dubois Fischer Garcia Ivanova Johnson Kim Kumar Li Martin Müller Nakamura Rossi Silva Smith Tanaka Wang "
+    "Williams Zhang"
+).split()
+
+# (city, state, latitude, longitude)
+COLOMBIAN_CITIES: list[tuple[str, str, float, float]] = [
+    ("Medellín", "Antioquia", 6.2442, -75.5812),
+    ("Bogotá", "Bogotá D.C.", 4.711, -74.0721),
+    ("Cali", "Valle del Cauca", 3.4516, -76.532),
+    ("Barranquilla", "Atlántico", 10.9685, -74.7813),
+    ("Bucaramanga", "Santander", 7.1193, -73.1227),
+    ("Manizales", "Caldas", 5.0703, -75.5138),
+    ("Pereira", "Risaralda", 4.8133, -75.6961),
+    ("Cartagena", "Bolívar", 10.391, -75.4794),
+    ("Popayán", "Cauca", 2.4448, -76.6147),
+    ("Pasto", "Nariño", 1.2136, -77.2811),
+    ("Tunja", "Boyacá", 5.5353, -73.3678),
+    ("Montería", "Córdoba", 8.7479, -75.8814),
+]
+
+# (country code, country, city)
+FOREIGN_PLACES: list[tuple[str, str, str]] = [
+    ("US", "United States", "Boston"),
+    ("BR", "Brazil", "São Paulo"),
+    ("ES", "Spain", "Madrid"),
+    ("MX", "Mexico", "Mexico City"),
+    ("DE", "Germany", "Berlin"),
+    ("GB", "United Kingdom", "London"),
+    ("FR", "France", "Paris"),
+    ("CN", "China", "Beijing"),
+    ("AR", "Argentina", "Buenos Aires"),
+    ("CL", "Chile", "Santiago"),
+    ("CA", "Canada", "Toronto"),
+    ("JP", "Japan", "Tokyo"),
+]
+
+INSTITUTION_TYPES: list[str] = ["company", "healthcare", "government", "nonprofit", "facility", "education", "other"]
+
+AREAS: list[tuple[str, str]] = [
+    ("Ingeniería", "Engineering"),
+    ("Medicina", "Medicine"),
+    ("Ciencias Exactas y Naturales", "Natural Sciences"),
+    ("Ciencias Sociales y Humanas", "Social Sciences"),
+    ("Ciencias Económicas", "Economics"),
+    ("Derecho y Ciencias Políticas", "Law"),
+    ("Artes", "Arts"),
+    ("Educación", "Education"),
+    ("Ciencias Agrarias", "Agricultural Sciences"),
+    ("Química Farmacéutica", "Pharmaceutical Chemistry"),
+    ("Odontología", "Dentistry"),
+    ("Enfermería", "Nursing"),
+    ("Comunicaciones", "Communications"),
+    ("Salud Pública", "Public Health"),
+]
+
+SUBAREAS: list[str] = (
+    "Física Química Matemáticas Biología Sistemas Electrónica Mecánica Materiales Pediatría Microbiología "
+    "Fisiología Historia Sociología Antropología Psicología Estadística Economía Filosofía Música Lingüística"
+).split()
+
+TITLE_WORDS: list[str] = (
+    "analysis model colombia learning study effect data patients network system evaluation approach water health "
+    "students design performance review species control cancer energy quality risk social method development "
+    "protein soil education public policy climate gene cells optimization simulation neural análisis estudio "
+    "desarrollo evaluación modelo calidad salud aprendizaje comunidad sistema caracterización región diseño efecto "
+    "población conflicto biodiversity infection diabetes malaria coffee andes amazon materials graphene sensor "
+    "language history violence peace economy mining river tropical"
+).split()
+
+OPENALEX_TYPES: list[str] = [
+    "article",
+    "article",
+    "article",
+    "article",
+    "book-chapter",
+    "review",
+    "book",
+    "dataset",
+    "preprint",
+    "dissertation",
+    "letter",
+    "editorial",
+]
+
+# (code, type) by level of the ScienTI classification of products.
+SCIENTI_TYPES: list[list[tuple[str, str]]] = [
+    [("111", "Publicado en revista especializada"), ("11", "Artículos"), ("1", "Producción bibliográfica")],
+    [("112", "Corto (Resumen)"), ("11", "Artículos"), ("1", "Producción bibliográfica")],
+    [("113", "Revisión (Survey)"), ("11", "Artículos"), ("1", "Producción bibliográfica")],
+    [("114", "Caso clínico"), ("11", "Artículos"), ("1", "Producción bibliográfica")],
+    [("121", "Libro resultado de investigación"), ("12", "Libros"), ("1", "Producción bibliográfica")],
+    [("122", "Capítulo de libro"), ("12", "Libros"), ("1", "Producción bibliográfica")],
+    [("131", "Trabajos en eventos"), ("13", "Eventos"), ("1", "Producción bibliográfica")],
+]
+
+IMPACTU_TYPES: list[str] = ["Artículo", "Capítulo de libro", "Libro", "Trabajo en evento", "Otro"]
+
+MINCIENCIAS_TYPES: list[str] = ["ART_A1", "ART_A2", "ART_B", "ART_C", "ART_D", "CAP_LIB", "LIB"]
+
+OPEN_ACCESS_STATUSES: list[str] = ["closed", "closed", "gold", "green", "hybrid", "bronze", "diamond"]
+
+SOURCE_TYPES: list[str] = ["journal", "journal", "journal", "repository", "conference", "book series", "ebook platform"]
+
+PUBLISHERS: list[tuple[str, str]] = [
+    ("Elsevier BV", "NL"),
+    ("Springer Nature", "DE"),
+    ("Wiley", "US"),
+    ("Taylor & Francis", "GB"),
+    ("MDPI", "CH"),
+    ("Universidad de Antioquia", "CO"),
+    ("Universidad Nacional de Colombia", "CO"),
+    ("SciELO", "BR"),
+    ("IEEE", "US"),
+    ("Oxford University Press", "GB"),
+    ("Frontiers Media", "CH"),
+    ("Public Library of Science", "US"),
+]
+
+APC_CURRENCIES: list[str] = ["USD", "EUR", "GBP", "COP", "BRL"]
+
+SCIMAGO_QUARTILES: list[str] = ["Q1", "Q2", "Q3", "Q4"]
+
+PERSON_RANKS: list[str] = [
+    "Investigador Junior",
+    "Investigador Asociado",
+    "Investigador Senior",
+    "Investigador Emérito",
+]
+
+GROUP_RANKS: list[str] = ["A1", "A", "B", "C", "Reconocido"]
+
+TOPIC_FIELDS: list[tuple[str, str]] = [
+    ("Medicine", "Health Sciences"),
+    ("Engineering", "Physical Sciences"),
+    ("Computer Science", "Physical Sciences"),
+    ("Agricultural and Biological Sciences", "Life Sciences"),
+    ("Social Sciences", "Social Sciences"),
+    ("Environmental Science", "Physical Sciences"),
+    ("Biochemistry, Genetics and Molecular Biology", "Life Sciences"),
+    ("Arts and Humanities", "Social Sciences"),
+]
+
+PATENT_TYPES: list[tuple[str, str]] = [
+    ("261", "Patente de invención"),
+    ("262", "Patente modelo de utilidad"),
+    ("263", "Secreto empresarial"),
+]
+
+PROJECT_TYPES: list[tuple[str, str]] = [
+    ("91", "Proyecto de investigación y desarrollo"),
+    ("92", "Proyecto de investigación-creación"),
+    ("93", "Proyecto de extensión"),
+]
@@ -1,3 +1,8 @@
+import io
+import zlib
+from typing import Any, Generator, Iterable
+
+
 def get_works_h_index_by_scholar_citations(distribution: list[int]) -> int:
     if not distribution:
         return 0
@@ -10,3 +15,43 @@ def get_works_h_index_by_scholar_citations(distribution: list[int]) -> int:
         else:
             break
     return h_index
+
+
+def get_gzip_chunks(chunks: Iterable[str], compression_level: int = 6) -> Generator[bytes, None, None]:
+    compressor = zlib.compressobj(compression_level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        compressed_chunk = compressor.compress(chunk.encode("utf-8"))
+        if compressed_chunk:
+            yield compressed_chunk
+    yield compressor.flush()
+
+
+class ChunksSink(io.RawIOBase):
+    """
+    Write-only file that keeps what is written until it is drained.
+
+    It reports the absolute position on tell(), so writers that record offsets (like Parquet footers)
+    can stream into it while the written bytes are sent and released chunk by chunk.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
@@ -157,6 +157,7 @@ class QueryParams(BaseModel):
     page: conint(ge=1) | None = None  # type: ignore
     keywords: str | None = None
     plot: str | None = None
+    plots: str | None = None
     sort: str | None = None
     product_types: str | None = None
     years: str | None = None
@@ -168,10 +169,14 @@ class QueryParams(BaseModel):
     authors_ranking: str | None = None
     source_types: str | None = None
     scimago_quartiles: str | None = None
+    cursor: str | None = None
+    compression: str | None = None
+    format: str | None = None
+    columns: str | None = None
 
     @model_validator(mode="after")
     def validate_pagination_and_sort(self) -> "QueryParams":
-        if not self.plot and not self.limit and not self.page and not self.sort:
+        if not self.plot and not self.plots and not self.limit and not self.page and not self.sort:
             self.limit = 10
             self.page = 1
             self.sort = "citations_desc"
@@ -22,6 +22,11 @@ def parse_annual_evolution_by_scienti_classification(works: Generator) -> dict:
     return {"plot": sorted(plot, key=lambda x: (-x.get("x"), -x.get("y")))}
 
 
+def parse_annual_evolution_by_scienti_classification_from_buckets(buckets: list) -> dict:
+    plot = [{"x": bucket.get("x"), "y": bucket.get("y"), "type": bucket.get("type")} for bucket in buckets]
+    return {"plot": sorted(plot, key=lambda x: (-x.get("x"), -x.get("y")))}
+
+
 def parse_affiliations_by_product_type(data: CommandCursor) -> dict:
     plot = [{"x": item["name"], "y": item["works_count"], "type": item["type"]} for item in data]
     return {"plot": sorted(plot, key=lambda x: x.get("y"), reverse=True)}
@@ -44,6 +49,19 @@ def parse_annual_citation_count(works: Generator) -> dict:
     return {"plot": plot}
 
 
+def parse_annual_citation_count_from_buckets(buckets: list) -> dict:
+    data: dict = {}
+    no_info = 0
+    for bucket in buckets:
+        if bucket.get("x") == "no_info":
+            no_info = bucket.get("y", 0)
+            continue
+        data[bucket.get("x")] = bucket.get("y", 0)
+    plot = [{"x": year, "y": count} for year, count in sorted(data.items(), reverse=True)]
+    plot += [{"x": "Sin información", "y": no_info}]
+    return {"plot": plot}
+
+
 def parse_annual_articles_open_access(works: Generator) -> dict:
     data: defaultdict = defaultdict(lambda: {"Abierto": 0, "Cerrado": 0, "Sin información": 0})
     for work in works:
@@ -66,6 +84,20 @@ def parse_annual_articles_open_access(works: Generator) -> dict:
     return {"plot": sorted(plot, key=lambda x: float("inf") if x.get("x") == "Sin año" else -x.get("x"))}
 
 
+def parse_annual_articles_open_access_from_buckets(buckets: list) -> dict:
+    access_types = {"open": "Abierto", "closed": "Cerrado", "no_info": "Sin información"}
+    data: defaultdict = defaultdict(lambda: {"Abierto": 0, "Cerrado": 0, "Sin información": 0})
+    for bucket in buckets:
+        year = "Sin año" if bucket.get("x") == "no_year" else bucket.get("x")
+        data[year][access_types[bucket["type"]]] = bucket.get("y", 0)
+    plot = [
+        {"x": year, "y": count, "type": access_type}
+        for year, counts in data.items()
+        for access_type, count in counts.items()
+    ]
+    return {"plot": sorted(plot, key=lambda x: float("inf") if x.get("x") == "Sin año" else -x.get("x"))}
+
+
 def parse_annual_articles_by_top_publishers(works: Generator) -> dict:
     data: defaultdict = defaultdict(lambda: defaultdict(int))
     for work in works:
@@ -82,6 +114,15 @@ def parse_annual_articles_by_top_publishers(works: Generator) -> dict:
     return {"plot": sorted(plot, key=lambda x: (-x.get("x"), -x.get("y")))}
 
 
+def parse_annual_articles_by_top_publishers_from_buckets(buckets: list) -> dict:
+    plot = [
+        {"x": bucket.get("x"), "y": bucket.get("y"), "type": bucket.get("type")}
+        for bucket in buckets
+        if bucket.get("x") is not None and bucket.get("y") is not None
+    ]
+    return {"plot": sorted(plot, key=lambda x: (-x.get("x"), -x.get("y")))}
+
+
 def parse_annual_apc_expenses(works: Generator) -> dict:
     data: defaultdict = defaultdict(int)
     total_apc = 0
@@ -84,6 +84,15 @@ def parse_articles_by_publisher(works: Generator) -> list:
     return sorted(plot, key=lambda x: x.get("value"), reverse=True)
 
 
+@get_percentage
+def parse_articles_by_publisher_from_buckets(buckets: list) -> list:
+    plot = [
+        {"name": "Sin información" if bucket.get("name") == "no_info" else bucket.get("name"), "value": bucket["value"]}
+        for bucket in buckets
+    ]
+    return sorted(plot, key=lambda x: x.get("value"), reverse=True)
+
+
 @get_percentage
 def parse_products_by_subject(works: Generator) -> list:
     names = [
@@ -95,6 +104,12 @@ def parse_products_by_subject(works: Generator) -> list:
     return sorted(plot, key=lambda x: x["value"], reverse=True)
 
 
+@get_percentage
+def parse_products_by_subject_from_buckets(buckets: list) -> list:
+    plot = [{"name": bucket.get("name"), "value": bucket["value"]} for bucket in buckets]
+    return sorted(plot, key=lambda x: x["value"], reverse=True)
+
+
 @get_percentage
 def parse_products_by_access_route(works: Generator) -> list:
     data = map(
@@ -108,6 +123,12 @@ def parse_products_by_access_route(works: Generator) -> list:
     return sorted(plot, key=lambda x: x.get("value"), reverse=True)
 
 
+@get_percentage
+def parse_products_by_access_route_from_buckets(buckets: list) -> list:
+    plot = [{"name": open_access_status_dict.get(bucket.get("name")), "value": bucket["value"]} for bucket in buckets]
+    return sorted(plot, key=lambda x: x.get("value"), reverse=True)
+
+
 @get_percentage
 def parse_active_authors_by_sex(persons: CommandCursor) -> list:
     result: defaultdict = defaultdict(int)
@@ -1,54 +1,101 @@
 import csv
 import io
-from typing import Any
+import json
+from typing import Any, Generator, Iterable
 
 from quyca.domain.constants import countries_iso
 from quyca.domain.constants.open_access_status import open_access_status_dict
 from quyca.domain.constants.product_types import source_titles
+from quyca.domain.helpers import ChunksSink
 from quyca.domain.models.work_model import Work
 
+EXPORT_CHUNK_SIZE = 64 * 1024
 
-def parse_csv(works: list) -> str:
-    include = [
-        "title",
-        "language",
-        "authors_csv",
-        "institutions",
-        "faculties",
-        "departments",
-        "groups_csv",
-        "countries",
-        "groups_ranking",
-        "ranking",
-        "issue",
-        "open_access_status",
-        "pages",
-        "start_page",
-        "end_page",
-        "volume",
-        "bibtex",
-        "scimago_quartile",
-        "openalex_citations_count",
-        "scholar_citations_count",
-        "subjects",
-        "primary_topic_csv",
-        "year_published",
-        "doi",
-        "publisher",
-        "openalex_types",
-        "scienti_types",
-        "impactu_types",
-        "source_name",
-        "source_apc",
-        "source_urls",
-    ]
-    works_dict = [work.model_dump(include=include) for work in works]
+
+def parse_csv(rows: Iterable[dict], columns: list[str]) -> Generator[str, None, None]:
+    """
+    Writes the rows as CSV and yields the output in chunks of about EXPORT_CHUNK_SIZE characters,
+    so only one chunk of rows is held in memory at a time.
+    """
     output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=include, escapechar="\\", quoting=csv.QUOTE_MINIMAL)
+    writer = csv.DictWriter(output, fieldnames=columns, escapechar="\\", quoting=csv.QUOTE_MINIMAL)
     writer.writeheader()
-    writer.writerows(works_dict)
-    del works_dict
-    return output.getvalue()
+    for row in rows:
+        writer.writerow(row)
+        if output.tell() >= EXPORT_CHUNK_SIZE:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate(0)
+    yield output.getvalue()
+
+
+def parse_ndjson(rows: Iterable[dict]) -> Generator[str, None, None]:
+    lines: list[str] = []
+    size = 0
+    for row in rows:
+        line = json.dumps(row, ensure_ascii=False) + "\n"
+        lines.append(line)
+        size += len(line)
+        if size >= EXPORT_CHUNK_SIZE:
+            yield "".join(lines)
+            lines, size = [], 0
+    yield "".join(lines)
+
+
+def parse_parquet(rows: Iterable[dict], types: dict[str, str], batch_size: int) -> Generator[bytes, None, None]:
+    pa, schema = get_arrow_schema(types)
+    return write_parquet(pa, rows, schema, batch_size)
+
+
+def write_parquet(pa: Any, rows: Iterable[dict], schema: Any, batch_size: int) -> Generator[bytes, None, None]:
+    """
+    Writes the rows as a Parquet file, one row group per record batch of batch_size rows,
+    yielding the bytes of every row group as soon as it is written.
+    """
+    import pyarrow.parquet as pq
+
+    sink = ChunksSink()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema)
+    for batch in get_record_batches(pa, rows, schema, batch_size):
+        writer.write_batch(batch)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def parse_arrow(rows: Iterable[dict], types: dict[str, str], batch_size: int) -> Generator[bytes, None, None]:
+    pa, schema = get_arrow_schema(types)
+    return write_arrow(pa, rows, schema, batch_size)
+
+
+def write_arrow(pa: Any, rows: Iterable[dict], schema: Any, batch_size: int) -> Generator[bytes, None, None]:
+    sink = ChunksSink()
+    writer = pa.ipc.new_stream(pa.PythonFile(sink, mode="w"), schema)
+    for batch in get_record_batches(pa, rows, schema, batch_size):
+        writer.write_batch(batch)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def get_arrow_schema(types: dict[str, str]) -> tuple[Any, Any]:
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ValueError("Los formatos parquet y arrow requieren instalar pyarrow.")
+    arrow_types = {"int": pa.int64(), "string": pa.string()}
+    return pa, pa.schema([(column, arrow_types[column_type]) for column, column_type in types.items()])
+
+
+def get_record_batches(pa: Any, rows: Iterable[dict], schema: Any, batch_size: int) -> Generator[Any, None, None]:
+    batch: list[dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield pa.RecordBatch.from_pylist(batch, schema=schema)
+            batch = []
+    if batch:
+        yield pa.RecordBatch.from_pylist(batch, schema=schema)
 
 
 def parse_search_results(works: list) -> list:
@@ -1,8 +1,10 @@
+from functools import partial
 from typing import Any, Callable
 from pymongo.command_cursor import CommandCursor
 
 from quyca.domain.constants.articles_types import articles_types_list
 from quyca.domain.models.base_model import QueryParams
+from quyca.domain.services import plot_cache_service
 from quyca.infrastructure.repositories import (
     work_repository,
     plot_repository,
@@ -20,6 +22,17 @@ from quyca.domain.parsers import (
 
 def get_affiliation_plot(
     affiliation_id: str, affiliation_type: str, query_params: QueryParams
+) -> dict[str, Any] | None:
+    return plot_cache_service.get_plot(
+        f"affiliation_{affiliation_type}",
+        affiliation_id,
+        query_params,
+        partial(build_affiliation_plot, affiliation_id, affiliation_type, query_params),
+    )
+
+
+def build_affiliation_plot(
+    affiliation_id: str, affiliation_type: str, query_params: QueryParams
 ) -> dict[str, Any] | None:
     plot_type = query_params.plot
     plot_type_dict = {
@@ -128,36 +141,31 @@ def plot_h_index_by_affiliation(
 
 
 def plot_annual_evolution_by_scienti_classification(affiliation_id: str, query_params: QueryParams) -> dict:
-    pipeline_params = {"project": ["year_published", "types"]}
-    works = work_repository.get_works_by_affiliation(affiliation_id, query_params, pipeline_params)
-    return bar_parser.parse_annual_evolution_by_scienti_classification(works)
+    buckets = plot_repository.get_works_plot_buckets_by_affiliation(
+        affiliation_id, "annual_evolution_by_scienti_classification", query_params
+    )
+    return bar_parser.parse_annual_evolution_by_scienti_classification_from_buckets(buckets)
 
 
 def plot_annual_citation_count(affiliation_id: str, query_params: QueryParams) -> dict:
-    pipeline_params = {"project": ["citations_by_year"]}
-    works = work_repository.get_works_by_affiliation(affiliation_id, query_params, pipeline_params)
-    return bar_parser.parse_annual_citation_count(works)
+    buckets = plot_repository.get_works_plot_buckets_by_affiliation(
+        affiliation_id, "annual_citation_count", query_params
+    )
+    return bar_parser.parse_annual_citation_count_from_buckets(buckets)
 
 
 def plot_annual_articles_open_access(affiliation_id: str, query_params: QueryParams) -> dict:
-    pipeline_params = {
-        "project": ["year_published", "open_access"],
-        "match": {"types.type": {"$in": articles_types_list}},
-    }
-    works = work_repository.get_works_by_affiliation(affiliation_id, query_params, pipeline_params)
-    return bar_parser.parse_annual_articles_open_access(works)
+    buckets = plot_repository.get_works_plot_buckets_by_affiliation(
+        affiliation_id, "annual_articles_open_access", query_params
+    )
+    return bar_parser.parse_annual_articles_open_access_from_buckets(buckets)
 
 
 def plot_annual_articles_by_top_publishers(affiliation_id: str, query_params: QueryParams) -> dict:
-    pipeline_params = {
-        "work_project": ["source.name", "source.publisher.name", "source.id", "year_published", "types"],
-        "match": {
-            "types.type": {"$in": articles_types_list},
-            "source.publisher.name": {"$ne": None},
-        },
-    }
-    works = work_repository.get_works_with_source_by_affiliation(affiliation_id, query_params, pipeline_params)
-    return bar_parser.parse_annual_articles_by_top_publishers(works)
+    buckets = plot_repository.get_works_plot_buckets_by_affiliation(
+        affiliation_id, "annual_articles_by_top_publishers", query_params
+    )
+    return bar_parser.parse_annual_articles_by_top_publishers_from_buckets(buckets)
 
 
 def plot_most_used_title_words(affiliation_id: str, query_params: QueryParams) -> dict:
@@ -166,21 +174,15 @@ def plot_most_used_title_words(affiliation_id: str, query_params: QueryParams) -
 
 
 def plot_articles_by_publisher(affiliation_id: str, query_params: QueryParams) -> dict:
-    pipeline_params = {
-        "work_project": ["source.id", "source.publisher.name", "source.name"],
-        "match": {"types.type": {"$in": articles_types_list}},
-    }
-    works = work_repository.get_works_with_source_by_affiliation(affiliation_id, query_params, pipeline_params)
-    return pie_parser.parse_articles_by_publisher(works)
+    buckets = plot_repository.get_works_plot_buckets_by_affiliation(
+        affiliation_id, "articles_by_publisher", query_params
+    )
+    return pie_parser.parse_articles_by_publisher_from_buckets(buckets)
 
 
 def plot_products_by_subject(affiliation_id: str, query_params: QueryParams) -> dict:
-    pipeline_params = {
-        "project": ["primary_topic.display_name"],
-        "match": {"primary_topic.display_name": {"$exists": True, "$ne": None}},
-    }
-    works = work_repository.get_works_by_affiliation(affiliation_id, query_params, pipeline_params)
-    return pie_parser.parse_products_by_subject(works)
+    buckets = plot_repository.get_works_plot_buckets_by_affiliation(affiliation_id, "products_by_subject", query_params)
+    return pie_parser.parse_products_by_subject_from_buckets(buckets)
 
 
 def plot_products_by_database(affiliation_id: str, query_params: QueryParams) -> dict:
@@ -189,12 +191,10 @@ def plot_products_by_database(affiliation_id: str, query_params: QueryParams) ->
 
 
 def plot_articles_by_access_route(affiliation_id: str, query_params: QueryParams) -> dict:
-    pipeline_params = {
-        "match": {"types.type": {"$in": articles_types_list}},
-        "project": ["open_access"],
-    }
-    works = work_repository.get_works_by_affiliation(affiliation_id, query_params, pipeline_params)
-    return pie_parser.parse_products_by_access_route(works)
+    buckets = plot_repository.get_works_plot_buckets_by_affiliation(
+        affiliation_id, "articles_by_access_route", query_params
+    )
+    return pie_parser.parse_products_by_access_route_from_buckets(buckets)
 
 
 def plot_active_authors_by_sex(affiliation_id: str, query_params: QueryParams) -> dict:
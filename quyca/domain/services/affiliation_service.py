@@ -2,10 +2,13 @@ from typing import Any, Dict, List, Union, cast
 from quyca.domain.models.base_model import QueryParams
 from quyca.domain.constants.institutions import institutions_list
 from quyca.domain.parsers import affiliation_parser
+from quyca.domain.services.base_service import get_next_cursor_data
 from quyca.domain.models.affiliation_model import Affiliation, Relation
 from quyca.infrastructure.repositories import (
     person_repository,
     affiliation_repository,
+    hierarchy_repository,
+    loader_repository,
 )
 
 
@@ -19,27 +22,21 @@ def get_affiliation_by_id(affiliation_id: str, affiliation_type: str) -> dict:
 def get_related_affiliations_by_affiliation(affiliation_id: str, affiliation_type: str) -> dict:
     data = {}
     if affiliation_type == "institution":
-        faculties = affiliation_repository.get_affiliations_by_institution(affiliation_id, "faculty")
-        departments = affiliation_repository.get_affiliations_by_institution(affiliation_id, "department")
-        groups = affiliation_repository.get_affiliations_by_institution(affiliation_id, "group")
-        data["faculties"] = [faculty.model_dump(include={"id", "name"}) for faculty in faculties]
-        data["departments"] = [department.model_dump(include={"id", "name"}) for department in departments]
-        data["groups"] = [group.model_dump(include={"id", "name"}) for group in groups]
+        data["faculties"] = hierarchy_repository.get_child_affiliations(affiliation_id, "faculty")
+        data["departments"] = hierarchy_repository.get_child_affiliations(affiliation_id, "department")
+        data["groups"] = hierarchy_repository.get_child_affiliations(affiliation_id, "group")
         if len(data["faculties"]) == 0 and len(data["departments"]) == 0:
             authors = person_repository.get_persons_by_affiliation(affiliation_id)
             data["authors"] = [author.model_dump(include={"id", "full_name"}) for author in authors]
 
     elif affiliation_type == "faculty":
-        departments = affiliation_repository.get_departments_by_faculty(affiliation_id)
-        groups = affiliation_repository.get_groups_by_faculty_or_department(affiliation_id)
         authors = person_repository.get_persons_by_affiliation(affiliation_id)
-        data["departments"] = [department.model_dump(include={"id", "name"}) for department in departments]
-        data["groups"] = [group.model_dump(include={"id", "name"}) for group in groups]
+        data["departments"] = hierarchy_repository.get_child_affiliations(affiliation_id, "department")
+        data["groups"] = hierarchy_repository.get_group_affiliations(affiliation_id)
         data["authors"] = [author.model_dump(include={"id", "full_name"}) for author in authors]
     elif affiliation_type == "department":
-        groups = affiliation_repository.get_groups_by_faculty_or_department(affiliation_id)
         authors = person_repository.get_persons_by_affiliation(affiliation_id)
-        data["groups"] = [group.model_dump(include={"id", "name"}) for group in groups]
+        data["groups"] = hierarchy_repository.get_group_affiliations(affiliation_id)
         data["authors"] = [author.model_dump(include={"id", "full_name"}) for author in authors]
     elif affiliation_type == "group":
         authors = person_repository.get_persons_by_affiliation(affiliation_id)
@@ -63,21 +60,41 @@ def search_affiliations(affiliation_type: str, query_params: QueryParams) -> dic
             "relations_data",
         ]
     }
-    affiliations, total_results = affiliation_repository.search_affiliations(
+    affiliations, total_results, next_cursor = affiliation_repository.search_affiliations(
         affiliation_type, query_params, pipeline_params
     )
-    affiliations_list = []
-    for affiliation in affiliations:
-        set_relation_external_urls(affiliation)
+    affiliations_list = list(affiliations)
+    set_relations_external_urls(affiliations_list)
+    for affiliation in affiliations_list:
         set_upper_affiliations_and_logo(affiliation, affiliation_type)
-        affiliations_list.append(affiliation)
     data = affiliation_parser.parse_search_result(affiliations_list)
-    return {"data": data, "total_results": total_results}
+    return {"data": data, "total_results": total_results, **get_next_cursor_data(query_params, next_cursor)}
 
 
 def set_relation_external_urls(affiliation: Affiliation) -> None:
-    if not affiliation.relations:
+    set_relations_external_urls([affiliation])
+
+
+def set_relations_external_urls(affiliations: List[Affiliation]) -> None:
+    """
+    Sets the external urls of the relations of the affiliations. Relations missing in relations_data
+    take the urls of the related affiliation, and all of them are loaded in a single query.
+    """
+    pending_relations = [
+        relation for affiliation in affiliations for relation in get_relations_without_external_urls(affiliation)
+    ]
+    if not pending_relations:
         return
+    related_affiliations = loader_repository.get_affiliations_by_ids(str(relation.id) for relation in pending_relations)
+    for relation in pending_relations:
+        # In this case use the logo from the related affiliation
+        related_affiliation = related_affiliations.get(str(relation.id))
+        relation.external_urls = (related_affiliation.external_urls if related_affiliation else None) or []
+
+
+def get_relations_without_external_urls(affiliation: Affiliation) -> List[Relation]:
+    if not affiliation.relations:
+        return []
 
     relations_iterable: List[Relation]
 
@@ -88,8 +105,9 @@ def set_relation_external_urls(affiliation: Affiliation) -> None:
     elif isinstance(affiliation.relations, (Dict, Relation)):
         relations_iterable = [affiliation.relations]
     else:
-        return
+        return []
 
+    pending_relations = []
     for relation in relations_iterable:
         if not isinstance(relation, Relation):
             continue
@@ -108,15 +126,11 @@ def set_relation_external_urls(affiliation: Affiliation) -> None:
                 relation_external_urls = relation_data.external_urls
 
         if not relation_external_urls and getattr(relation, "id", None):
-            try:
-                # In this case use the logo from the related affiliation
-                related_aff = affiliation_repository.get_affiliation_by_id(str(relation.id))
-                if getattr(related_aff, "external_urls", None):
-                    relation_external_urls = related_aff.external_urls
-            except Exception:
-                relation_external_urls = None
+            pending_relations.append(relation)
+            continue
 
         relation.external_urls = relation_external_urls or []
+    return pending_relations
 
 
 def set_upper_affiliations_and_logo(affiliation: Affiliation, affiliation_type: str) -> None:
@@ -2,11 +2,17 @@ from typing import Iterator, Union
 from urllib.parse import urlparse
 
 from quyca.domain.constants.external_urls import external_urls_dict
-from quyca.domain.models.base_model import Title, ProductType, ExternalUrl, Type
+from quyca.domain.models.base_model import Title, ProductType, ExternalUrl, Type, QueryParams
 from quyca.domain.models.patent_model import Patent
 from quyca.domain.models.project_model import Project
 from quyca.domain.models.work_model import Work
-from quyca.infrastructure.repositories import person_repository
+from quyca.infrastructure.repositories import loader_repository
+
+
+def get_next_cursor_data(query_params: QueryParams, next_cursor: str | None) -> dict:
+    if query_params.cursor is None:
+        return {}
+    return {"next_cursor": next_cursor}
 
 
 def set_title_and_language(workable: Union[Work, Patent, Project]) -> None:
@@ -54,9 +60,10 @@ def set_authors_external_ids(workable: Union[Work, Patent, Project]) -> None:
     if isinstance(workable.authors, str):
         return
 
+    persons = loader_repository.get_persons_by_ids(str(author.id) for author in workable.authors if author.id)
     for author in workable.authors:
-        if author.id:
-            author.external_ids = person_repository.get_person_by_id(str(author.id)).external_ids
+        if person := persons.get(str(author.id)):
+            author.external_ids = person.external_ids
 
 
 def limit_authors(workable: Union[Work, Patent, Project], limit: int = 10) -> None:
@@ -0,0 +1,142 @@
+import json
+import os
+import time
+from typing import Any
+
+from bson import ObjectId
+
+from quyca.config import settings
+from quyca.domain.parsers import work_parser
+from quyca.infrastructure.repositories import api_expert_repository
+
+MANIFEST_FILE = "manifest.json"
+
+
+def get_partitions(partitions: int) -> list[dict[str, Any]]:
+    """
+    Splits the works collection in _id ranges. Bounds are kept as strings so the partitions
+    can be saved in the manifest and sent to the worker processes as they are.
+    """
+    boundaries = [str(boundary) for boundary in api_expert_repository.get_works_id_boundaries(partitions)]
+    starts: list[str | None] = [None, *boundaries]
+    ends: list[str | None] = [*boundaries, None]
+    return [
+        {"index": index, "start_id": start_id, "end_id": end_id}
+        for index, (start_id, end_id) in enumerate(zip(starts, ends))
+    ]
+
+
+def load_manifest(work_dir: str) -> dict[str, Any] | None:
+    manifest_path = os.path.join(work_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, encoding="utf-8") as file:
+        manifest: dict[str, Any] = json.load(file)
+    return manifest
+
+
+def save_manifest(work_dir: str, manifest: dict[str, Any]) -> None:
+    os.makedirs(work_dir, exist_ok=True)
+    save_json(os.path.join(work_dir, MANIFEST_FILE), manifest)
+
+
+def get_shard_path(work_dir: str, index: int) -> str:
+    return os.path.join(work_dir, f"part-{index:05d}.ndjson")
+
+
+def get_checkpoint_path(work_dir: str, index: int) -> str:
+    return os.path.join(work_dir, f"part-{index:05d}.checkpoint.json")
+
+
+def load_checkpoint(work_dir: str, index: int) -> dict[str, Any]:
+    checkpoint_path = get_checkpoint_path(work_dir, index)
+    if not os.path.exists(checkpoint_path):
+        return {"last_id": None, "bytes": 0, "count": 0, "done": False}
+    with open(checkpoint_path, encoding="utf-8") as file:
+        checkpoint: dict[str, Any] = json.load(file)
+    return checkpoint
+
+
+def save_json(path: str, data: dict[str, Any]) -> None:
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        json.dump(data, file)
+    os.replace(temporary_path, path)
+
+
+def to_object_id(value: str | None) -> ObjectId | None:
+    return ObjectId(value) if value else None
+
+
+def export_partition(partition: dict[str, Any], work_dir: str) -> dict[str, Any]:
+    """
+    Writes the works of one _id range to its NDJSON shard, in _id order. Runs in a worker process.
+
+    Every EXPORT_BATCH_SIZE works the shard is flushed to disk and the checkpoint records its size and the
+    last exported _id. A resumed partition truncates the shard to that size and continues after that _id,
+    so works written after the last checkpoint are exported again instead of duplicated.
+    """
+    start_time = time.time()
+    index = partition["index"]
+    checkpoint = load_checkpoint(work_dir, index)
+    stats = {
+        "index": index,
+        "pid": os.getpid(),
+        "count": 0,
+        "seconds": 0.0,
+        "resumed": checkpoint["count"] > 0,
+        "skipped": checkpoint["done"],
+    }
+    if checkpoint["done"]:
+        return stats
+
+    shard_path = get_shard_path(work_dir, index)
+    works = api_expert_repository.get_works_by_id_range_for_api_expert(
+        to_object_id(partition["start_id"]), to_object_id(partition["end_id"]), to_object_id(checkpoint["last_id"])
+    )
+    with open(shard_path, "r+b" if os.path.exists(shard_path) else "wb") as shard:
+        shard.truncate(checkpoint["bytes"])
+        shard.seek(checkpoint["bytes"])
+        for work in works:
+            item = work_parser.parse_api_expert([work])[0]
+            shard.write((json.dumps(item, ensure_ascii=False) + "\n").encode("utf-8"))
+            checkpoint["last_id"] = str(work.id)
+            checkpoint["count"] += 1
+            stats["count"] += 1
+            if stats["count"] % settings.EXPORT_BATCH_SIZE == 0:
+                save_shard_checkpoint(shard, work_dir, index, checkpoint)
+        checkpoint["done"] = True
+        save_shard_checkpoint(shard, work_dir, index, checkpoint)
+
+    stats["seconds"] = time.time() - start_time
+    return stats
+
+
+def save_shard_checkpoint(shard: Any, work_dir: str, index: int, checkpoint: dict[str, Any]) -> None:
+    shard.flush()
+    os.fsync(shard.fileno())
+    checkpoint["bytes"] = shard.tell()
+    save_json(get_checkpoint_path(work_dir, index), checkpoint)
+
+
+def merge_shards(work_dir: str, partitions: int, output_file: str, export_format: str) -> int:
+    """
+    Concatenates the shards in _id order into output_file, as NDJSON or as the JSON array
+    written by the previous exporter. Returns the number of exported works.
+    """
+    count = 0
+    temporary_file = f"{output_file}.tmp"
+    with open(temporary_file, "w", encoding="utf-8") as output:
+        if export_format == "json":
+            output.write("[\n")
+        for index in range(partitions):
+            with open(get_shard_path(work_dir, index), encoding="utf-8") as shard:
+                for line in shard:
+                    if export_format == "json":
+                        line = (",\n" if count else "") + line.rstrip("\n")
+                    output.write(line)
+                    count += 1
+        if export_format == "json":
+            output.write("\n]")
+    os.replace(temporary_file, output_file)
+    return count
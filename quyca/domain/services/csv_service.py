@@ -1,90 +1,194 @@
 from datetime import datetime
-from typing import Any, Generator
+from typing import Any, Generator, Iterable
 
+from quyca.config import settings
 from quyca.domain.models.base_model import QueryParams
 from quyca.domain.models.work_model import BiblioGraphicInfo, Work
 from quyca.infrastructure.repositories import csv_repository
+from quyca.domain.constants.clean_source import clean_nan
 from quyca.domain.constants.institutions import institutions_list
 from quyca.domain.constants.openalex_types import openalex_types_dict
 from quyca.domain.services import source_service
 from quyca.domain.services import work_service
 from quyca.domain.parsers import work_parser
-
-
-def get_works_csv_by_affiliation(affiliation_id: str, query_params: QueryParams) -> str:
-    pipeline_params = get_works_project_pipeline_params()
-    works = csv_repository.get_works_csv_by_affiliation(affiliation_id, query_params, pipeline_params)
-    data = get_csv_data(works)
-    return work_parser.parse_csv(data)
-
-
-def get_works_csv_by_person(person_id: str, query_params: QueryParams) -> str:
-    pipeline_params = get_works_project_pipeline_params()
-    works = csv_repository.get_works_csv_by_person(person_id, query_params, pipeline_params)
-    data = get_csv_data(works)
-    return work_parser.parse_csv(data)
-
-
-def get_works_csv_by_source(source_id: str, query_params: QueryParams) -> str:
+from quyca.domain.helpers import get_gzip_chunks
+
+
+WORKS_EXPORT_COLUMNS: dict[str, dict[str, Any]] = {
+    "title": {"type": "string", "fields": ["titles"]},
+    "language": {"type": "string", "fields": ["titles"]},
+    "authors_csv": {"type": "string", "fields": ["authors"]},
+    "institutions": {"type": "string", "fields": ["authors"]},
+    "faculties": {"type": "string", "fields": ["authors"]},
+    "departments": {"type": "string", "fields": ["authors"]},
+    "groups_csv": {"type": "string", "fields": ["authors"]},
+    "countries": {"type": "string", "fields": ["authors"]},
+    "groups_ranking": {"type": "string", "fields": ["groups"]},
+    "ranking": {"type": "string", "fields": ["ranking"]},
+    "issue": {"type": "string", "fields": ["bibliographic_info"]},
+    "open_access_status": {"type": "string", "fields": ["open_access"]},
+    "pages": {"type": "string", "fields": ["bibliographic_info"]},
+    "start_page": {"type": "string", "fields": ["bibliographic_info"]},
+    "end_page": {"type": "string", "fields": ["bibliographic_info"]},
+    "volume": {"type": "string", "fields": ["bibliographic_info"]},
+    "bibtex": {"type": "string", "fields": ["bibliographic_info"]},
+    "scimago_quartile": {"type": "string", "fields": ["source"]},
+    "openalex_citations_count": {"type": "int", "fields": ["citations_count"]},
+    "scholar_citations_count": {"type": "int", "fields": ["citations_count"]},
+    "subjects": {"type": "string", "fields": ["subjects"]},
+    "primary_topic_csv": {"type": "string", "fields": ["primary_topic"]},
+    "year_published": {"type": "int", "fields": ["year_published"]},
+    "doi": {"type": "string", "fields": ["doi"]},
+    "publisher": {"type": "string", "fields": []},
+    "openalex_types": {"type": "string", "fields": ["types"]},
+    "scienti_types": {"type": "string", "fields": ["types"]},
+    "impactu_types": {"type": "string", "fields": ["types"]},
+    "source_name": {"type": "string", "fields": ["source"]},
+    "source_apc": {"type": "string", "fields": ["source"]},
+    "source_urls": {"type": "string", "fields": ["source"]},
+}
+
+WORKS_EXPORT_FORMATS: dict[str, dict[str, str]] = {
+    "csv": {"content_type": "text/csv", "extension": "csv"},
+    "ndjson": {"content_type": "application/x-ndjson", "extension": "ndjson"},
+    "parquet": {"content_type": "application/vnd.apache.parquet", "extension": "parquet"},
+    "arrow": {"content_type": "application/vnd.apache.arrow.stream", "extension": "arrow"},
+}
+
+
+def get_works_csv_by_affiliation(affiliation_id: str, query_params: QueryParams) -> Iterable[str] | Iterable[bytes]:
+    columns = get_export_columns(query_params)
+    pipeline_params = get_works_project_pipeline_params(columns)
+    documents = csv_repository.get_works_csv_by_affiliation(affiliation_id, query_params, pipeline_params)
+    return get_export_chunks(documents, columns, query_params)
+
+
+def get_works_csv_by_person(person_id: str, query_params: QueryParams) -> Iterable[str] | Iterable[bytes]:
+    columns = get_export_columns(query_params)
+    pipeline_params = get_works_project_pipeline_params(columns)
+    documents = csv_repository.get_works_csv_by_person(person_id, query_params, pipeline_params)
+    return get_export_chunks(documents, columns, query_params)
+
+
+def get_works_csv_by_source(source_id: str, query_params: QueryParams) -> Iterable[str] | Iterable[bytes]:
     """
-    Orchestrate the complete CSV generation process for works from a specific source.
+    Orchestrate the complete export process for works from a specific source.
 
     This is the main service function that coordinates the entire workflow:
-    1. Define which fields to retrieve from database (projection)
+    1. Resolve the requested columns and the fields to retrieve from database (projection)
     2. Query works from database with filters
-    3. Process and transform raw data for CSV format
-    4. Generate final CSV string
+    3. Process and transform raw data for export
+    4. Stream the export in chunks, in the requested format and compression
 
     Args:
         source_id: Unique identifier of the source (institution, journal, etc.)
-        query_params: Query parameters for filtering and pagination
+        query_params: Query parameters for filtering, columns, format and compression
 
     Returns:
-        str: Complete CSV file content as string, ready for HTTP response
+        Iterable[str] | Iterable[bytes]: Export chunks, ready to be streamed in the HTTP response
     """
-    pipeline_params = get_works_project_pipeline_params()
-    works = csv_repository.get_works_csv_by_source(source_id, query_params, pipeline_params)
-    data = get_csv_data(works)
-    return work_parser.parse_csv(data)
+    columns = get_export_columns(query_params)
+    pipeline_params = get_works_project_pipeline_params(columns)
+    documents = csv_repository.get_works_csv_by_source(source_id, query_params, pipeline_params)
+    return get_export_chunks(documents, columns, query_params)
+
+
+def get_export_columns(query_params: QueryParams) -> list[str]:
+    if query_params.format not in [None, *WORKS_EXPORT_FORMATS.keys()]:
+        raise ValueError(f"Formato no soportado: {query_params.format}.")
+    if query_params.compression not in [None, "gzip"]:
+        raise ValueError(f"Compresión no soportada: {query_params.compression}.")
+    if query_params.compression and query_params.format in ["parquet", "arrow"]:
+        raise ValueError(f"El formato {query_params.format} ya es binario y no admite compresión gzip.")
+    if not query_params.columns:
+        return list(WORKS_EXPORT_COLUMNS.keys())
+    columns = [column.strip() for column in query_params.columns.split(",") if column.strip()]
+    unknown_columns = [column for column in columns if column not in WORKS_EXPORT_COLUMNS]
+    if unknown_columns:
+        raise ValueError(f"Columnas no soportadas: {', '.join(unknown_columns)}.")
+    return list(dict.fromkeys(columns))
+
+
+def get_export_chunks(
+    documents: Iterable[dict], columns: list[str], query_params: QueryParams
+) -> Iterable[str] | Iterable[bytes]:
+    if settings.EXPORT_RAW_ROWS:
+        rows = get_csv_rows(documents, columns)
+    else:
+        rows = get_export_rows(get_csv_data(Work(**document) for document in documents), columns)
+    export_format = query_params.format or "csv"
+    types = {column: WORKS_EXPORT_COLUMNS[column]["type"] for column in columns}
+    if export_format == "parquet":
+        return work_parser.parse_parquet(get_typed_rows(rows, types), types, settings.EXPORT_BATCH_SIZE)
+    if export_format == "arrow":
+        return work_parser.parse_arrow(get_typed_rows(rows, types), types, settings.EXPORT_BATCH_SIZE)
+    if export_format == "ndjson":
+        chunks = work_parser.parse_ndjson(get_typed_rows(rows, types))
+    else:
+        chunks = work_parser.parse_csv(rows, columns)
+    if query_params.compression == "gzip":
+        return get_gzip_chunks(chunks)
+    return chunks
+
+
+def get_export_rows(works: Iterable[Work], columns: list[str]) -> Generator[dict, None, None]:
+    include = set(columns)
+    for work in works:
+        yield work.model_dump(include=include)
 
 
-def get_works_project_pipeline_params() -> dict:
+def get_typed_rows(rows: Iterable[dict], types: dict[str, str]) -> Generator[dict, None, None]:
+    """
+    Casts the values of every row to the type of its column, so columnar and JSON exports
+    keep years and citation counts as numbers instead of the strings written in the CSV.
     """
-    Define database projection parameters for CSV export.
+    for row in rows:
+        yield {column: get_typed_value(row.get(column), column_type) for column, column_type in types.items()}
+
+
+def get_typed_value(value: Any, column_type: str) -> Any:
+    if value is None or value == "":
+        return None
+    if column_type == "int":
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+    return str(value)
+
 
-    Specifies which fields should be retrieved from the database to minimize
-    data transfer and improve query performance. Only fields needed for CSV
-    export are included.
+def get_content_type(query_params: QueryParams) -> str:
+    if query_params.compression == "gzip":
+        return "application/gzip"
+    return WORKS_EXPORT_FORMATS[query_params.format or "csv"]["content_type"]
+
+
+def get_file_name(name: str, query_params: QueryParams) -> str:
+    extension = WORKS_EXPORT_FORMATS[query_params.format or "csv"]["extension"]
+    return f"{name}.{extension}.gz" if query_params.compression == "gzip" else f"{name}.{extension}"
+
+
+def get_works_project_pipeline_params(columns: list[str] | None = None) -> dict:
+    """
+    Define database projection parameters for the export.
+
+    Only the fields needed by the requested columns are retrieved from the database,
+    following the "fields" of each column in WORKS_EXPORT_COLUMNS.
 
     Returns:
         dict: Pipeline parameters with 'project' key containing list of field names
 
     Note:
-        Adding new columns to CSV requires adding corresponding fields here
+        Adding a new column only requires adding it to WORKS_EXPORT_COLUMNS
     """
-    pipeline_params = {
-        "project": [
-            "external_ids",
-            "authors",
-            "bibliographic_info",
-            "open_access",
-            "citations_count",
-            "subjects",
-            "titles",
-            "types",
-            "source",
-            "groups",
-            "year_published",
-            "ranking",
-            "primary_topic",
-            "doi",
-        ]
-    }
+    fields = ["external_ids"]
+    for column in columns or WORKS_EXPORT_COLUMNS.keys():
+        fields += WORKS_EXPORT_COLUMNS[column]["fields"]
+    pipeline_params = {"project": list(dict.fromkeys(fields))}
     return pipeline_params
 
 
-def get_csv_data(works: Generator) -> list:
-    data = []
+def get_csv_data(works: Generator) -> Generator:
     for work in works:
         set_open_access_status(work)
         set_doi(work)
@@ -98,8 +202,7 @@ def get_csv_data(works: Generator) -> list:
         set_csv_types(work)
         set_primary_topic(work)
         source_service.update_csv_work_source(work)
-        data.append(work)
-    return data
+        yield work
 
 
 def set_primary_topic(work: Work) -> None:
@@ -256,3 +359,231 @@ def set_csv_affiliations(work: Work) -> None:
     work.groups_csv = " | ".join(groups) or None
     work.groups_ranking = " | ".join(groups_ranking) or None
     work.countries = " | ".join(countries) or None
+
+
+def get_csv_rows(documents: Iterable[dict], columns: list[str]) -> Generator[dict, None, None]:
+    """
+    Fast path of get_csv_data: builds the export rows straight from the documents of the cursor,
+    without hydrating Work models.
+
+    It writes the same values as the set_csv_* functions above, which remain the reference of the model path
+    used when EXPORT_RAW_ROWS is disabled. Any change to a column must be made in both paths.
+    """
+    for document in documents:
+        row = get_csv_row(document)
+        yield {column: row[column] for column in columns}
+
+
+def get_csv_row(document: dict) -> dict[str, Any]:
+    row: dict[str, Any] = {"publisher": None, "doi": document.get("doi") or None}
+    row["open_access_status"] = (document.get("open_access") or {}).get("open_access_status")
+    row["ranking"] = get_csv_ranking(document.get("ranking"))
+    row.update(get_csv_affiliations(document))
+    row["authors_csv"] = " | ".join(
+        sorted({author.get("full_name") for author in document.get("authors") or [] if author.get("full_name")})
+    )
+    row.update(get_csv_bibliographic_info(document.get("bibliographic_info")))
+    row.update(get_csv_citations_count(document.get("citations_count")))
+    row["subjects"] = get_csv_subjects(document.get("subjects"))
+    row.update(get_csv_title_and_language(document.get("titles")))
+    row.update(get_csv_types(document.get("types")))
+    row["primary_topic_csv"] = get_csv_primary_topic(document.get("primary_topic"))
+    row.update(get_csv_source(document.get("source"), document.get("date_published")))
+    row["year_published"] = document.get("year_published")
+    return row
+
+
+def get_csv_ranking(ranking: Any) -> str | None:
+    if not ranking or not isinstance(ranking, list):
+        return None
+
+    rankings: list = []
+    for rank in ranking:
+        date = rank.get("date")
+        if isinstance(date, int):
+            date = datetime.fromtimestamp(date).strftime("%d-%m-%Y")
+        elif not isinstance(date, str):
+            date = None
+
+        parts = [str(clean_nan(rank.get("rank"))), str(rank.get("source"))]
+        if date:
+            parts.append(date)
+        rankings.append(" / ".join(parts))
+
+    return " | ".join(rankings) if rankings else None
+
+
+def get_csv_affiliations(document: dict) -> dict[str, str | None]:
+    countries, institutions, departments, faculties, groups = (set(), set(), set(), set(), set())
+    groups_ranking = set()
+
+    for author in document.get("authors") or []:
+        affiliations = author.get("affiliations")
+        if isinstance(affiliations, dict):
+            affiliations = [affiliations]
+        for affiliation in affiliations or []:
+            if not isinstance(affiliation, dict):
+                continue
+            affiliation_types = affiliation.get("types")
+            affiliation_type = affiliation_types[0].get("type") if affiliation_types else None
+
+            if affiliation_type in institutions_list:
+                institutions.add(str(affiliation.get("name")))
+                if affiliation.get("addresses"):
+                    countries.add(str(affiliation["addresses"][0].get("country")))
+
+            elif affiliation_type == "department":
+                departments.add(str(affiliation.get("name")))
+
+            elif affiliation_type == "faculty":
+                faculties.add(str(affiliation.get("name")))
+
+            elif affiliation_type == "group":
+                groups.add(str(affiliation.get("name")))
+
+    work_groups = document.get("groups")
+    if work_groups and isinstance(work_groups, list):
+        for group in work_groups:
+            for rank in group.get("ranking") or []:
+                from_date, to_date, date = rank.get("from_date"), rank.get("to_date"), rank.get("date")
+                if type(from_date) == int and type(to_date) == int:
+                    groups_ranking.add(
+                        str(clean_nan(rank.get("rank")))
+                        + " / "
+                        + datetime.fromtimestamp(from_date).strftime("%d-%m-%Y")
+                        + " - "
+                        + datetime.fromtimestamp(to_date).strftime("%d-%m-%Y")
+                    )
+                elif type(date) == int:
+                    groups_ranking.add(
+                        str(clean_nan(rank.get("rank"))) + " / " + datetime.fromtimestamp(date).strftime("%d-%m-%Y")
+                    )
+
+    return {
+        "institutions": " | ".join(institutions) or None,
+        "departments": " | ".join(departments) or None,
+        "faculties": " | ".join(faculties) or None,
+        "groups_csv": " | ".join(groups) or None,
+        "groups_ranking": " | ".join(groups_ranking) or None,
+        "countries": " | ".join(countries) or None,
+    }
+
+
+def get_csv_bibliographic_info(biblio_info: dict | None) -> dict[str, Any]:
+    biblio_info = biblio_info or {}
+    raw_bibtex = biblio_info.get("bibtex")
+    return {
+        "bibtex": raw_bibtex.replace("\n", " ") if isinstance(raw_bibtex, str) else "",
+        "pages": biblio_info.get("pages"),
+        "issue": biblio_info.get("issue") or "",
+        "start_page": biblio_info.get("start_page"),
+        "end_page": biblio_info.get("end_page"),
+        "volume": biblio_info.get("volume"),
+    }
+
+
+def get_csv_citations_count(citations_count: Any) -> dict[str, str | None]:
+    counts: dict[str, str | None] = {"openalex_citations_count": None, "scholar_citations_count": None}
+    if not isinstance(citations_count, list):
+        return counts
+
+    for citation_count in citations_count:
+        if citation_count.get("source") == "openalex":
+            counts["openalex_citations_count"] = str(citation_count.get("count") or 0)
+        elif citation_count.get("source") == "scholar":
+            counts["scholar_citations_count"] = str(citation_count.get("count") or 0)
+    return counts
+
+
+def get_csv_subjects(subjects: Any) -> str | None:
+    if not isinstance(subjects, list) or not subjects:
+        return None
+
+    all_subjects = {subject.get("name") for subject in (subjects[0].get("subjects") or []) if subject.get("name")}
+    return " | ".join(sorted(all_subjects)) if all_subjects else None
+
+
+def get_csv_title_and_language(titles: list | None) -> dict[str, str | None]:
+    if not titles:
+        return {"title": None, "language": None}
+
+    hierarchy = ["openalex", "scienti", "minciencias", "ranking", "scholar"]
+
+    def order(title: dict) -> float:
+        source = title.get("source")
+        return hierarchy.index(source) if source in hierarchy else float("inf")
+
+    first_title = min(titles, key=order)
+    return {"title": first_title.get("title"), "language": first_title.get("lang")}
+
+
+def get_csv_types(types: Any) -> dict[str, str | None]:
+    if not isinstance(types, list) or not types:
+        return {"openalex_types": None, "scienti_types": None, "impactu_types": None}
+
+    openalex_types = {
+        openalex_types_dict[t["type"]] if t.get("type") in openalex_types_dict else t.get("type")
+        for t in types
+        if t.get("source") == "openalex" and t.get("type")
+    }
+    scienti_types = {str(t.get("type")) for t in types if t.get("source") == "scienti" and t.get("type")}
+    impactu_types = {str(t.get("type")) for t in types if t.get("source") == "impactu" and t.get("type")}
+
+    return {
+        "openalex_types": " | ".join(sorted(openalex_types)) if openalex_types else None,
+        "scienti_types": " | ".join(sorted(scienti_types)) if scienti_types else None,
+        "impactu_types": " | ".join(sorted(impactu_types)) if impactu_types else None,
+    }
+
+
+def get_csv_primary_topic(primary_topic: Any) -> str | None:
+    if not isinstance(primary_topic, dict):
+        return None
+
+    def get_level(name: str) -> dict | None:
+        level = primary_topic.get(name)
+        return level if isinstance(level, dict) else None
+
+    subfield, field, domain = get_level("subfield"), get_level("field"), get_level("domain")
+    topic_parts = [
+        f"Topic: {primary_topic.get('display_name')}" if primary_topic.get("display_name") else None,
+        f"Subfield: {subfield.get('display_name')}" if subfield is not None else None,
+        f"Field: {field.get('display_name')}" if field is not None else None,
+        f"Domain: {domain.get('display_name')}" if domain is not None else None,
+    ]
+    return " | ".join(filter(None, topic_parts))
+
+
+def get_csv_source(source: dict | None, date_published: int | None) -> dict[str, str | None]:
+    values: dict[str, str | None] = {
+        "source_name": None,
+        "source_apc": None,
+        "source_urls": None,
+        "scimago_quartile": None,
+    }
+    if source is None:
+        return values
+
+    values["source_name"] = str(source.get("name")) if source.get("name") else None
+    apc = source.get("apc") or {}
+    if apc.get("charges") and apc.get("currency"):
+        values["source_apc"] = f"{apc['charges']} / {apc['currency']}"
+
+    urls = {str(url.get("url")) for url in source.get("external_urls") or [] if url.get("url")}
+    values["source_urls"] = " | ".join(urls) if urls else None
+
+    if source.get("ranking") and date_published:
+        for ranking in source["ranking"]:
+            rank, from_date, to_date = clean_nan(ranking.get("rank")), ranking.get("from_date"), ranking.get("to_date")
+            condition = (
+                ranking.get("source") == "scimago Best Quartile"
+                and rank
+                and rank != "-"
+                and isinstance(from_date, int)
+                and isinstance(to_date, int)
+                and from_date <= date_published <= to_date
+            )
+            if condition:
+                values["scimago_quartile"] = str(rank)
+                break
+    return values
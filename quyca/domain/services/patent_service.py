@@ -3,6 +3,7 @@ from typing import Generator
 from quyca.domain.models.base_model import QueryParams
 from quyca.infrastructure.repositories import patent_repository
 from quyca.domain.services.base_service import (
+    get_next_cursor_data,
     set_external_ids,
     set_external_urls,
     set_authors_external_ids,
@@ -33,28 +34,30 @@ def get_patent_authors(patent_id: str) -> dict:
 
 def search_patents(query_params: QueryParams) -> dict:
     pipeline_params = get_patents_by_entity_pipeline_params()
-    patents, total_results = patent_repository.search_patents(query_params, pipeline_params)
+    patents, total_results, next_cursor = patent_repository.search_patents(query_params, pipeline_params)
     patents_data = get_patent_by_entity_data(patents)
     data = patent_parser.parse_search_results(patents_data)
-    return {"data": data, "total_results": total_results}
+    return {"data": data, "total_results": total_results, **get_next_cursor_data(query_params, next_cursor)}
 
 
 def get_patents_by_affiliation(affiliation_id: str, query_params: QueryParams) -> dict:
     pipeline_params = get_patents_by_entity_pipeline_params()
-    patents = patent_repository.get_patents_by_affiliation(affiliation_id, query_params, pipeline_params)
+    patents, total_results, next_cursor = patent_repository.get_patents_page_by_affiliation(
+        affiliation_id, query_params, pipeline_params
+    )
     patents_data = get_patent_by_entity_data(patents)
     data = patent_parser.parse_patents_by_entity(patents_data)
-    total_results = patent_repository.get_patents_count_by_affiliation(affiliation_id)
-    return {"data": data, "total_results": total_results}
+    return {"data": data, "total_results": total_results, **get_next_cursor_data(query_params, next_cursor)}
 
 
 def get_patents_by_person(person_id: str, query_params: QueryParams) -> dict:
     pipeline_params = get_patents_by_entity_pipeline_params()
-    patents = patent_repository.get_patents_by_person(person_id, query_params, pipeline_params)
+    patents, total_results, next_cursor = patent_repository.get_patents_page_by_person(
+        person_id, query_params, pipeline_params
+    )
     patents_data = get_patent_by_entity_data(patents)
     data = patent_parser.parse_patents_by_entity(patents_data)
-    total_results = patent_repository.get_patents_count_by_person(person_id)
-    return {"data": data, "total_results": total_results}
+    return {"data": data, "total_results": total_results, **get_next_cursor_data(query_params, next_cursor)}
 
 
 def get_patent_by_entity_data(patents: Generator) -> list:
@@ -1,6 +1,8 @@
+from functools import partial
 from typing import Any
 from quyca.domain.constants.articles_types import articles_types_list
 from quyca.domain.models.base_model import QueryParams
+from quyca.domain.services import plot_cache_service
 from quyca.infrastructure.repositories import (
     plot_repository,
     work_repository,
@@ -17,7 +19,13 @@ from quyca.domain.parsers import (
 )
 
 
-def get_person_plot(person_id: str, query_params: QueryParams) -> dict[str, Any]:
+def get_person_plot(person_id: str, query_params: QueryParams) -> dict[str, Any] | None:
+    return plot_cache_service.get_plot(
+        "person", person_id, query_params, partial(build_person_plot, person_id, query_params)
+    )
+
+
+def build_person_plot(person_id: str, query_params: QueryParams) -> dict[str, Any]:
     plot_name = query_params.plot
     if plot_name is None:
         raise ValueError("El parámetro 'plot' no puede ser None.")
@@ -35,15 +43,15 @@ def get_person_plot(person_id: str, query_params: QueryParams) -> dict[str, Any]
 
 
 def plot_annual_evolution_by_scienti_classification(person_id: str, query_params: QueryParams) -> dict:
-    pipeline_params = {"project": ["year_published", "types"]}
-    works = work_repository.get_works_by_person(person_id, query_params, pipeline_params)
-    return bar_parser.parse_annual_evolution_by_scienti_classification(works)
+    buckets = plot_repository.get_works_plot_buckets_by_person(
+        person_id, "annual_evolution_by_scienti_classification", query_params
+    )
+    return bar_parser.parse_annual_evolution_by_scienti_classification_from_buckets(buckets)
 
 
 def plot_annual_citation_count(person_id: str, query_params: QueryParams) -> dict:
-    pipeline_params = {"project": ["citations_by_year"]}
-    works = work_repository.get_works_by_person(person_id, query_params, pipeline_params)
-    return bar_parser.parse_annual_citation_count(works)
+    buckets = plot_repository.get_works_plot_buckets_by_person(person_id, "annual_citation_count", query_params)
+    return bar_parser.parse_annual_citation_count_from_buckets(buckets)
 
 
 def plot_annual_apc_expenses(person_id: str, query_params: QueryParams) -> dict:
@@ -60,31 +68,15 @@ def plot_annual_apc_expenses(person_id: str, query_params: QueryParams) -> dict:
 
 
 def plot_annual_articles_open_access(person_id: str, query_params: QueryParams) -> dict:
-    pipeline_params = {
-        "project": ["year_published", "open_access"],
-        "match": {"types.type": {"$in": articles_types_list}},
-    }
-    works = work_repository.get_works_by_person(person_id, query_params, pipeline_params)
-    return bar_parser.parse_annual_articles_open_access(works)
+    buckets = plot_repository.get_works_plot_buckets_by_person(person_id, "annual_articles_open_access", query_params)
+    return bar_parser.parse_annual_articles_open_access_from_buckets(buckets)
 
 
 def plot_annual_articles_by_top_publishers(person_id: str, query_params: QueryParams) -> dict:
-    pipeline_params = {
-        "work_project": [
-            "source.id",
-            "source.name",
-            "source.publisher.name",
-            "year_published",
-            "types",
-            "source.apc",
-        ],
-        "match": {
-            "types.type": {"$in": articles_types_list},
-            "source.publisher.name": {"$ne": None},
-        },
-    }
-    works = work_repository.get_works_with_source_by_person(person_id, query_params, pipeline_params)
-    return bar_parser.parse_annual_articles_by_top_publishers(works)
+    buckets = plot_repository.get_works_plot_buckets_by_person(
+        person_id, "annual_articles_by_top_publishers", query_params
+    )
+    return bar_parser.parse_annual_articles_by_top_publishers_from_buckets(buckets)
 
 
 def plot_most_used_title_words(person_id: str, query_params: QueryParams) -> dict:
@@ -93,21 +85,13 @@ def plot_most_used_title_words(person_id: str, query_params: QueryParams) -> dic
 
 
 def plot_articles_by_publisher(person_id: str, query_params: QueryParams) -> dict:
-    pipeline_params = {
-        "work_project": ["source.id", "source.name", "source.publisher.name"],
-        "match": {"types.type": {"$in": articles_types_list}},
-    }
-    works = work_repository.get_works_with_source_by_person(person_id, query_params, pipeline_params)
-    return pie_parser.parse_articles_by_publisher(works)
+    buckets = plot_repository.get_works_plot_buckets_by_person(person_id, "articles_by_publisher", query_params)
+    return pie_parser.parse_articles_by_publisher_from_buckets(buckets)
 
 
 def plot_products_by_subject(person_id: str, query_params: QueryParams) -> dict:
-    pipeline_params = {
-        "match": {"primary_topic.display_name": {"$exists": True, "$ne": None}},
-        "project": ["primary_topic.display_name"],
-    }
-    works = work_repository.get_works_by_person(person_id, query_params, pipeline_params)
-    return pie_parser.parse_products_by_subject(works)
+    buckets = plot_repository.get_works_plot_buckets_by_person(person_id, "products_by_subject", query_params)
+    return pie_parser.parse_products_by_subject_from_buckets(buckets)
 
 
 def plot_products_by_database(person_id: str, query_params: QueryParams) -> dict:
@@ -116,12 +100,8 @@ def plot_products_by_database(person_id: str, query_params: QueryParams) -> dict
 
 
 def plot_articles_by_access_route(person_id: str, query_params: QueryParams) -> dict:
-    pipeline_params = {
-        "match": {"types.type": {"$in": articles_types_list}},
-        "project": ["open_access"],
-    }
-    works = work_repository.get_works_by_person(person_id, query_params, pipeline_params)
-    return pie_parser.parse_products_by_access_route(works)
+    buckets = plot_repository.get_works_plot_buckets_by_person(person_id, "articles_by_access_route", query_params)
+    return pie_parser.parse_products_by_access_route_from_buckets(buckets)
 
 
 def plot_articles_by_scienti_category(person_id: str, query_params: QueryParams) -> dict:
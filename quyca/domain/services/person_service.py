@@ -1,5 +1,6 @@
 from quyca.domain.models.base_model import QueryParams
 from quyca.domain.parsers import person_parser
+from quyca.domain.services.base_service import get_next_cursor_data
 from quyca.infrastructure.repositories import person_repository
 
 
@@ -22,9 +23,9 @@ def search_persons(query_params: QueryParams) -> dict:
             "logo",
         ]
     }
-    persons, total_results = person_repository.search_persons(query_params, pipeline_params)
+    persons, total_results, next_cursor = person_repository.search_persons(query_params, pipeline_params)
     persons_list = []
     for person in persons:
         persons_list.append(person)
     data = person_parser.parse_search_result(persons_list)
-    return {"data": data, "total_results": total_results}
+    return {"data": data, "total_results": total_results, **get_next_cursor_data(query_params, next_cursor)}
@@ -0,0 +1,111 @@
+import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextvars import Context, copy_context
+from functools import partial
+from typing import Any, Callable, Generator, Mapping
+
+from sentry_sdk import capture_exception
+
+from quyca.config import settings
+from quyca.domain.models.base_model import QueryParams
+from quyca.domain.services import affiliation_plot_service, person_plot_service, plot_cache_service
+
+_executor: ThreadPoolExecutor | None = None
+_executor_pid: int | None = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Returns the process-wide executor of plot batches, creating it on first use.
+
+    Like the MongoDB client it is bound to the pid that created it, so every gunicorn worker runs its own threads.
+    """
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor is not None and _executor_pid == pid:
+        return _executor
+    with _executor_lock:
+        if _executor is None or _executor_pid != pid:
+            _executor = ThreadPoolExecutor(max_workers=settings.PLOT_BATCH_MAX_WORKERS, thread_name_prefix="plots")
+            _executor_pid = pid
+    return _executor
+
+
+def get_plots_names(query_params: QueryParams) -> list[str]:
+    plots = list(dict.fromkeys(plot.strip() for plot in (query_params.plots or "").split(",") if plot.strip()))
+    if not plots:
+        raise ValueError("El parámetro 'plots' debe contener al menos un gráfico.")
+    if len(plots) > settings.PLOT_BATCH_MAX_PLOTS:
+        raise ValueError(f"El parámetro 'plots' admite máximo {settings.PLOT_BATCH_MAX_PLOTS} gráficos.")
+    return plots
+
+
+def get_plot_query_params(query_params: QueryParams, plot: str) -> QueryParams:
+    return query_params.model_copy(update={"plot": plot, "plots": None})
+
+
+def get_affiliation_plots(
+    affiliation_id: str, affiliation_type: str, query_params: QueryParams
+) -> Generator[str, None, None]:
+    plots = get_plots_names(query_params)
+    tasks = {
+        plot: partial(
+            affiliation_plot_service.get_affiliation_plot,
+            affiliation_id,
+            affiliation_type,
+            get_plot_query_params(query_params, plot),
+        )
+        for plot in plots
+    }
+    return stream_plots(tasks)
+
+
+def get_person_plots(person_id: str, query_params: QueryParams) -> Generator[str, None, None]:
+    plots = get_plots_names(query_params)
+    tasks = {
+        plot: partial(person_plot_service.get_person_plot, person_id, get_plot_query_params(query_params, plot))
+        for plot in plots
+    }
+    return stream_plots(tasks)
+
+
+def stream_plots(tasks: Mapping[str, Callable[[], Any]]) -> Generator[str, None, None]:
+    """
+    Runs the plots of a batch on the shared executor and yields one NDJSON line per plot as soon as it is done.
+
+    The context of the request is copied when the batch is created, before the body is streamed and the request
+    torn down, and every plot runs in it, so the loader cache of the request is shared by all of them.
+    Lines of cached plots carry the outcome of the plot cache in "cache". A failing plot is reported in its
+    own line and does not stop the others.
+    """
+    return iter_plots(tasks, copy_context())
+
+
+def iter_plots(tasks: Mapping[str, Callable[[], Any]], context: Context) -> Generator[str, None, None]:
+    executor = get_executor()
+    futures: dict[Future, str] = {
+        executor.submit(context.copy().run, run_plot, task): plot for plot, task in tasks.items()
+    }
+    try:
+        for future in as_completed(futures):
+            plot = futures[future]
+            try:
+                data, cache_outcome = future.result()
+                line = {"plot": plot, "data": data}
+                if cache_outcome:
+                    line["cache"] = cache_outcome
+            except Exception as e:
+                capture_exception(e)
+                line = {"plot": plot, "error": str(e)}
+            yield json.dumps(line, default=str) + "\n"
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def run_plot(task: Callable[[], Any]) -> tuple[Any, str | None]:
+    plot_cache_service.start_plot_cache_outcome()
+    return task(), plot_cache_service.plot_cache_outcome.get()
@@ -0,0 +1,136 @@
+import json
+import threading
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Callable
+
+from flask import Response
+
+from quyca.config import settings
+from quyca.domain.models.base_model import QueryParams
+from quyca.infrastructure.repositories import filters_repository, info_repository, plot_cache_repository
+
+memory_cache: OrderedDict[str, tuple[str, int]] = OrderedDict()
+memory_cache_state: dict[str, Any] = {"bytes": 0, "db_update": None}
+plot_cache_stats: dict[str, int] = {"memory_hits": 0, "shared_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+memory_cache_lock = threading.Lock()
+
+PLOT_CACHE_HEADER = "X-Plot-Cache"
+# Where the last plot of the current context came from: memory-hit, shared-hit or miss. Plots of a batch run
+# in their own copies of the request context, so each one reports its own outcome.
+plot_cache_outcome: ContextVar[str | None] = ContextVar("plot_cache_outcome", default=None)
+
+
+def get_plot(
+    entity: str, entity_id: str, query_params: QueryParams, build_plot: Callable[[], dict[str, Any] | None]
+) -> dict[str, Any] | None:
+    """
+    Returns a plot from the cache, building and storing it on a miss.
+
+    Plots are cached in two tiers: an LRU in the worker bounded by PLOT_CACHE_MAX_BYTES and the plots_cache
+    collection shared by all the workers. Keys combine the entity, the plot, the normalized product filters
+    and the last db update, so a new ETL run invalidates every cached plot. The outcome is kept in
+    plot_cache_outcome, which set_plot_cache_header reports in the response.
+    """
+    if not settings.PLOT_CACHE_ENABLED or not query_params.plot:
+        return build_plot()
+    db_update = info_repository.get_current_db_update()
+    set_cache_db_update(db_update)
+    filters = filters_repository.get_normalized_filters(query_params)
+    key = f"{filters_repository.get_filters_key(entity, entity_id, filters)}:{query_params.plot}:{db_update}"
+
+    cached_plot = get_memory_plot(key)
+    if cached_plot is not None:
+        count_plot_cache("memory_hits")
+        plot_cache_outcome.set("memory-hit")
+        return load_plot(cached_plot)
+    cached_plot = plot_cache_repository.get_cached_plot(key, db_update)
+    if cached_plot is not None:
+        count_plot_cache("shared_hits")
+        plot_cache_outcome.set("shared-hit")
+        set_memory_plot(key, cached_plot)
+        return load_plot(cached_plot)
+
+    count_plot_cache("misses")
+    plot_cache_outcome.set("miss")
+    plot = build_plot()
+    if plot is None:
+        return plot
+    try:
+        serialized_plot = json.dumps(plot)
+    except (TypeError, ValueError):
+        return plot
+    if len(serialized_plot.encode("utf-8")) > settings.PLOT_CACHE_MAX_ENTRY_BYTES:
+        return plot
+    set_memory_plot(key, serialized_plot)
+    plot_cache_repository.save_cached_plot(key, entity, entity_id, query_params.plot, db_update, serialized_plot)
+    count_plot_cache("stores")
+    return plot
+
+
+def start_plot_cache_outcome() -> None:
+    plot_cache_outcome.set(None)
+
+
+def set_plot_cache_header(response: Response) -> Response:
+    if outcome := plot_cache_outcome.get():
+        response.headers[PLOT_CACHE_HEADER] = outcome
+    return response
+
+
+def load_plot(serialized_plot: str) -> dict[str, Any]:
+    plot: dict[str, Any] = json.loads(serialized_plot)
+    return plot
+
+
+def set_cache_db_update(db_update: int) -> None:
+    if memory_cache_state["db_update"] == db_update:
+        return
+    with memory_cache_lock:
+        if memory_cache_state["db_update"] == db_update:
+            return
+        memory_cache.clear()
+        memory_cache_state["bytes"] = 0
+        memory_cache_state["db_update"] = db_update
+    plot_cache_repository.delete_outdated_plots(db_update)
+
+
+def get_memory_plot(key: str) -> str | None:
+    with memory_cache_lock:
+        entry = memory_cache.get(key)
+        if entry is None:
+            return None
+        memory_cache.move_to_end(key)
+        return entry[0]
+
+
+def set_memory_plot(key: str, plot: str) -> None:
+    size = len(plot.encode("utf-8"))
+    if size > settings.PLOT_CACHE_MAX_BYTES:
+        return
+    with memory_cache_lock:
+        previous_entry = memory_cache.pop(key, None)
+        if previous_entry is not None:
+            memory_cache_state["bytes"] -= previous_entry[1]
+        memory_cache[key] = (plot, size)
+        memory_cache_state["bytes"] += size
+        while memory_cache_state["bytes"] > settings.PLOT_CACHE_MAX_BYTES:
+            _, (_, evicted_size) = memory_cache.popitem(last=False)
+            memory_cache_state["bytes"] -= evicted_size
+            plot_cache_stats["evictions"] += 1
+
+
+def count_plot_cache(event: str) -> None:
+    with memory_cache_lock:
+        plot_cache_stats[event] += 1
+
+
+def get_plot_cache_stats() -> dict[str, Any]:
+    with memory_cache_lock:
+        stats: dict[str, Any] = dict(plot_cache_stats)
+        stats["entries"] = len(memory_cache)
+        stats["bytes"] = memory_cache_state["bytes"]
+        stats["db_update"] = memory_cache_state["db_update"]
+    requests = stats["memory_hits"] + stats["shared_hits"] + stats["misses"]
+    stats["hit_ratio"] = round((stats["memory_hits"] + stats["shared_hits"]) / requests, 4) if requests else 0.0
+    return stats
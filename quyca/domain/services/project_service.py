@@ -3,6 +3,7 @@ from typing import Generator
 from quyca.domain.models.base_model import QueryParams
 from quyca.infrastructure.repositories import project_repository
 from quyca.domain.services.base_service import (
+    get_next_cursor_data,
     set_external_ids,
     set_external_urls,
     set_authors_external_ids,
@@ -33,28 +34,30 @@ def get_project_authors(project_id: str) -> dict:
 
 def search_projects(query_params: QueryParams) -> dict:
     pipeline_params = get_projects_by_entity_pipeline_params()
-    projects, total_results = project_repository.search_projects(query_params, pipeline_params)
+    projects, total_results, next_cursor = project_repository.search_projects(query_params, pipeline_params)
     projects_data = get_project_by_entity_data(projects)
     data = project_parser.parse_search_results(projects_data)
-    return {"data": data, "total_results": total_results}
+    return {"data": data, "total_results": total_results, **get_next_cursor_data(query_params, next_cursor)}
 
 
 def get_projects_by_affiliation(affiliation_id: str, query_params: QueryParams) -> dict:
     pipeline_params = get_projects_by_entity_pipeline_params()
-    projects = project_repository.get_projects_by_affiliation(affiliation_id, query_params, pipeline_params)
+    projects, total_results, next_cursor = project_repository.get_projects_page_by_affiliation(
+        affiliation_id, query_params, pipeline_params
+    )
     projects_data = get_project_by_entity_data(projects)
     data = project_parser.parse_projects_by_entity(projects_data)
-    total_results = project_repository.get_projects_count_by_affiliation(affiliation_id)
-    return {"data": data, "total_results": total_results}
+    return {"data": data, "total_results": total_results, **get_next_cursor_data(query_params, next_cursor)}
 
 
 def get_projects_by_person(person_id: str, query_params: QueryParams) -> dict:
     pipeline_params = get_projects_by_entity_pipeline_params()
-    projects = project_repository.get_projects_by_person(person_id, query_params, pipeline_params)
+    projects, total_results, next_cursor = project_repository.get_projects_page_by_person(
+        person_id, query_params, pipeline_params
+    )
     projects_data = get_project_by_entity_data(projects)
     data = project_parser.parse_projects_by_entity(projects_data)
-    total_results = project_repository.get_projects_count_by_person(person_id)
-    return {"data": data, "total_results": total_results}
+    return {"data": data, "total_results": total_results, **get_next_cursor_data(query_params, next_cursor)}
 
 
 def get_project_by_entity_data(projects: Generator) -> list:
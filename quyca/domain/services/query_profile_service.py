@@ -0,0 +1,67 @@
+import json
+from typing import Any
+
+from flask import Response, request
+from flask_jwt_extended import get_jwt, verify_jwt_in_request
+
+from quyca.infrastructure import mongo
+
+PROFILE_REQUEST_HEADER = "X-Query-Profile"
+
+
+def start_request_profile() -> None:
+    """
+    Starts the query profile of the request. Admins sending the X-Query-Profile header get a detailed
+    profile, which also measures the bytes received and is returned in the body of JSON responses.
+    """
+    mongo.start_query_profile(detailed=is_detailed_profile_requested())
+
+
+def is_detailed_profile_requested() -> bool:
+    if request.headers.get(PROFILE_REQUEST_HEADER, "").lower() not in ["1", "true"]:
+        return False
+    try:
+        verify_jwt_in_request(optional=True)
+        rol = get_jwt().get("rol")
+    except Exception:
+        return False
+    return isinstance(rol, str) and rol.lower() == "admin"
+
+
+def set_profile_headers(response: Response) -> Response:
+    """
+    Adds the time spent in MongoDB, in total and by collection, as a Server-Timing header. Streamed
+    responses only account for the queries made before the body starts.
+
+    The breakdown by query of a detailed profile has no size limit, so it is not sent as a header, which
+    reverse proxies reject past a few KB: JSON responses are wrapped as {"data", "query_profile"} instead.
+    """
+    profile = mongo.stop_query_profile()
+    if not profile or not profile["entries"]:
+        return response
+    entries = sorted(profile["entries"].values(), key=lambda entry: entry["ms"], reverse=True)
+    collections: dict[str, dict[str, Any]] = {}
+    for entry in entries:
+        collection = collections.setdefault(entry["collection"] or entry["command"], {"calls": 0, "ms": 0.0})
+        collection["calls"] += entry["calls"]
+        collection["ms"] += entry["ms"]
+    total = {
+        "calls": sum(entry["calls"] for entry in entries),
+        "ms": sum(entry["ms"] for entry in entries),
+        "documents": sum(entry["documents"] for entry in entries),
+    }
+    metrics = [get_server_timing_metric("mongo", total["ms"], total["calls"])]
+    metrics += [
+        get_server_timing_metric(f"mongo-{name}", data["ms"], data["calls"]) for name, data in collections.items()
+    ]
+    response.headers.add("Server-Timing", ", ".join(metrics))
+    if profile["detailed"] and response.is_json and not response.is_streamed:
+        total["bytes"] = sum(entry["bytes"] for entry in entries)
+        total["ms"] = round(total["ms"], 3)
+        breakdown = {"total": total, "queries": [{**entry, "ms": round(entry["ms"], 3)} for entry in entries]}
+        response.set_data(json.dumps({"data": response.get_json(), "query_profile": breakdown}, default=str))
+    return response
+
+
+def get_server_timing_metric(name: str, ms: float, calls: int) -> str:
+    return f'{name};dur={ms:.1f};desc="{calls} commands"'
@@ -1,11 +1,19 @@
+from functools import partial
 from typing import Any, Callable
 
 from quyca.domain.models.base_model import QueryParams
+from quyca.domain.services import plot_cache_service
 from quyca.domain.parsers import bar_parser
 from quyca.infrastructure.repositories import plot_repository
 
 
 def get_source_products_plot(source_id: str, query_params: QueryParams) -> dict[str, Any] | None:
+    return plot_cache_service.get_plot(
+        "source", source_id, query_params, partial(build_source_products_plot, source_id, query_params)
+    )
+
+
+def build_source_products_plot(source_id: str, query_params: QueryParams) -> dict[str, Any] | None:
     plot_type = query_params.plot
 
     function: Callable[[str, QueryParams], dict[str, Any] | None] | None = globals().get(f"plot_{plot_type}")
@@ -1,15 +1,17 @@
 from domain.models.source_model import Source
 from domain.models.work_model import Work
 from infrastructure.repositories import source_repository
+from quyca.infrastructure.repositories import loader_repository
 from quyca.domain.models.base_model import QueryParams
 from quyca.domain.parsers import source_parser
+from quyca.domain.services.base_service import get_next_cursor_data
 
 
 def update_work_source(work: Work) -> None:
     if not work.source or not work.source.id:
         return
 
-    source = source_repository.get_source_by_id(work.source.id)
+    source = loader_repository.get_sources_by_ids([str(work.source.id)]).get(str(work.source.id))
 
     if not source:
         return
@@ -100,14 +102,14 @@ def search_sources(query_params: QueryParams) -> dict:
         A dictionary containing the search data and the total number of results.
     """
     pipeline_params = get_sources_by_entity_pipeline_params()
-    sources, total_sources = source_repository.search_sources(query_params, pipeline_params)
+    sources, total_sources, next_cursor = source_repository.search_sources(query_params, pipeline_params)
     source_list = []
     for source in sources:
         source_list.append(source)
 
     data = source_parser.parse_search_result(source_list)
 
-    return {"data": data, "total_results": total_sources}
+    return {"data": data, "total_results": total_sources, **get_next_cursor_data(query_params, next_cursor)}
 
 
 def get_search_sources_available_filters(query_params: QueryParams) -> dict:
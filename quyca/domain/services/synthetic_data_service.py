@@ -0,0 +1,756 @@
+import math
+import os
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+from bson import ObjectId
+
+from quyca.domain.constants.synthetic_data import (
+    APC_CURRENCIES,
+    AREAS,
+    COLOMBIAN_CITIES,
+    FIRST_NAMES,
+    FOREIGN_FIRST_NAMES,
+    FOREIGN_LAST_NAMES,
+    FOREIGN_PLACES,
+    GROUP_RANKS,
+    IMPACTU_TYPES,
+    INSTITUTION_TYPES,
+    LAST_NAMES,
+    MINCIENCIAS_TYPES,
+    OPEN_ACCESS_STATUSES,
+    OPENALEX_TYPES,
+    PATENT_TYPES,
+    PERSON_RANKS,
+    PROJECT_TYPES,
+    PUBLISHERS,
+    SCIENTI_TYPES,
+    SCIMAGO_QUARTILES,
+    SOURCE_TYPES,
+    SUBAREAS,
+    TITLE_WORDS,
+    TOPIC_FIELDS,
+)
+from quyca.infrastructure.repositories import synthetic_data_repository
+
+COLLECTIONS = [
+    "affiliations",
+    "sources",
+    "person",
+    "works",
+    "patents",
+    "projects",
+    "news_media_collection",
+    "news_urls_collection",
+    "news_professors_collection",
+]
+# Sizes at scale 1. Content grows linearly with the scale and the catalogs (institutions, sources) with its
+# square root, so larger scales also have heavier institutions, groups and sources.
+CONTENT_SIZES = {
+    "colombian_persons": 50000,
+    "foreign_persons": 30000,
+    "works": 250000,
+    "patents": 1500,
+    "projects": 4000,
+    "news_urls": 30000,
+    "news_professors": 3000,
+}
+CATALOG_SIZES = {"education_institutions": 80, "institutions": 1000, "sources": 15000, "news_media": 300}
+AFFILIATION_KINDS = ["education_institutions", "institutions", "faculties", "departments", "groups"]
+FACULTIES_PER_INSTITUTION = 8
+DEPARTMENTS_PER_FACULTY = 4
+GROUPS_PER_INSTITUTION = 30
+# Consecutive Colombian persons form a team sharing institution, faculty, department and group, and most
+# coauthors of a work come from the team of its first author.
+PERSONS_PER_TEAM = 15
+TOPICS = 400
+LARGE_WORKS_SHARE = 0.0005
+FIRST_YEAR = 1990
+LAST_YEAR = 2024
+INSERT_BATCH_SIZE = 1000
+# First four bytes of the ObjectIds of each collection, followed by the index of the document.
+OBJECT_ID_PREFIXES = {
+    "sources": 0x60000000,
+    "works": 0x61000000,
+    "patents": 0x62000000,
+    "projects": 0x63000000,
+    "news_media_collection": 0x64000000,
+    "news_urls_collection": 0x65000000,
+    "news_professors_collection": 0x66000000,
+    "subjects": 0x67000000,
+}
+INSTITUTION_LABELS = {
+    "company": "Corporation",
+    "healthcare": "Hospital",
+    "government": "Ministry",
+    "nonprofit": "Foundation",
+    "facility": "Laboratory",
+    "education": "University",
+    "other": "Institute",
+}
+
+
+def get_plan(scale: float, seed: int) -> Dict[str, Any]:
+    """
+    Sizes of every part of the dataset at a scale, and the number of documents of each collection.
+    """
+    sizes = {name: max(1, round(size * scale)) for name, size in CONTENT_SIZES.items()}
+    sizes.update({name: max(1, round(size * math.sqrt(scale))) for name, size in CATALOG_SIZES.items()})
+    sizes["news_professors"] = min(sizes["news_professors"], sizes["colombian_persons"])
+    sizes["faculties"] = sizes["education_institutions"] * FACULTIES_PER_INSTITUTION
+    sizes["departments"] = sizes["faculties"] * DEPARTMENTS_PER_FACULTY
+    sizes["groups"] = sizes["education_institutions"] * GROUPS_PER_INSTITUTION
+    counts = {
+        "affiliations": sum(sizes[kind] for kind in AFFILIATION_KINDS),
+        "sources": sizes["sources"],
+        "person": sizes["colombian_persons"] + sizes["foreign_persons"],
+        "works": sizes["works"],
+        "patents": sizes["patents"],
+        "projects": sizes["projects"],
+        "news_media_collection": sizes["news_media"],
+        "news_urls_collection": sizes["news_urls"],
+        "news_professors_collection": sizes["news_professors"],
+    }
+    return {"seed": seed, "scale": scale, "sizes": sizes, "counts": counts}
+
+
+def get_chunks(plan: Dict[str, Any], collections: List[str], chunk_size: int) -> List[Dict[str, Any]]:
+    return [
+        {"collection": collection, "start": start, "end": min(start + chunk_size, plan["counts"][collection])}
+        for collection in collections
+        for start in range(0, plan["counts"][collection], chunk_size)
+    ]
+
+
+def generate_chunk(chunk: Dict[str, Any], plan: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Builds the documents of a range of indexes of a collection and inserts them in batches.
+
+    Every document, and every entity it embeds, is built from its own index and the seed alone, so chunks
+    can be generated in any order and in any process and the dataset is the same for the same seed and scale.
+    """
+    start_time = time.time()
+    build = BUILDERS[chunk["collection"]]
+    cache: Dict[tuple, dict] = {}
+    documents: List[Dict[str, Any]] = []
+    count = 0
+    for index in range(chunk["start"], chunk["end"]):
+        documents.append(build(index, plan, cache))
+        if len(documents) >= INSERT_BATCH_SIZE:
+            count += synthetic_data_repository.insert_documents(chunk["collection"], documents)
+            documents = []
+    count += synthetic_data_repository.insert_documents(chunk["collection"], documents)
+    return {**chunk, "count": count, "seconds": time.time() - start_time, "pid": os.getpid()}
+
+
+def get_rng(plan: Dict[str, Any], kind: str, index: int) -> random.Random:
+    return random.Random(f"{plan['seed']}:{kind}:{index}")
+
+
+def get_skewed_index(rng: random.Random, size: int, exponent: float) -> int:
+    """
+    Index in [0, size) where the first indexes are the most likely, more so the larger the exponent.
+    """
+    return min(int(size * rng.random() ** exponent), size - 1)
+
+
+def get_object_id(collection: str, index: int) -> ObjectId:
+    return ObjectId(f"{OBJECT_ID_PREFIXES[collection]:08x}{index:016x}")
+
+
+def get_timestamp(year: int, month: int = 1, day: int = 1) -> int:
+    return int(datetime(year, month, day, tzinfo=timezone.utc).timestamp())
+
+
+def get_cached(cache: Dict[tuple, dict], key: tuple, build: Callable[[], dict]) -> dict:
+    if key not in cache:
+        cache[key] = build()
+    return cache[key]
+
+
+def get_affiliation_profile(kind: str, local_index: int, plan: Dict[str, Any], cache: Dict[tuple, dict]) -> dict:
+    """
+    Id, names, types, address and parents of an affiliation of the hierarchy: education institutions have
+    faculties, faculties have departments and groups belong to an education institution.
+    """
+    return get_cached(
+        cache, ("affiliation", kind, local_index), lambda: build_affiliation_profile(kind, local_index, plan, cache)
+    )
+
+
+def build_affiliation_profile(kind: str, local_index: int, plan: Dict[str, Any], cache: Dict[tuple, dict]) -> dict:
+    rng = get_rng(plan, kind, local_index)
+    if kind == "education_institutions":
+        city, state, lat, lng = rng.choice(COLOMBIAN_CITIES)
+        prefix = rng.choice(
+            ["Universidad de", "Universidad Nacional de", "Universidad Tecnológica de", "Institución Universitaria de"]
+        )
+        name = (
+            f"{prefix} {city}" if local_index < len(COLOMBIAN_CITIES) else f"{prefix} {city} {rng.choice(LAST_NAMES)}"
+        )
+        address = {"city": city, "state": state, "country": "Colombia", "country_code": "CO", "lat": lat, "lng": lng}
+        return {
+            "id": f"03{local_index:07d}",
+            "name": name,
+            "names": [
+                {"name": name, "lang": "es", "source": "ror", "provenance": "ror"},
+                {"name": name.replace("Universidad", "University"), "lang": "en", "source": "ror", "provenance": "ror"},
+            ],
+            "types": [{"source": "ror", "type": "education"}],
+            "address": address,
+            "parents": [],
+        }
+    if kind == "institutions":
+        institution_type = rng.choice(INSTITUTION_TYPES)
+        country_code, country, city = rng.choice(FOREIGN_PLACES)
+        name = f"{rng.choice(FOREIGN_LAST_NAMES)} {INSTITUTION_LABELS[institution_type]} of {city}"
+        return {
+            "id": f"05{local_index:07d}",
+            "name": name,
+            "names": [{"name": name, "lang": "en", "source": "ror", "provenance": "ror"}],
+            "types": [{"source": "ror", "type": institution_type}],
+            "address": {"city": city, "state": None, "country": country, "country_code": country_code},
+            "parents": [],
+        }
+    if kind == "faculties":
+        institution = get_affiliation_profile(
+            "education_institutions", local_index // FACULTIES_PER_INSTITUTION, plan, cache
+        )
+        area = AREAS[local_index % FACULTIES_PER_INSTITUTION % len(AREAS)]
+        name = f"Facultad de {area[0]}"
+        types = [{"source": "staff", "type": "faculty"}]
+        parents = [institution]
+        identifier = f"{institution['id']}-f{local_index % FACULTIES_PER_INSTITUTION}"
+    elif kind == "departments":
+        faculty = get_affiliation_profile("faculties", local_index // DEPARTMENTS_PER_FACULTY, plan, cache)
+        institution = faculty["parents"][0]
+        name = f"Departamento de {rng.choice(SUBAREAS)}"
+        types = [{"source": "staff", "type": "department"}]
+        parents = [institution, faculty]
+        identifier = f"{faculty['id']}-d{local_index % DEPARTMENTS_PER_FACULTY}"
+    else:
+        institution = get_affiliation_profile(
+            "education_institutions", local_index // GROUPS_PER_INSTITUTION, plan, cache
+        )
+        name = f"Grupo de Investigación en {rng.choice(SUBAREAS)} {rng.choice(TITLE_WORDS).title()}"
+        types = [{"source": "minciencias", "type": "group"}]
+        parents = [institution]
+        identifier = f"COL{local_index:07d}"
+    return {
+        "id": identifier,
+        "name": name,
+        "names": [{"name": name, "lang": "es", "source": "staff", "provenance": "staff"}],
+        "types": types,
+        "address": institution["address"],
+        "parents": parents,
+    }
+
+
+def get_affiliation_entry(profile: dict) -> dict:
+    return {"id": profile["id"], "name": profile["name"], "types": profile["types"]}
+
+
+def build_affiliation(index: int, plan: Dict[str, Any], cache: Dict[tuple, dict]) -> dict:
+    kind = AFFILIATION_KINDS[0]
+    local_index = index
+    for kind in AFFILIATION_KINDS:
+        if local_index < plan["sizes"][kind]:
+            break
+        local_index -= plan["sizes"][kind]
+    profile = get_affiliation_profile(kind, local_index, plan, cache)
+    rng = get_rng(plan, f"{kind}_document", local_index)
+    affiliation: Dict[str, Any] = {
+        "_id": profile["id"],
+        "names": profile["names"],
+        "abbreviations": ["".join(word[0] for word in profile["name"].split() if word[0].isupper())],
+        "addresses": [profile["address"]],
+        "types": profile["types"],
+        "relations": [get_affiliation_entry(parent) for parent in profile["parents"]],
+        "external_ids": [{"source": "ror" if kind.endswith("institutions") else "staff", "id": profile["id"]}],
+        "external_urls": [{"source": "site", "url": f"https://{profile['id'].lower()}.example.org"}],
+        "citations_count": [],
+        "products_count": 0,
+        "ranking": [],
+        "status": [],
+        "subjects": [],
+        "year_established": rng.randint(1800, 2015),
+        "updated": [{"source": "ror", "time": get_timestamp(LAST_YEAR)}],
+    }
+    if kind == "groups":
+        affiliation["ranking"] = [
+            {
+                "source": "minciencias",
+                "rank": rng.choice(GROUP_RANKS),
+                "from_date": get_timestamp(year),
+                "to_date": get_timestamp(year + 2),
+                "order": None,
+            }
+            for year in range(LAST_YEAR - 2 * rng.randint(1, 4), LAST_YEAR, 2)
+        ]
+    return affiliation
+
+
+def get_person_profile(index: int, plan: Dict[str, Any], cache: Dict[tuple, dict]) -> dict:
+    """
+    Person at an index: the first Colombian persons, in teams, are the most productive ones, and foreign
+    persons come after them.
+    """
+    return get_cached(cache, ("person", index), lambda: build_person_profile(index, plan, cache))
+
+
+def build_person_profile(index: int, plan: Dict[str, Any], cache: Dict[tuple, dict]) -> dict:
+    sizes = plan["sizes"]
+    rng = get_rng(plan, "person", index)
+    if index >= sizes["colombian_persons"]:
+        foreign_index = index - sizes["colombian_persons"]
+        institution = get_affiliation_profile(
+            "institutions", get_skewed_index(rng, sizes["institutions"], 1.5), plan, cache
+        )
+        first_names = [rng.choice(FOREIGN_FIRST_NAMES)]
+        last_names = [rng.choice(FOREIGN_LAST_NAMES)]
+        return {
+            "id": f"A{5000000000 + foreign_index}",
+            "colombian": False,
+            "first_names": first_names,
+            "last_names": last_names,
+            "full_name": " ".join(first_names + last_names),
+            "affiliations": [institution],
+            "group": None,
+            "rank": None,
+            "sex": None,
+            "birthdate": None,
+        }
+    team_rng = get_rng(plan, "team", index // PERSONS_PER_TEAM)
+    institution_index = get_skewed_index(team_rng, sizes["education_institutions"], 2.5)
+    faculty_index = institution_index * FACULTIES_PER_INSTITUTION + team_rng.randrange(FACULTIES_PER_INSTITUTION)
+    department_index = faculty_index * DEPARTMENTS_PER_FACULTY + team_rng.randrange(DEPARTMENTS_PER_FACULTY)
+    group_index = institution_index * GROUPS_PER_INSTITUTION + team_rng.randrange(GROUPS_PER_INSTITUTION)
+    has_group = team_rng.random() < 0.8
+    first_names = [rng.choice(FIRST_NAMES)] + ([rng.choice(FIRST_NAMES)] if rng.random() < 0.4 else [])
+    last_names = [rng.choice(LAST_NAMES), rng.choice(LAST_NAMES)]
+    return {
+        "id": str(1000000000 + index),
+        "colombian": True,
+        "cc": str(43000000 + index),
+        "first_names": first_names,
+        "last_names": last_names,
+        "full_name": " ".join(first_names + last_names),
+        "affiliations": [
+            get_affiliation_profile("education_institutions", institution_index, plan, cache),
+            get_affiliation_profile("faculties", faculty_index, plan, cache),
+            get_affiliation_profile("departments", department_index, plan, cache),
+        ],
+        "group": get_affiliation_profile("groups", group_index, plan, cache) if has_group else None,
+        "rank": PERSON_RANKS[get_skewed_index(rng, len(PERSON_RANKS), 2)] if rng.random() < 0.6 else None,
+        "sex": rng.choice(["hombre", "mujer"]),
+        "birthdate": get_timestamp(rng.randint(1950, 1998), rng.randint(1, 12), rng.randint(1, 28)),
+    }
+
+
+def get_person_ranking(person: dict) -> list:
+    if not person["rank"]:
+        return []
+    return [{"source": "minciencias", "rank": person["rank"], "date": get_timestamp(LAST_YEAR - 1)}]
+
+
+def get_author(person: dict) -> dict:
+    author = {
+        "id": person["id"],
+        "full_name": person["full_name"],
+        "affiliations": [get_affiliation_entry(affiliation) for affiliation in person["affiliations"]],
+    }
+    if person["rank"]:
+        author["ranking"] = get_person_ranking(person)
+    return author
+
+
+def build_person(index: int, plan: Dict[str, Any], cache: Dict[tuple, dict]) -> dict:
+    person = get_person_profile(index, plan, cache)
+    rng = get_rng(plan, "person_document", index)
+    affiliations = person["affiliations"] + ([person["group"]] if person["group"] else [])
+    external_ids = [
+        {"provenance": "openalex", "source": "openalex", "id": f"https://openalex.org/A{9000000000 + index}"},
+        {
+            "provenance": "openalex",
+            "source": "orcid",
+            "id": f"https://orcid.org/0000-0002-{index // 10000 % 10000:04d}-{index % 10000:04d}",
+        },
+    ]
+    birthplace = None
+    if person["colombian"]:
+        external_ids.append({"provenance": "staff", "source": "Cédula de Ciudadanía", "id": person["cc"]})
+        city, state, _, _ = rng.choice(COLOMBIAN_CITIES)
+        birthplace = {"city": city, "state": state, "country": "Colombia"}
+    return {
+        "_id": person["id"],
+        "full_name": person["full_name"],
+        "first_names": person["first_names"],
+        "last_names": person["last_names"],
+        "initials": "".join(name[0] for name in person["first_names"]),
+        "aliases": [person["full_name"].lower()],
+        "sex": person["sex"],
+        "birthdate": person["birthdate"],
+        "birthplace": birthplace,
+        "affiliations": [
+            {
+                **get_affiliation_entry(affiliation),
+                "position": "Profesor" if affiliation["types"][0]["type"] != "group" else None,
+                "start_date": get_timestamp(rng.randint(2000, LAST_YEAR - 1)),
+                "end_date": -1,
+            }
+            for affiliation in affiliations
+        ],
+        "external_ids": external_ids,
+        "ranking": get_person_ranking(person),
+        "citations_count": [],
+        "products_count": 0,
+        "degrees": [],
+        "keywords": [],
+        "related_works": [],
+        "subjects": [],
+        "updated": [{"source": "staff" if person["colombian"] else "openalex", "time": get_timestamp(LAST_YEAR)}],
+    }
+
+
+def get_source_profile(index: int, plan: Dict[str, Any], cache: Dict[tuple, dict]) -> dict:
+    return get_cached(cache, ("source", index), lambda: build_source_profile(index, plan))
+
+
+def build_source_profile(index: int, plan: Dict[str, Any]) -> dict:
+    rng = get_rng(plan, "source", index)
+    words = [rng.choice(TITLE_WORDS).title() for _ in range(rng.randint(1, 3))]
+    name = f"Revista {' '.join(words)}" if rng.random() < 0.3 else f"Journal of {' and '.join(words)}"
+    publisher_index = get_skewed_index(rng, len(PUBLISHERS), 1.5)
+    publisher, country_code = PUBLISHERS[publisher_index]
+    issn_l = f"{1000 + index % 9000:04d}-{index // 9000 % 1000:03d}{rng.choice('0123456789X')}"
+    ranking: list = []
+    if rng.random() < 0.6:
+        ranking = [
+            {
+                "source": "scimago Best Quartile",
+                "rank": SCIMAGO_QUARTILES[get_skewed_index(rng, len(SCIMAGO_QUARTILES), 0.8)],
+                "from_date": get_timestamp(year),
+                "to_date": get_timestamp(year, 12, 31),
+                "issn": issn_l,
+                "order": None,
+            }
+            for year in range(rng.randint(2010, LAST_YEAR - 1), LAST_YEAR)
+        ]
+    apc = {"charges": rng.randint(5, 50) * 100, "currency": rng.choice(APC_CURRENCIES)} if rng.random() < 0.35 else {}
+    return {
+        "id": get_object_id("sources", index),
+        "name": name,
+        "type": rng.choice(SOURCE_TYPES),
+        "issn_l": issn_l,
+        "publisher": {"id": f"P{publisher_index}", "name": publisher, "country_code": country_code},
+        "apc": apc,
+        "ranking": ranking,
+    }
+
+
+def build_source(index: int, plan: Dict[str, Any], cache: Dict[tuple, dict]) -> dict:
+    source = get_source_profile(index, plan, cache)
+    rng = get_rng(plan, "source_document", index)
+    return {
+        "_id": source["id"],
+        "names": [
+            {"name": source["name"], "lang": "en", "source": "openalex", "provenance": "openalex"},
+            {"name": source["name"], "lang": "en", "source": "scimago", "provenance": "scimago"},
+        ],
+        "abbreviations": [],
+        "types": [{"source": "openalex", "type": source["type"]}],
+        "external_ids": [
+            {"source": "issn_l", "id": source["issn_l"], "provenance": "openalex"},
+            {"source": "issn", "id": source["issn_l"], "provenance": "openalex"},
+            {"source": "openalex", "id": f"https://openalex.org/S{100000 + index}", "provenance": "openalex"},
+        ],
+        "external_urls": [{"source": "site", "url": f"https://journal{index}.example.org"}],
+        "publisher": source["publisher"],
+        "apc": source["apc"],
+        "ranking": source["ranking"],
+        "citations_count": [],
+        "products_count": 0,
+        "languages": rng.sample(["en", "es", "pt"], rng.randint(1, 2)),
+        "keywords": [],
+        "subjects": [],
+        "open_access_start_year": rng.randint(1995, LAST_YEAR) if rng.random() < 0.4 else None,
+        "updated": [{"source": "openalex", "time": get_timestamp(LAST_YEAR)}],
+    }
+
+
+def get_topic(index: int, plan: Dict[str, Any], cache: Dict[tuple, dict]) -> dict:
+    def build_topic() -> dict:
+        rng = get_rng(plan, "topic", index)
+        field, domain = TOPIC_FIELDS[index % len(TOPIC_FIELDS)]
+        return {
+            "id": f"https://openalex.org/T{10000 + index}",
+            "display_name": " ".join(rng.choice(TITLE_WORDS) for _ in range(3)).capitalize(),
+            "subfield": {
+                "id": f"https://openalex.org/subfields/{1000 + index % len(SUBAREAS)}",
+                "display_name": SUBAREAS[index % len(SUBAREAS)],
+            },
+            "field": {"id": f"https://openalex.org/fields/{index % len(TOPIC_FIELDS)}", "display_name": field},
+            "domain": {"id": f"https://openalex.org/domains/{domain}", "display_name": domain},
+        }
+
+    return get_cached(cache, ("topic", index), build_topic)
+
+
+def get_title(rng: random.Random) -> str:
+    words = [TITLE_WORDS[get_skewed_index(rng, len(TITLE_WORDS), 2)] for _ in range(rng.randint(4, 12))]
+    return " ".join(words).capitalize()
+
+
+def get_author_indexes(rng: random.Random, plan: Dict[str, Any], count: int, foreign_share: float) -> List[int]:
+    """
+    A skewed first author, so few persons have most of the products, and coauthors mostly from its team,
+    from anywhere else in the country or from abroad.
+    """
+    colombian = plan["sizes"]["colombian_persons"]
+    foreign = plan["sizes"]["foreign_persons"]
+    first_author = get_skewed_index(rng, colombian, 3)
+    indexes = {first_author: None}
+    for _ in range(count * 3):
+        if len(indexes) >= count:
+            break
+        draw = rng.random()
+        if draw < foreign_share:
+            indexes[colombian + rng.randrange(foreign)] = None
+        elif draw < foreign_share + (1 - foreign_share) * 0.7:
+            offset = rng.randint(-PERSONS_PER_TEAM, PERSONS_PER_TEAM)
+            indexes[min(max(first_author + offset, 0), colombian - 1)] = None
+        else:
+            indexes[get_skewed_index(rng, colombian, 2)] = None
+    return list(indexes)
+
+
+def get_groups(persons: List[dict]) -> List[dict]:
+    groups = {person["group"]["id"]: person["group"] for person in persons if person["group"]}
+    return [{"id": group["id"], "name": group["name"]} for group in groups.values()]
+
+
+def get_citations(rng: random.Random, year: int) -> tuple[int, list]:
+    count = min(int(rng.paretovariate(1.1)) - 1, 20000)
+    by_year: Dict[int, int] = {}
+    for _ in range(min(count, 50)):
+        citation_year = rng.randint(year, LAST_YEAR)
+        by_year[citation_year] = by_year.get(citation_year, 0) + max(count // 50, 1)
+    return count, [{"year": citation_year, "cited_by_count": cited} for citation_year, cited in sorted(by_year.items())]
+
+
+def build_work(index: int, plan: Dict[str, Any], cache: Dict[tuple, dict]) -> dict:
+    rng = get_rng(plan, "work", index)
+    is_large = rng.random() < LARGE_WORKS_SHARE
+    authors_count = rng.randint(1000, 3000) if is_large else min(int(rng.paretovariate(1.2)) + rng.randint(0, 2), 300)
+    indexes = get_author_indexes(rng, plan, authors_count, 0.85 if is_large else 0.2)
+    persons = [get_person_profile(person_index, plan, cache) for person_index in indexes]
+    year = LAST_YEAR - get_skewed_index(rng, LAST_YEAR - FIRST_YEAR + 1, 2)
+    sources = ["openalex"] + [source for source, share in [("scienti", 0.4), ("scholar", 0.3)] if rng.random() < share]
+    title = get_title(rng)
+    titles = [{"title": title, "lang": "en", "source": "openalex", "provenance": "openalex"}]
+    if "scienti" in sources:
+        titles.append({"title": title.upper(), "lang": "es", "source": "scienti", "provenance": "scienti"})
+    if "scholar" in sources:
+        titles.append({"title": title, "lang": "en", "source": "scholar", "provenance": "scholar"})
+
+    types: List[Dict[str, Any]] = [{"source": "openalex", "type": rng.choice(OPENALEX_TYPES)}]
+    if "scienti" in sources:
+        scienti_types = rng.choice(SCIENTI_TYPES)
+        types += [
+            {"source": "scienti", "type": scienti_type, "code": code, "level": 2 - level, "provenance": "scienti"}
+            for level, (code, scienti_type) in enumerate(scienti_types)
+        ]
+        if rng.random() < 0.5:
+            types.append({"source": "minciencias", "type": rng.choice(MINCIENCIAS_TYPES), "level": 0})
+    types.append({"source": "impactu", "type": rng.choice(IMPACTU_TYPES)})
+
+    citations_count, citations_by_year = get_citations(rng, year)
+    work_citations = [{"source": "openalex", "count": citations_count}]
+    if "scholar" in sources:
+        work_citations.append({"source": "scholar", "count": int(citations_count * 1.3)})
+
+    work: Dict[str, Any] = {
+        "_id": get_object_id("works", index),
+        "titles": titles,
+        "types": types,
+        "authors": [get_author(person) for person in persons],
+        "author_count": len(persons),
+        "groups": get_groups(persons),
+        "year_published": year,
+        "date_published": get_timestamp(year, rng.randint(1, 12), rng.randint(1, 28)),
+        "citations_count": work_citations,
+        "citations_by_year": citations_by_year,
+        "external_ids": [{"provenance": "openalex", "source": "openalex", "id": f"https://openalex.org/W{index}"}],
+        "external_urls": [],
+        "bibliographic_info": {
+            "volume": str(rng.randint(1, 80)),
+            "issue": str(rng.randint(1, 12)),
+            "start_page": str(rng.randint(1, 300)),
+        },
+        "keywords": [rng.choice(TITLE_WORDS) for _ in range(rng.randint(0, 5))],
+        "ranking": [],
+        "references_count": rng.randint(0, 80),
+        "updated": [{"source": source, "time": get_timestamp(LAST_YEAR)} for source in sources],
+    }
+    if rng.random() < 0.8:
+        doi = f"https://doi.org/10.{rng.randint(1000, 9999)}/synthetic.{index}"
+        work["external_ids"].append({"provenance": "openalex", "source": "doi", "id": doi})
+        work["external_urls"].append({"source": "doi", "url": doi})
+
+    status = rng.choice(OPEN_ACCESS_STATUSES)
+    work["open_access"] = {
+        "is_open_access": status != "closed",
+        "open_access_status": status,
+        "url": f"https://oa.example.org/{index}" if status != "closed" else None,
+        "has_repository_fulltext": status == "green",
+    }
+    work["apc"] = {}
+    if rng.random() < 0.9:
+        source = get_source_profile(get_skewed_index(rng, plan["sizes"]["sources"], 2), plan, cache)
+        work["source"] = {
+            "id": source["id"],
+            "name": source["name"],
+            "issn_l": source["issn_l"],
+            "publisher": source["publisher"],
+            "apc": source["apc"],
+            "ranking": source["ranking"],
+        }
+        if source["apc"] and status in ["gold", "hybrid"] and rng.random() < 0.5:
+            value = source["apc"]["charges"]
+            work["apc"] = {
+                "paid": {
+                    "value": value,
+                    "currency": source["apc"]["currency"],
+                    "value_usd": value,
+                    "source": "openapc",
+                    "provenance": "openapc",
+                }
+            }
+
+    topic_indexes = [get_skewed_index(rng, TOPICS, 1.5) for _ in range(rng.randint(1, 3))]
+    topics = [get_topic(topic_index, plan, cache) for topic_index in topic_indexes]
+    work["primary_topic"] = {**topics[0], "score": round(rng.uniform(0.5, 1), 4)}
+    work["topics"] = [{**topic, "score": round(rng.uniform(0.1, 0.5), 4)} for topic in topics]
+    work["subjects"] = [
+        {
+            "source": "openalex",
+            "provenance": "openalex",
+            "subjects": [
+                {
+                    "id": get_object_id("subjects", topic_indexes[0] % len(TOPIC_FIELDS)),
+                    "name": topics[0]["field"]["display_name"],
+                    "level": 0,
+                },
+                {
+                    "id": get_object_id("subjects", 1000 + topic_indexes[0] % len(SUBAREAS)),
+                    "name": topics[0]["subfield"]["display_name"],
+                    "level": 1,
+                },
+            ],
+        }
+    ]
+    return work
+
+
+def build_scienti_product(
+    index: int, plan: Dict[str, Any], cache: Dict[tuple, dict], kind: str, product_types: List[tuple[str, str]]
+) -> dict:
+    rng = get_rng(plan, kind, index)
+    persons = [
+        get_person_profile(person_index, plan, cache)
+        for person_index in get_author_indexes(rng, plan, rng.randint(1, 6), 0)
+    ]
+    code, product_type = rng.choice(product_types)
+    year = LAST_YEAR - get_skewed_index(rng, LAST_YEAR - FIRST_YEAR + 1, 2)
+    return {
+        "_id": get_object_id(kind, index),
+        "titles": [{"title": get_title(rng), "lang": "es", "source": "scienti", "provenance": "scienti"}],
+        "types": [{"source": "scienti", "type": product_type, "code": code, "level": 2, "provenance": "scienti"}],
+        "authors": [get_author(person) for person in persons],
+        "author_count": len(persons),
+        "groups": get_groups(persons),
+        "external_ids": [
+            {
+                "provenance": "scienti",
+                "source": "scienti",
+                "id": {"COD_RH": persons[0]["id"], "COD_PRODUCTO": str(index)},
+            }
+        ],
+        "external_urls": [],
+        "ranking": [],
+        "year": year,
+        "updated": [{"source": "scienti", "time": get_timestamp(LAST_YEAR)}],
+    }
+
+
+def build_patent(index: int, plan: Dict[str, Any], cache: Dict[tuple, dict]) -> dict:
+    return build_scienti_product(index, plan, cache, "patents", PATENT_TYPES)
+
+
+def build_project(index: int, plan: Dict[str, Any], cache: Dict[tuple, dict]) -> dict:
+    project = build_scienti_product(index, plan, cache, "projects", PROJECT_TYPES)
+    year = project.pop("year")
+    rng = get_rng(plan, "project_document", index)
+    end_year = year + rng.randint(1, 4)
+    project.update(
+        {
+            "abstract": get_title(rng),
+            "keywords": [rng.choice(TITLE_WORDS) for _ in range(rng.randint(1, 5))],
+            "date_init": get_timestamp(year),
+            "date_end": get_timestamp(end_year),
+            "year_init": year,
+            "year_end": end_year,
+        }
+    )
+    return project
+
+
+def build_news_medium(index: int, plan: Dict[str, Any], cache: Dict[tuple, dict]) -> dict:
+    return {
+        "_id": get_object_id("news_media_collection", index),
+        "medium_id": f"M{index:06d}",
+        "medium": f"https://medio{index}.example.com.co",
+    }
+
+
+def build_news_url(index: int, plan: Dict[str, Any], cache: Dict[tuple, dict]) -> dict:
+    rng = get_rng(plan, "news_url", index)
+    medium = get_skewed_index(rng, plan["sizes"]["news_media"], 2)
+    return {
+        "_id": get_object_id("news_urls_collection", index),
+        "url_id": f"U{index:09d}",
+        "medium_id": f"M{medium:06d}",
+        "url": f"https://medio{medium}.example.com.co/noticias/{index}",
+        "url_title": get_title(rng),
+        "url_language": rng.choice(["es", "es", "es", "en"]),
+        "url_date": datetime(rng.randint(2015, LAST_YEAR), rng.randint(1, 12), rng.randint(1, 28), tzinfo=timezone.utc),
+    }
+
+
+def build_news_professor(index: int, plan: Dict[str, Any], cache: Dict[tuple, dict]) -> dict:
+    """
+    News of the most productive Colombian persons, which come first, with a skewed number of urls.
+    """
+    rng = get_rng(plan, "news_professor", index)
+    urls = plan["sizes"]["news_urls"]
+    urls_count = min(int(rng.paretovariate(1.2)), 200)
+    return {
+        "_id": get_object_id("news_professors_collection", index),
+        "professor_id": get_person_profile(index, plan, cache)["cc"],
+        "classified_urls_ids": list(dict.fromkeys(f"U{rng.randrange(urls):09d}" for _ in range(urls_count))),
+    }
+
+
+BUILDERS: Dict[str, Callable[[int, Dict[str, Any], Dict[tuple, dict]], dict]] = {
+    "affiliations": build_affiliation,
+    "sources": build_source,
+    "person": build_person,
+    "works": build_work,
+    "patents": build_patent,
+    "projects": build_project,
+    "news_media_collection": build_news_medium,
+    "news_urls_collection": build_news_url,
+    "news_professors_collection": build_news_professor,
+}
@@ -1,10 +1,11 @@
-from typing import Generator
+from typing import Callable, Generator
 
 from quyca.domain.models.base_model import QueryParams
 from quyca.domain.models.work_model import Work, Abstract
-from quyca.infrastructure.repositories import work_repository
+from quyca.infrastructure.repositories import work_repository, filters_repository, info_repository
 from quyca.domain.services import source_service
 from quyca.domain.services.base_service import (
+    get_next_cursor_data,
     limit_authors,
     set_title_and_language,
     set_product_types,
@@ -48,10 +49,10 @@ def get_work_authors(work_id: str) -> dict:
 
 def search_works(query_params: QueryParams) -> dict:
     pipeline_params = get_works_by_entity_pipeline_params()
-    works, total_results = work_repository.search_works(query_params, pipeline_params)
+    works, total_results, next_cursor = work_repository.search_works(query_params, pipeline_params)
     works_data = get_work_by_entity_data(works)
     data = work_parser.parse_search_results(works_data)
-    return {"data": data, "total_results": total_results}
+    return {"data": data, "total_results": total_results, **get_next_cursor_data(query_params, next_cursor)}
 
 
 def get_search_works_available_filters(query_params: QueryParams) -> dict:
@@ -61,46 +62,75 @@ def get_search_works_available_filters(query_params: QueryParams) -> dict:
 
 def get_works_by_affiliation(affiliation_id: str, query_params: QueryParams) -> dict:
     pipeline_params = get_works_by_entity_pipeline_params()
-    works = work_repository.get_works_by_affiliation(affiliation_id, query_params, pipeline_params)
+    works, total_results, next_cursor = work_repository.get_works_page_by_affiliation(
+        affiliation_id, query_params, pipeline_params
+    )
     works_data = get_work_by_entity_data(works)
     data = work_parser.parse_works_by_entity(works_data)
-    total_results = work_repository.get_works_count_by_affiliation(affiliation_id, query_params)
-    return {"data": data, "total_results": total_results}
+    return {"data": data, "total_results": total_results, **get_next_cursor_data(query_params, next_cursor)}
 
 
 def get_works_filters_by_affiliation(affiliation_id: str, query_params: QueryParams) -> dict:
-    available_filters = work_repository.get_works_available_filters_by_affiliation(affiliation_id, query_params)
+    available_filters = get_stored_available_filters("affiliation", affiliation_id, query_params)
     return work_parser.parse_available_filters(available_filters)
 
 
 def get_works_by_person(person_id: str, query_params: QueryParams) -> dict:
     pipeline_params = get_works_by_entity_pipeline_params()
-    works = work_repository.get_works_by_person(person_id, query_params, pipeline_params)
+    works, total_results, next_cursor = work_repository.get_works_page_by_person(
+        person_id, query_params, pipeline_params
+    )
     works_data = get_work_by_entity_data(works)
     data = work_parser.parse_works_by_entity(works_data)
-    total_results = work_repository.get_works_count_by_person(person_id, query_params)
-    return {"data": data, "total_results": total_results}
+    return {"data": data, "total_results": total_results, **get_next_cursor_data(query_params, next_cursor)}
 
 
 def get_works_filters_by_person(person_id: str, query_params: QueryParams) -> dict:
-    available_filters = work_repository.get_works_available_filters_by_person(person_id, query_params)
+    available_filters = get_stored_available_filters("person", person_id, query_params)
     return work_parser.parse_available_filters(available_filters)
 
 
 def get_works_by_source(source_id: str, query_params: QueryParams) -> dict:
     pipeline_params = get_works_by_entity_pipeline_params()
-    works = work_repository.get_works_by_source(source_id, query_params, pipeline_params)
+    works, total_results, next_cursor = work_repository.get_works_page_by_source(
+        source_id, query_params, pipeline_params
+    )
     works_data = get_work_by_entity_data(works)
     data = work_parser.parse_works_by_entity(works_data)
-    total_results = work_repository.get_works_count_by_source(source_id, query_params)
-    return {"data": data, "total_results": total_results}
+    return {"data": data, "total_results": total_results, **get_next_cursor_data(query_params, next_cursor)}
 
 
 def get_works_filters_by_source(source_id: str, query_params: QueryParams) -> dict:
-    available_filters = work_repository.get_works_available_filters_by_source(source_id, query_params)
+    available_filters = get_stored_available_filters("source", source_id, query_params)
     return work_parser.parse_available_filters(available_filters)
 
 
+available_filters_by_entity: dict[str, Callable[[str, QueryParams], dict]] = {
+    "affiliation": work_repository.get_works_available_filters_by_affiliation,
+    "person": work_repository.get_works_available_filters_by_person,
+    "source": work_repository.get_works_available_filters_by_source,
+}
+
+
+def get_stored_available_filters(entity: str, entity_id: str, query_params: QueryParams) -> dict:
+    """
+    Filters of the works of an entity, read from the calculations database when they were already
+    computed for the current db update and computed and stored otherwise.
+    """
+    db_update = info_repository.get_current_db_update()
+    filters = filters_repository.get_normalized_filters(query_params)
+    available_filters = filters_repository.get_available_filters(entity, entity_id, filters, db_update)
+    if available_filters is None:
+        available_filters = available_filters_by_entity[entity](entity_id, query_params)
+        filters_repository.save_available_filters(entity, entity_id, filters, db_update, available_filters)
+    return available_filters
+
+
+def build_available_filters(entity: str, entity_id: str, db_update: int) -> None:
+    available_filters = available_filters_by_entity[entity](entity_id, QueryParams())
+    filters_repository.save_available_filters(entity, entity_id, {}, db_update, available_filters)
+
+
 def get_work_by_entity_data(works: Generator) -> list:
     works_data = []
     for work in works:
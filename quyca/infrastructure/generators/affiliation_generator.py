@@ -1,10 +1,10 @@
-from typing import Generator
+from typing import Generator, Iterable
 
 from pymongo.command_cursor import CommandCursor
 
 from domain.models.affiliation_model import Affiliation
 
 
-def get(cursor: CommandCursor) -> Generator["Affiliation", None, None]:
+def get(cursor: CommandCursor | Iterable[dict]) -> Generator["Affiliation", None, None]:
     for document in cursor:
         yield Affiliation(**document)
@@ -1,10 +1,10 @@
-from typing import Generator
+from typing import Generator, Iterable
 
 from pymongo.command_cursor import CommandCursor
 
 from domain.models.patent_model import Patent
 
 
-def get(cursor: CommandCursor) -> Generator:
+def get(cursor: CommandCursor | Iterable[dict]) -> Generator:
     for document in cursor:
         yield Patent(**document)
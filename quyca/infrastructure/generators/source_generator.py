@@ -1,11 +1,11 @@
-from typing import Generator
+from typing import Generator, Iterable
 
 from pymongo.command_cursor import CommandCursor
 
 from domain.models.source_model import Source
 
 
-def get(cursor: CommandCursor) -> Generator:
+def get(cursor: CommandCursor | Iterable[dict]) -> Generator:
     for document in cursor:
         yield Source(**document)
 
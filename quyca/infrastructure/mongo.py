@@ -1,8 +1,415 @@
+import os
+import sys
+import threading
+import zlib
+from contextvars import ContextVar
+from types import FrameType
+from typing import Any, cast
+
+import bson
 from pymongo import MongoClient
+from pymongo.collection import Collection
 from pymongo.database import Database
+from pymongo.monitoring import (
+    CommandListener,
+    CommandStartedEvent,
+    CommandSucceededEvent,
+    CommandFailedEvent,
+    ConnectionPoolListener,
+    ConnectionCheckOutStartedEvent,
+    ConnectionCheckOutFailedEvent,
+    ConnectionCheckedOutEvent,
+    ConnectionCheckedInEvent,
+    ConnectionCreatedEvent,
+    ConnectionReadyEvent,
+    ConnectionClosedEvent,
+    PoolCreatedEvent,
+    PoolReadyEvent,
+    PoolClearedEvent,
+    PoolClosedEvent,
+)
 
 from quyca.config import settings
 
-database: Database = MongoClient(host=str(settings.MONGO_URI))[settings.MONGO_DATABASE]
-calculations_database: Database = MongoClient(host=str(settings.MONGO_URI))[settings.MONGO_CALCULATIONS_DATABASE]
-impactu_database: Database = MongoClient(host=str(settings.MONGO_URI))[settings.MONGO_IMPACTU_DATABASE]
+
+class PoolMetricsListener(ConnectionPoolListener):
+    """
+    Keeps live connection pool counters per server address.
+
+    Wait times come from the checkout duration reported by the driver, so they
+    measure how long a request waited for a free connection in the pool.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pools: dict[str, dict[str, Any]] = {}
+
+    def _pool(self, address: tuple) -> dict[str, Any]:
+        key = f"{address[0]}:{address[1]}"
+        if key not in self._pools:
+            self._pools[key] = {
+                "open_connections": 0,
+                "checked_out": 0,
+                "max_checked_out": 0,
+                "waiting": 0,
+                "checkouts": 0,
+                "failed_checkouts": 0,
+                "total_wait_ms": 0.0,
+                "max_wait_ms": 0.0,
+                "clears": 0,
+            }
+        return self._pools[key]
+
+    def pool_created(self, event: PoolCreatedEvent) -> None:
+        with self._lock:
+            self._pool(event.address)
+
+    def pool_ready(self, event: PoolReadyEvent) -> None:
+        pass
+
+    def pool_cleared(self, event: PoolClearedEvent) -> None:
+        with self._lock:
+            self._pool(event.address)["clears"] += 1
+
+    def pool_closed(self, event: PoolClosedEvent) -> None:
+        with self._lock:
+            self._pools.pop(f"{event.address[0]}:{event.address[1]}", None)
+
+    def connection_created(self, event: ConnectionCreatedEvent) -> None:
+        with self._lock:
+            self._pool(event.address)["open_connections"] += 1
+
+    def connection_ready(self, event: ConnectionReadyEvent) -> None:
+        pass
+
+    def connection_closed(self, event: ConnectionClosedEvent) -> None:
+        with self._lock:
+            pool = self._pool(event.address)
+            pool["open_connections"] = max(pool["open_connections"] - 1, 0)
+
+    def connection_check_out_started(self, event: ConnectionCheckOutStartedEvent) -> None:
+        with self._lock:
+            self._pool(event.address)["waiting"] += 1
+
+    def connection_check_out_failed(self, event: ConnectionCheckOutFailedEvent) -> None:
+        with self._lock:
+            pool = self._pool(event.address)
+            pool["waiting"] = max(pool["waiting"] - 1, 0)
+            pool["failed_checkouts"] += 1
+
+    def connection_checked_out(self, event: ConnectionCheckedOutEvent) -> None:
+        wait_ms = (event.duration or 0.0) * 1000
+        with self._lock:
+            pool = self._pool(event.address)
+            pool["waiting"] = max(pool["waiting"] - 1, 0)
+            pool["checked_out"] += 1
+            pool["max_checked_out"] = max(pool["max_checked_out"], pool["checked_out"])
+            pool["checkouts"] += 1
+            pool["total_wait_ms"] += wait_ms
+            pool["max_wait_ms"] = max(pool["max_wait_ms"], wait_ms)
+
+    def connection_checked_in(self, event: ConnectionCheckedInEvent) -> None:
+        with self._lock:
+            pool = self._pool(event.address)
+            pool["checked_out"] = max(pool["checked_out"] - 1, 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._pools = {}
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            pools = {address: dict(pool) for address, pool in self._pools.items()}
+        for pool in pools.values():
+            checkouts = pool["checkouts"]
+            pool["avg_wait_ms"] = round(pool["total_wait_ms"] / checkouts, 3) if checkouts else 0.0
+            pool["total_wait_ms"] = round(pool["total_wait_ms"], 3)
+            pool["max_wait_ms"] = round(pool["max_wait_ms"], 3)
+        return pools
+
+
+# Commands of the current request, set by start_query_profile. Threads that run in a copy of the request
+# context (plot batches) add to the same profile, but a streamed body runs after set_profile_headers has
+# stopped it, so its commands are not reported.
+query_profile: ContextVar[dict[str, Any] | None] = ContextVar("query_profile", default=None)
+
+
+class QueryProfileListener(CommandListener):
+    """
+    Adds every command sent while a query profile is active to it: calls, wall time in the driver and
+    documents returned, grouped by collection and query shape. getMore commands are counted with the
+    command that opened the cursor. Bytes received are measured by encoding the replies again, so they
+    are only taken for detailed profiles.
+
+    Outside a profile each event returns right away, so the listener can stay registered in production.
+    """
+
+    def started(self, event: CommandStartedEvent) -> None:
+        profile = query_profile.get()
+        if profile is None:
+            return
+        command = event.command
+        with profile["lock"]:
+            if event.command_name == "getMore":
+                entry = profile["cursors"].get(command.get("getMore"))
+            else:
+                entry = get_query_profile_entry(profile, event.database_name, event.command_name, command)
+            profile["pending"][(event.connection_id, event.request_id)] = entry
+
+    def succeeded(self, event: CommandSucceededEvent) -> None:
+        profile = query_profile.get()
+        if profile is None:
+            return
+        reply = event.reply
+        cursor = reply.get("cursor")
+        if isinstance(cursor, dict):
+            documents = len(cursor.get("firstBatch") or cursor.get("nextBatch") or [])
+        else:
+            documents = reply.get("n", 0) if isinstance(reply.get("n"), int) else 0
+        size = len(bson.encode(reply)) if profile["detailed"] else 0
+        with profile["lock"]:
+            entry = profile["pending"].pop((event.connection_id, event.request_id), None)
+            if entry is None:
+                return
+            if isinstance(cursor, dict) and cursor.get("id"):
+                profile["cursors"][cursor["id"]] = entry
+            entry["calls"] += 1
+            entry["ms"] += event.duration_micros / 1000
+            entry["documents"] += documents
+            entry["bytes"] += size
+
+    def failed(self, event: CommandFailedEvent) -> None:
+        profile = query_profile.get()
+        if profile is None:
+            return
+        with profile["lock"]:
+            entry = profile["pending"].pop((event.connection_id, event.request_id), None)
+            if entry is not None:
+                entry["calls"] += 1
+                entry["errors"] += 1
+                entry["ms"] += event.duration_micros / 1000
+
+
+class SlowQueryListener(CommandListener):
+    """
+    Hands the aggregations that take longer than SLOW_QUERY_THRESHOLD_MS to diagnostics_repository when
+    they come from one of SLOW_QUERY_MODULES. The driver reports a command in the thread that sent it, so
+    the calling repository is found in the stack, which is only walked for slow commands.
+    """
+
+    def __init__(self) -> None:
+        self._pipelines: dict[tuple, tuple[str, str, list]] = {}
+        self._modules = {module.strip() for module in settings.SLOW_QUERY_MODULES.split(",") if module.strip()}
+
+    def started(self, event: CommandStartedEvent) -> None:
+        if event.command_name == "aggregate" and isinstance(event.command.get("aggregate"), str):
+            self._pipelines[(event.connection_id, event.request_id)] = (
+                event.database_name,
+                event.command["aggregate"],
+                event.command.get("pipeline", []),
+            )
+
+    def succeeded(self, event: CommandSucceededEvent) -> None:
+        command = self._pipelines.pop((event.connection_id, event.request_id), None)
+        if command is None or event.duration_micros < settings.SLOW_QUERY_THRESHOLD_MS * 1000:
+            return
+        module = self.get_calling_module()
+        if module is None:
+            return
+        # Imported here because the repositories import this module.
+        from quyca.infrastructure.repositories import diagnostics_repository
+
+        database_name, collection, pipeline = command
+        diagnostics_repository.capture_slow_query(
+            database_name, collection, pipeline, event.duration_micros / 1000, module
+        )
+
+    def failed(self, event: CommandFailedEvent) -> None:
+        self._pipelines.pop((event.connection_id, event.request_id), None)
+
+    def get_calling_module(self) -> str | None:
+        frame: FrameType | None = sys._getframe(1)
+        while frame is not None:
+            module = os.path.splitext(os.path.basename(frame.f_code.co_filename))[0]
+            if module in self._modules:
+                return module
+            frame = frame.f_back
+        return None
+
+
+def get_query_profile_entry(
+    profile: dict[str, Any], database_name: str, command_name: str, command: Any
+) -> dict[str, Any]:
+    collection = command.get(command_name)
+    collection = collection if isinstance(collection, str) else ""
+    shape = get_query_shape(command_name, command)
+    fingerprint = f"{zlib.crc32(f'{database_name}.{collection}:{shape}'.encode('utf-8')):08x}"
+    if fingerprint not in profile["entries"]:
+        profile["entries"][fingerprint] = {
+            "fingerprint": fingerprint,
+            "database": database_name,
+            "collection": collection,
+            "command": command_name,
+            "shape": shape,
+            "calls": 0,
+            "errors": 0,
+            "ms": 0.0,
+            "documents": 0,
+            "bytes": 0,
+        }
+    entry: dict[str, Any] = profile["entries"][fingerprint]
+    return entry
+
+
+def get_query_shape(command_name: str, command: Any) -> str:
+    """
+    Stages of a pipeline, or the command, with the fields of its filters but not their values, so
+    the same query for different ids falls in the same entry.
+    """
+    if command_name == "aggregate":
+        stages = [
+            f"{name}({','.join(get_match_fields(body))})" if name == "$match" and isinstance(body, dict) else name
+            for stage in command.get("pipeline", [])
+            for name, body in stage.items()
+        ]
+        return " ".join(stages)
+    query = command.get("filter", command.get("query"))
+    return f"{command_name}({','.join(get_match_fields(query))})" if isinstance(query, dict) else command_name
+
+
+def get_match_fields(match: dict) -> list[str]:
+    """
+    Fields of a filter, with the fields of the branches of $or and $and as "$or:field|field".
+    """
+    fields = []
+    for key, value in match.items():
+        if key in ["$or", "$and"] and isinstance(value, list):
+            branch_fields = {field for branch in value if isinstance(branch, dict) for field in branch}
+            fields.append(f"{key}:{'|'.join(sorted(branch_fields))}")
+        else:
+            fields.append(key)
+    return sorted(fields)
+
+
+def start_query_profile(detailed: bool = False) -> None:
+    query_profile.set({"detailed": detailed, "entries": {}, "pending": {}, "cursors": {}, "lock": threading.Lock()})
+
+
+def stop_query_profile() -> dict[str, Any] | None:
+    """
+    Ends the profile of the current request and returns its entries by fingerprint and whether it was detailed.
+    """
+    profile = query_profile.get()
+    query_profile.set(None)
+    if profile is None:
+        return None
+    with profile["lock"]:
+        return {
+            "detailed": profile["detailed"],
+            "entries": {key: dict(entry) for key, entry in profile["entries"].items()},
+        }
+
+
+_client: MongoClient | None = None
+_client_pid: int | None = None
+_client_lock = threading.Lock()
+pool_metrics = PoolMetricsListener()
+query_profile_listener = QueryProfileListener()
+slow_query_listener = SlowQueryListener()
+
+
+def get_client_options() -> dict[str, Any]:
+    options: dict[str, Any] = {
+        "appname": settings.APP_NAME,
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": settings.MONGO_CONNECT_TIMEOUT_MS,
+        "readPreference": settings.MONGO_READ_PREFERENCE,
+        "event_listeners": get_event_listeners(),
+    }
+    if settings.MONGO_MAX_IDLE_TIME_MS is not None:
+        options["maxIdleTimeMS"] = settings.MONGO_MAX_IDLE_TIME_MS
+    if settings.MONGO_WAIT_QUEUE_TIMEOUT_MS is not None:
+        options["waitQueueTimeoutMS"] = settings.MONGO_WAIT_QUEUE_TIMEOUT_MS
+    compressors = [compressor.strip() for compressor in settings.MONGO_COMPRESSORS.split(",") if compressor.strip()]
+    if compressors:
+        options["compressors"] = compressors
+    return options
+
+
+def get_event_listeners() -> list:
+    listeners: list = [pool_metrics]
+    if settings.QUERY_PROFILE_ENABLED:
+        listeners.append(query_profile_listener)
+    if settings.SLOW_QUERY_THRESHOLD_MS > 0:
+        listeners.append(slow_query_listener)
+    return listeners
+
+
+def get_client() -> MongoClient:
+    """
+    Returns the process-wide MongoClient, creating it on first use.
+
+    The client is bound to the pid that created it, so a gunicorn worker forked
+    from a master that already touched the database opens its own pool instead of
+    reusing sockets inherited across the fork.
+    """
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is not None and _client_pid == pid:
+        return _client
+    with _client_lock:
+        if _client is None or _client_pid != pid:
+            pool_metrics.reset()
+            _client = MongoClient(host=str(settings.MONGO_URI), **get_client_options())
+            _client_pid = pid
+    return _client
+
+
+def close_client() -> None:
+    global _client, _client_pid
+    with _client_lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client = None
+        _client_pid = None
+
+
+def get_pool_metrics() -> dict[str, Any]:
+    return {
+        "pid": os.getpid(),
+        "connected": _client is not None and _client_pid == os.getpid(),
+        "options": {
+            key: value for key, value in get_client_options().items() if key not in ["event_listeners", "appname"]
+        },
+        "pools": pool_metrics.snapshot(),
+    }
+
+
+class LazyDatabase:
+    """
+    Stands in for a pymongo Database and resolves it from the shared client on every access.
+    """
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    def get_database(self) -> Database:
+        return get_client()[self._name]
+
+    def __getitem__(self, collection: str) -> Collection:
+        return self.get_database()[collection]
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self.get_database(), attribute)
+
+
+# Repositories import this module both as "infrastructure.mongo" and "quyca.infrastructure.mongo";
+# registering both names keeps a single client and a single pool per worker.
+sys.modules.setdefault("quyca.infrastructure.mongo", sys.modules[__name__])
+sys.modules.setdefault("infrastructure.mongo", sys.modules[__name__])
+
+database: Database = cast(Database, LazyDatabase(settings.MONGO_DATABASE))
+calculations_database: Database = cast(Database, LazyDatabase(settings.MONGO_CALCULATIONS_DATABASE))
+impactu_database: Database = cast(Database, LazyDatabase(settings.MONGO_IMPACTU_DATABASE))
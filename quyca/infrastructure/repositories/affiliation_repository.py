@@ -34,6 +34,13 @@ def get_affiliations_by_institution(institution_id: str, relation_type: str) ->
     return affiliation_generator.get(affiliations)
 
 
+def get_affiliations_ids(affiliation_type: str) -> list[str]:
+    types = institutions_list if affiliation_type == "institution" else [affiliation_type]
+    return [
+        affiliation["_id"] for affiliation in database["affiliations"].find({"types.type": {"$in": types}}, {"_id": 1})
+    ]
+
+
 def get_departments_by_faculty(faculty_id: str) -> Generator:
     return get_affiliations_by_institution(faculty_id, "department")
 
@@ -75,7 +82,7 @@ def search_affiliations(
     affiliation_type: str,
     query_params: QueryParams,
     pipeline_params: dict | None = None,
-) -> Tuple[Generator, int]:
+) -> Tuple[Generator, int, str | None]:
     types = institutions_list if affiliation_type == "institution" else [affiliation_type]
     pipeline: list[dict[str, Any]] = []
 
@@ -99,7 +106,9 @@ def search_affiliations(
         },
     ]
     base_repository.set_search_end_stages(pipeline, query_params, pipeline_params)
-    affiliations = database["affiliations"].aggregate(pipeline)
+    affiliations, next_cursor = base_repository.get_page_documents(
+        database["affiliations"].aggregate(pipeline), pipeline, query_params
+    )
 
     count_pipeline: list[dict[str, Any]] = []
     if query_params.keywords:
@@ -109,4 +118,4 @@ def search_affiliations(
         {"$count": "total_results"},
     ]
     total_results = next(database["affiliations"].aggregate(count_pipeline), {"total_results": 0})["total_results"]
-    return affiliation_generator.get(affiliations), total_results
+    return affiliation_generator.get(affiliations), total_results, next_cursor
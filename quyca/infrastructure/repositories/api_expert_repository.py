@@ -1,6 +1,7 @@
 from typing import Any, Generator
 from bson import ObjectId
 
+from quyca.config import settings
 from quyca.infrastructure.generators import work_generator
 from quyca.domain.models.base_model import QueryParams
 from quyca.infrastructure.repositories import base_repository, work_repository
@@ -53,7 +54,7 @@ def get_works_for_api_expert(pipeline: list, pipeline_params: dict, query_params
     base_repository.set_match(pipeline, pipeline_params.get("match"))
     work_repository.set_issn_to_pipeline(pipeline)
     if sort := query_params.sort:
-        base_repository.set_sort(sort, pipeline)
+        base_repository.set_sort(sort, pipeline, "works")
 
     if query_params.page and query_params.limit:
         base_repository.set_pagination(pipeline, query_params)
@@ -63,6 +64,47 @@ def get_works_for_api_expert(pipeline: list, pipeline_params: dict, query_params
     return work_generator.get(cursor)
 
 
+def get_works_by_id_range_for_api_expert(
+    start_id: ObjectId | None, end_id: ObjectId | None, after_id: ObjectId | None = None
+) -> Generator:
+    """
+    Returns the works with start_id <= _id < end_id in _id order, as search_works_for_api_expert builds them.
+
+    Open bounds are None. after_id skips the works already exported when a range is resumed.
+    """
+    id_match: dict[str, ObjectId] = {}
+    if start_id is not None:
+        id_match["$gte"] = start_id
+    if end_id is not None:
+        id_match["$lt"] = end_id
+    if after_id is not None:
+        id_match["$gt"] = after_id
+    pipeline: list[dict[str, Any]] = [{"$match": {"_id": id_match} if id_match else {}}, {"$sort": {"_id": 1}}]
+    work_repository.set_issn_to_pipeline(pipeline)
+    work_repository.set_authors_filter_if_large(pipeline)
+    cursor = database["works"].aggregate(pipeline, batchSize=settings.EXPORT_BATCH_SIZE)
+    return work_generator.get(cursor)
+
+
+def get_works_id_boundaries(partitions: int, samples_per_partition: int = 100) -> list[ObjectId]:
+    """
+    Splits the _id space of the works in about equal ranges from a random sample of ids,
+    returning the partitions - 1 inner boundaries in ascending order.
+    """
+    if partitions <= 1:
+        return []
+    pipeline: list[dict[str, Any]] = [
+        {"$sample": {"size": partitions * samples_per_partition}},
+        {"$project": {"_id": 1}},
+        {"$sort": {"_id": 1}},
+    ]
+    ids = [document["_id"] for document in database["works"].aggregate(pipeline, allowDiskUse=True)]
+    if not ids:
+        return []
+    boundaries = [ids[len(ids) * partition // partitions] for partition in range(1, partitions)]
+    return list(dict.fromkeys(boundaries))
+
+
 def count_works_for_api_expert(query_params: QueryParams) -> int:
     return count_works(query_params)
 
@@ -1,4 +1,90 @@
+import base64
+import binascii
+from typing import Any, Iterable, Tuple
+
+from bson import ObjectId, json_util
+from pymongo.errors import OperationFailure
+
+from quyca.config import settings
 from quyca.domain.models.base_model import QueryParams
+from quyca.infrastructure.mongo import database
+from quyca.infrastructure.repositories import info_repository, postcalculations_repository
+
+# Stages that add fields to each document without changing which documents reach the page.
+ENRICHMENT_STAGES = {"$lookup", "$addFields", "$set"}
+# Stages an enrichment stage can be moved after when they do not use the fields it writes.
+PAGE_STAGES = {"$match", "$sort", "$skip", "$limit", "$project", "$unset"} | ENRICHMENT_STAGES
+
+# $facet builds a single output document, so it fails when a facet grows past the BSON or $facet memory limits.
+FACET_SIZE_ERROR_CODES = {10334, 4031700}
+
+# Types of the sort key values a keyset cursor can hold.
+CURSOR_VALUE_TYPES = (str, int, float, ObjectId)
+
+match_size_estimates: dict[str, int] = {}
+match_size_estimates_db_update: dict[str, int] = {"db_update": 0}
+
+
+def get_page_and_total(
+    collection: str, pipeline: list, page_stages: list, query_params: QueryParams
+) -> Tuple[Iterable[dict], int, str | None]:
+    """
+    Runs a listing and its total count.
+
+    Parameters:
+    -----------
+    collection : str
+        Collection name.
+    pipeline : list
+        Stages that select the documents, starting with the entity $match.
+    page_stages : list
+        Sort, pagination and projection stages applied after `pipeline` to build the page.
+    query_params : QueryParams
+        The query parameters of the listing, used to build the next keyset cursor.
+
+    Returns:
+    --------
+    Tuple[Iterable[dict], int, str | None]
+        The page documents, the number of documents selected by `pipeline` and the next keyset cursor.
+
+    Small match sets are returned from a single $facet round trip. Large ones run the page and the
+    count as separate aggregations, so the page sort can use indexes and stream instead of sorting
+    every matched document inside the $facet.
+    """
+    if get_estimated_match_size(collection, pipeline[0]["$match"]) <= settings.PAGE_FACET_MAX_MATCH_SIZE:
+        facet = {"$facet": {"data": page_stages, "total": [{"$count": "total"}]}}
+        try:
+            result: dict = next(database[collection].aggregate(pipeline + [facet], allowDiskUse=True), {})
+            total = result["total"][0]["total"] if result.get("total") else 0
+            page, next_cursor = get_page_documents(result.get("data", []), page_stages, query_params)
+            return page, total, next_cursor
+        except OperationFailure as error:
+            if error.code not in FACET_SIZE_ERROR_CODES:
+                raise
+    documents = database[collection].aggregate(pipeline + page_stages)
+    total = next(database[collection].aggregate(pipeline + [{"$count": "total"}]), {"total": 0}).get("total", 0)
+    page, next_cursor = get_page_documents(documents, page_stages, query_params)
+    return page, total, next_cursor
+
+
+def get_estimated_match_size(collection: str, match: dict) -> int:
+    """
+    Upper bound of the documents selected by an entity $match, capped just above PAGE_FACET_MAX_MATCH_SIZE.
+
+    Estimates only change with the data, so they are kept until the next db update.
+    """
+    db_update = info_repository.get_current_db_update()
+    if match_size_estimates_db_update["db_update"] != db_update:
+        match_size_estimates.clear()
+        match_size_estimates_db_update["db_update"] = db_update
+    key = f"{collection}:{match}"
+    if key not in match_size_estimates:
+        if len(match_size_estimates) >= settings.PAGE_FACET_ESTIMATES_CACHE_SIZE:
+            match_size_estimates.clear()
+        match_size_estimates[key] = database[collection].count_documents(
+            match, limit=settings.PAGE_FACET_MAX_MATCH_SIZE + 1
+        )
+    return match_size_estimates[key]
 
 
 def set_search_end_stages(pipeline: list, query_params: QueryParams, pipeline_params: dict | None = None) -> list:
@@ -7,15 +93,219 @@ def set_search_end_stages(pipeline: list, query_params: QueryParams, pipeline_pa
     set_sort(query_params.sort, pipeline, pipeline_params.get("collection"))
     set_project(pipeline, pipeline_params.get("project"))
     set_pagination(pipeline, query_params)
+    optimize_pipeline(pipeline)
     return pipeline
 
 
+def optimize_pipeline(pipeline: list) -> None:
+    """
+    Moves the enrichment stages ($lookup, $addFields, $set) of a paginated pipeline after its last $limit,
+    so they run for the documents of the page instead of every matched document.
+
+    A stage is moved only when no later stage before the $limit uses the fields it reads or writes, which
+    keeps the stages that compute sort keys in place. The $project and $unset stages after a moved stage
+    are moved too, behind it, unless a later stage needs a field they remove. Stages that change the
+    documents ($group, $unwind, ...) are never crossed.
+    """
+    limit_indexes = [index for index, stage in enumerate(pipeline) if "$limit" in stage]
+    if not limit_indexes:
+        return
+    limit_index = limit_indexes[-1]
+    kept: list = []
+    moved: list = []
+    kept_fields: set[str] = set()
+    first_index = limit_index + 1
+    for index in range(limit_index, -1, -1):
+        stage = pipeline[index]
+        stage_name = next(iter(stage))
+        if stage_name not in PAGE_STAGES:
+            break
+        fields = get_stage_fields(stage)
+        if stage_name in ENRICHMENT_STAGES and not fields & kept_fields:
+            moved.insert(0, stage)
+        elif stage_name in ("$project", "$unset") and is_removing_unused_fields(stage, kept_fields):
+            moved.insert(0, stage)
+        else:
+            kept.insert(0, stage)
+            kept_fields |= fields
+        first_index = index
+    if not any(next(iter(stage)) in ENRICHMENT_STAGES for stage in moved):
+        return
+    pipeline[first_index : limit_index + 1] = kept + moved
+
+
+def is_removing_unused_fields(stage: dict, used_fields: set[str]) -> bool:
+    if "$unset" in stage:
+        return not get_stage_fields(stage) & used_fields
+    project = stage["$project"]
+    if any(value in (0, False) for field, value in project.items() if field != "_id"):
+        return not set(get_field_root(field) for field in project) & used_fields
+    return used_fields <= {get_field_root(field) for field in project} | {"_id"}
+
+
+def get_stage_fields(stage: dict) -> set[str]:
+    """
+    Top level fields a stage reads or writes. The pipeline of a $lookup runs on the joined collection,
+    so only its local field, variables and output field are taken.
+    """
+    if "$lookup" in stage:
+        lookup = stage["$lookup"]
+        fields = get_expression_fields(list(lookup.get("let", {}).values()))
+        if "localField" in lookup:
+            fields.add(get_field_root(lookup["localField"]))
+        return fields | {get_field_root(lookup["as"])}
+    if "$unset" in stage:
+        unset = stage["$unset"]
+        return {get_field_root(field) for field in ([unset] if isinstance(unset, str) else unset)}
+    return get_expression_fields(stage)
+
+
+def get_expression_fields(expression: Any) -> set[str]:
+    fields: set[str] = set()
+    if isinstance(expression, dict):
+        for key, value in expression.items():
+            if not key.startswith("$"):
+                fields.add(get_field_root(key))
+            fields |= get_expression_fields(value)
+    elif isinstance(expression, list):
+        for value in expression:
+            fields |= get_expression_fields(value)
+    elif isinstance(expression, str) and expression.startswith("$") and not expression.startswith("$$"):
+        fields.add(get_field_root(expression[1:]))
+    return fields
+
+
+def get_field_root(field: str) -> str:
+    return field.split(".")[0]
+
+
 def set_pagination(pipeline: list, query_params: QueryParams) -> None:
+    if query_params.cursor is not None:
+        set_keyset_pagination(pipeline, query_params)
+        return
     if (page := query_params.page) and (limit := query_params.limit):
         skip = (page - 1) * limit
         pipeline += [{"$skip": skip}, {"$limit": limit}]
 
 
+def set_keyset_pagination(pipeline: list, query_params: QueryParams) -> None:
+    """
+    Pages by seeking past the last document of the previous page instead of skipping.
+
+    The cursor holds the sort key values of that document, so a range $match on them is inserted
+    right before the $sort, after any stage that computes the sort key. One extra document is
+    requested to know whether there is a next page.
+    """
+    sort_index = get_sort_stage_index(pipeline)
+    if sort_index is None:
+        pipeline.append({"$sort": {"_id": 1}})
+        sort_index = len(pipeline) - 1
+    sort = pipeline[sort_index]["$sort"]
+    if query_params.cursor:
+        values = decode_cursor(query_params.cursor, sort, query_params.sort)
+        pipeline.insert(sort_index, {"$match": get_keyset_match(sort, values)})
+    pipeline.append({"$limit": get_keyset_limit(query_params) + 1})
+
+
+def get_keyset_limit(query_params: QueryParams) -> int:
+    return query_params.limit or 10
+
+
+def get_sort_stage_index(pipeline: list) -> int | None:
+    indexes = [index for index, stage in enumerate(pipeline) if "$sort" in stage]
+    return indexes[-1] if indexes else None
+
+
+def get_page_documents(
+    documents: Iterable[dict], pipeline: list, query_params: QueryParams
+) -> Tuple[Iterable[dict], str | None]:
+    """
+    Trims the extra document requested by keyset pagination and builds the cursor of the next page.
+    """
+    if query_params.cursor is None:
+        return documents, None
+    limit = get_keyset_limit(query_params)
+    page = list(documents)
+    if len(page) <= limit:
+        return page, None
+    page = page[:limit]
+    sort_index = get_sort_stage_index(pipeline)
+    sort = pipeline[sort_index]["$sort"] if sort_index is not None else {"_id": 1}
+    values = [get_field_value(page[-1], field) for field in sort]
+    return page, encode_cursor(sort, values, query_params.sort)
+
+
+def encode_cursor(sort: dict, values: list, sort_param: str | None) -> str:
+    cursor = json_util.dumps({"sort": sort_param, "fields": list(sort), "values": values})
+    return base64.urlsafe_b64encode(cursor.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, sort: dict, sort_param: str | None) -> list:
+    try:
+        decoded = json_util.loads(base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8"))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError("Invalid cursor.")
+    if not isinstance(decoded, dict) or decoded.get("fields") != list(sort) or decoded.get("sort") != sort_param:
+        raise ValueError("The cursor does not match the requested sort.")
+    values = decoded.get("values")
+    if not isinstance(values, list) or len(values) != len(sort):
+        raise ValueError("Invalid cursor.")
+    # Values go into the $match of the next page, so operators such as {"$ne": null} are rejected.
+    if not all(value is None or isinstance(value, CURSOR_VALUE_TYPES) for value in values):
+        raise ValueError("Invalid cursor.")
+    return values
+
+
+def get_keyset_match(sort: dict, values: list) -> dict:
+    """
+    Documents that come after `values` in the order of `sort`.
+
+    Each branch keeps the previous sort keys equal and moves the next one forward. Documents whose
+    key has another BSON type are added explicitly, since range operators only compare values of
+    the same type while $sort orders null before numbers and numbers before strings.
+    """
+    fields = list(sort.items())
+    branches = []
+    for index, (field, direction) in enumerate(fields):
+        equal = {previous_field: value for (previous_field, _), value in zip(fields[:index], values[:index])}
+        for condition in get_after_conditions(field, direction, values[index]):
+            branches.append({**equal, **condition})
+    return {"$or": branches}
+
+
+def get_after_conditions(field: str, direction: int, value: Any) -> list[dict]:
+    conditions: list[dict] = []
+    if value is not None:
+        conditions.append({field: {"$gt" if direction == 1 else "$lt": value}})
+    type_order: list[dict] = [{field: None}, {field: {"$type": "number"}}, {field: {"$type": "string"}}]
+    rank = get_type_rank(value)
+    if rank is None:
+        return conditions
+    for other_rank, condition in enumerate(type_order):
+        if (direction == 1 and other_rank > rank) or (direction == -1 and other_rank < rank):
+            conditions.append(condition)
+    return conditions
+
+
+def get_type_rank(value: Any) -> int | None:
+    if value is None:
+        return 0
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return 1
+    if isinstance(value, str):
+        return 2
+    return None
+
+
+def get_field_value(document: dict, field: str) -> Any:
+    value: Any = document
+    for key in field.split("."):
+        value = value.get(key) if isinstance(value, dict) else None
+    return value
+
+
 def set_match(pipeline: list, match: dict | None) -> None:
     if not match:
         return
@@ -25,206 +315,130 @@ def set_match(pipeline: list, match: dict | None) -> None:
 def set_project(pipeline: list, project: list | dict | None) -> None:
     if not project:
         return
-
-    pipeline.append({"$project": {"_id": 1, **{p: 1 for p in project}}})
+    # Sort keys are kept so that the next keyset cursor can be built from the last document of the page.
+    sort_index = get_sort_stage_index(pipeline)
+    sort_fields = list(pipeline[sort_index]["$sort"]) if sort_index is not None else []
+    pipeline.append({"$project": {"_id": 1, **{p: 1 for p in project}, **{field: 1 for field in sort_fields}}})
 
 
 def set_sort(sort: str | None, pipeline: list, collection: str | None = None) -> None:
+    """
+    Sorts by the key of the requested sort field and breaks ties by `_id` in the same direction,
+    so that a single compound index serves both directions.
+
+    Keys stored by the sort keys postcalculation are sorted directly, which lets the $sort use
+    the indexes created with them. Otherwise the key is computed for every document.
+    """
     if not sort:
         return
     sort_field, direction_str = sort.split("_")
     direction = -1 if direction_str == "desc" else 1
 
+    expression = None
     if sort_field == "citations":
+        sort_field = "citations_count_openalex"
         if collection == "sources":
-            pipeline += [
-                {
-                    "$addFields": {
-                        "citations_count_openalex": {
-                            "$let": {
-                                "vars": {
-                                    "openalexCitation": {
-                                        "$arrayElemAt": [
-                                            {
-                                                "$filter": {
-                                                    "input": "$citations_count",
-                                                    "as": "cite",
-                                                    "cond": {"$eq": ["$$cite.source", "openalex"]},
-                                                }
-                                            },
-                                            0,
-                                        ]
-                                    }
-                                },
-                                "in": {"$ifNull": ["$$openalexCitation.count", 0]},
-                            }
-                        }
-                    }
-                }
-            ]
-            sort_field = "citations_count_openalex"
-        else:
-            sort_field = "citations_count_openalex"
+            expression = get_citations_count_openalex_expression()
     elif sort_field == "alphabetical":
         if collection == "sources":
-            pipeline += [
-                {
-                    "$addFields": {
-                        "names_order": {
-                            "$map": {
-                                "input": "$names",
-                                "as": "name",
-                                "in": {
-                                    "source": "$$name.source",
-                                    "name": "$$name.name",
-                                    "order": {
-                                        "$switch": {
-                                            "branches": [
-                                                {
-                                                    "case": {
-                                                        "$eq": [
-                                                            "$$name.source",
-                                                            "openalex",
-                                                        ]
-                                                    },
-                                                    "then": 0,
-                                                },
-                                                {
-                                                    "case": {"$eq": ["$$name.source", "doaj"]},
-                                                    "then": 1,
-                                                },
-                                                {
-                                                    "case": {"$eq": ["$$name.source", "scimago"]},
-                                                    "then": 2,
-                                                },
-                                                {
-                                                    "case": {"$eq": ["$$name.source", "scholar"]},
-                                                    "then": 3,
-                                                },
-                                            ],
-                                            "default": 10,
-                                        }
-                                    },
-                                },
-                            }
-                        }
-                    }
-                },
-                {
-                    "$addFields": {
-                        "first_name": {
-                            "$arrayElemAt": [
-                                {
-                                    "$sortArray": {
-                                        "input": "$names_order",
-                                        "sortBy": {"order": 1},
-                                    }
-                                },
-                                0,
-                            ]
-                        }
-                    }
-                },
-                {"$addFields": {"sort_name": "$first_name.name"}},
-                {"$unset": ["names_order", "first_name"]},
-            ]
             sort_field = "sort_name"
+            expression = get_sort_name_expression()
         else:
-            pipeline += [
-                {
-                    "$addFields": {
-                        "titles_order": {
-                            "$map": {
-                                "input": "$titles",
-                                "as": "title",
-                                "in": {
-                                    "source": "$$title.source",
-                                    "title": "$$title.title",
-                                    "order": {
-                                        "$switch": {
-                                            "branches": [
-                                                {
-                                                    "case": {
-                                                        "$eq": [
-                                                            "$$title.source",
-                                                            "openalex",
-                                                        ]
-                                                    },
-                                                    "then": 0,
-                                                },
-                                                {
-                                                    "case": {"$eq": ["$$title.source", "scholar"]},
-                                                    "then": 1,
-                                                },
-                                                {
-                                                    "case": {"$eq": ["$$title.source", "scienti"]},
-                                                    "then": 2,
-                                                },
-                                                {
-                                                    "case": {
-                                                        "$eq": [
-                                                            "$$title.source",
-                                                            "minciencias",
-                                                        ]
-                                                    },
-                                                    "then": 3,
-                                                },
-                                                {
-                                                    "case": {"$eq": ["$$title.source", "ranking"]},
-                                                    "then": 4,
-                                                },
-                                                {
-                                                    "case": {"$eq": ["$$title.source", "siiu"]},
-                                                    "then": 5,
-                                                },
-                                            ],
-                                            "default": 10,
-                                        }
-                                    },
-                                },
-                            }
-                        }
-                    }
-                },
-                {
-                    "$addFields": {
-                        "first_title": {
-                            "$arrayElemAt": [
-                                {
-                                    "$sortArray": {
-                                        "input": "$titles_order",
-                                        "sortBy": {"order": 1},
-                                    }
-                                },
-                                0,
-                            ]
-                        }
-                    }
-                },
-                {"$addFields": {"title": "$first_title.title"}},
-                {"$unset": ["titles_order", "first_title"]},
-            ]
-            sort_field = "title"
+            sort_field = "sort_title"
+            expression = get_sort_title_expression()
     elif sort_field == "products":
         sort_field = "products_count"
     elif sort_field == "year":
-        pipeline += [
-            {
-                "$addFields": {
-                    "sort_year": {
-                        "$cond": {
-                            "if": {
-                                "$or": [
-                                    {"$eq": ["$year_published", None]},
-                                    {"$eq": ["$year_published", ""]},
-                                ]
-                            },
-                            "then": -1,
-                            "else": "$year_published",
-                        }
-                    }
+        sort_field = "sort_year"
+        expression = get_sort_year_expression()
+    if expression and not (collection and postcalculations_repository.has_sort_keys(collection)):
+        pipeline += [{"$addFields": {sort_field: expression}}]
+    pipeline += [{"$sort": {sort_field: direction, "_id": direction}}]
+
+
+def get_citations_count_openalex_expression() -> dict:
+    return {
+        "$let": {
+            "vars": {
+                "openalexCitation": {
+                    "$arrayElemAt": [
+                        {
+                            "$filter": {
+                                "input": "$citations_count",
+                                "as": "cite",
+                                "cond": {"$eq": ["$$cite.source", "openalex"]},
+                            }
+                        },
+                        0,
+                    ]
                 }
             },
-        ]
-        sort_field = "sort_year"
-    pipeline += [{"$sort": {sort_field: direction, "_id": 1}}]
+            "in": {"$ifNull": ["$$openalexCitation.count", 0]},
+        }
+    }
+
+
+def get_sort_name_expression() -> dict:
+    return get_first_by_source_expression("names", "name", ["openalex", "doaj", "scimago", "scholar"])
+
+
+def get_sort_title_expression() -> dict:
+    return get_first_by_source_expression(
+        "titles", "title", ["openalex", "scholar", "scienti", "minciencias", "ranking", "siiu"]
+    )
+
+
+def get_first_by_source_expression(array_field: str, value_field: str, sources: list[str]) -> dict:
+    """
+    Value of the first element of `array_field` in the order of `sources`, elements of other sources last.
+    """
+    return {
+        "$let": {
+            "vars": {
+                "first": {
+                    "$arrayElemAt": [
+                        {
+                            "$sortArray": {
+                                "input": {
+                                    "$map": {
+                                        "input": f"${array_field}",
+                                        "as": "item",
+                                        "in": {
+                                            value_field: f"$$item.{value_field}",
+                                            "order": {
+                                                "$switch": {
+                                                    "branches": [
+                                                        {"case": {"$eq": ["$$item.source", source]}, "then": order}
+                                                        for order, source in enumerate(sources)
+                                                    ],
+                                                    "default": 10,
+                                                }
+                                            },
+                                        },
+                                    }
+                                },
+                                "sortBy": {"order": 1},
+                            }
+                        },
+                        0,
+                    ]
+                }
+            },
+            "in": f"$$first.{value_field}",
+        }
+    }
+
+
+def get_sort_year_expression() -> dict:
+    return {
+        "$cond": {
+            "if": {
+                "$or": [
+                    {"$eq": ["$year_published", None]},
+                    {"$eq": ["$year_published", ""]},
+                ]
+            },
+            "then": -1,
+            "else": "$year_published",
+        }
+    }
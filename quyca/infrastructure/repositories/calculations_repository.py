@@ -1,5 +1,10 @@
+from typing import Any
+
+from bson import ObjectId
+
 from quyca.domain.models.calculations_model import Calculations
 from quyca.infrastructure.mongo import calculations_database
+from quyca.infrastructure.repositories import info_repository
 
 
 def get_person_calculations(person_id: str) -> Calculations:
@@ -14,3 +19,15 @@ def get_affiliation_calculations(affiliation_id: str) -> Calculations:
     if not affiliation_calculations:
         return Calculations()
     return Calculations(**affiliation_calculations)
+
+
+def get_sources_profiles(source_ids: list[ObjectId]) -> dict[str, dict[str, Any]]:
+    """
+    Returns the profiles stored by the sources_profile postcalculation for the current db update, by source id.
+    """
+    if not source_ids:
+        return {}
+    profiles = calculations_database["sources_profile"].find(
+        {"_id": {"$in": source_ids}, "db_update": info_repository.get_current_db_update()}
+    )
+    return {str(profile["_id"]): profile for profile in profiles}
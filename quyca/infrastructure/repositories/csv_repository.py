@@ -1,45 +1,46 @@
-from typing import Any, Dict, Generator, List
+from typing import Any, Dict, List
 
 from bson import ObjectId
+from pymongo.command_cursor import CommandCursor
 
 
+from quyca.config import settings
 from quyca.domain.models.base_model import QueryParams
-from quyca.infrastructure.generators import work_generator
 from quyca.infrastructure.mongo import database
 from quyca.infrastructure.repositories import base_repository, work_repository
 
 
-def get_works_csv_by_person(person_id: str, query_params: QueryParams, pipeline_params: dict) -> Generator:
+def get_works_csv_by_person(person_id: str, query_params: QueryParams, pipeline_params: dict) -> CommandCursor:
     pipeline: List[Dict[str, Any]] = [
         {"$match": {"authors.id": person_id}},
     ]
     work_repository.set_authors_filter_if_large(pipeline)
-    base_repository.set_project(pipeline, pipeline_params.get("project"))
     work_repository.set_product_filters(pipeline, query_params)
-    cursor = database["works"].aggregate(pipeline)
-    return work_generator.get(cursor)
+    base_repository.set_project(pipeline, pipeline_params.get("project"))
+    return database["works"].aggregate(pipeline, batchSize=settings.EXPORT_BATCH_SIZE)
 
 
-def get_works_csv_by_affiliation(affiliation_id: str, query_params: QueryParams, pipeline_params: dict) -> Generator:
+def get_works_csv_by_affiliation(
+    affiliation_id: str, query_params: QueryParams, pipeline_params: dict
+) -> CommandCursor:
     pipeline: List[Dict[str, Any]] = [
         {"$match": {"authors.affiliations.id": affiliation_id}},
     ]
     work_repository.set_authors_filter_if_large(pipeline)
-    base_repository.set_project(pipeline, pipeline_params.get("project"))
     work_repository.set_product_filters(pipeline, query_params)
-    cursor = database["works"].aggregate(pipeline)
-    return work_generator.get(cursor)
+    base_repository.set_project(pipeline, pipeline_params.get("project"))
+    return database["works"].aggregate(pipeline, batchSize=settings.EXPORT_BATCH_SIZE)
 
 
-def get_works_csv_by_source(source_id: str, query_params: QueryParams, pipeline_params: dict) -> Generator:
+def get_works_csv_by_source(source_id: str, query_params: QueryParams, pipeline_params: dict) -> CommandCursor:
     """
     Query database for works from a specific source using MongoDB aggregation.
 
     Builds and executes a MongoDB aggregation pipeline that:
     1. Filters works by source ID
-    2. Projects only necessary fields (from pipeline_params)
-    3. Applies additional filters from query_params (dates, types, etc.)
-    4. Returns results as a generator
+    2. Applies additional filters from query_params (dates, types, etc.)
+    3. Projects only necessary fields (from pipeline_params)
+    4. Returns the cursor of the raw documents
 
     Args:
         source_id: Source identifier to filter works
@@ -47,17 +48,16 @@ def get_works_csv_by_source(source_id: str, query_params: QueryParams, pipeline_
         pipeline_params: Projection parameters defining which fields to retrieve
 
     Returns:
-        Generator: Generator yielding Work objects from database cursor
+        CommandCursor: Cursor yielding the raw work documents, transformed by csv_service
 
     Note:
-        Uses generator to avoid loading all works into memory at once,
+        Uses a cursor to avoid loading all works into memory at once,
         which is critical for sources with thousands of publications
     """
     pipeline: List[Dict[str, Any]] = [
         {"$match": {"source.id": ObjectId(source_id)}},
     ]
     work_repository.set_authors_filter_if_large(pipeline)
-    base_repository.set_project(pipeline, pipeline_params.get("project"))
     work_repository.set_product_filters(pipeline, query_params)
-    cursor = database["works"].aggregate(pipeline)
-    return work_generator.get(cursor)
+    base_repository.set_project(pipeline, pipeline_params.get("project"))
+    return database["works"].aggregate(pipeline, batchSize=settings.EXPORT_BATCH_SIZE)
@@ -0,0 +1,232 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from bson import ObjectId
+from pymongo import DESCENDING
+from pymongo.errors import OperationFailure
+from sentry_sdk import capture_exception
+
+from quyca.config import settings
+from quyca.infrastructure.mongo import calculations_database, get_client
+
+OBJECT_ID_PATTERN = re.compile(r"^[0-9a-f]{24}$")
+# Stages that write, so their pipelines are never run again to be explained.
+WRITE_STAGES = {"$out", "$merge"}
+# Operators of a $match whose fields are compared by range instead of equality.
+RANGE_OPERATORS = {"$gt", "$gte", "$lt", "$lte", "$ne", "$nin", "$exists", "$regex"}
+# Stages whose values change from one request to another and are not part of the shape.
+LITERAL_STAGES = {"$match", "$skip", "$limit", "$sample"}
+EXPLAIN_COUNTERS = {
+    "totalDocsExamined": "docs_examined",
+    "totalKeysExamined": "keys_examined",
+    "nReturned": "returned",
+    "executionTimeMillis": "execution_ms",
+}
+# Parts of an explain that are not the executed plan.
+EXPLAIN_SKIPPED_KEYS = {"command", "rejectedPlans", "allPlansExecution", "serverInfo", "serverParameters"}
+MAX_QUEUED_CAPTURES = 100
+
+capture_state: Dict[str, Any] = {"pid": None, "executor": None, "queued": 0, "explained_at": {}}
+capture_state_lock = threading.Lock()
+
+
+def capture_slow_query(database_name: str, collection: str, pipeline: list, milliseconds: float, module: str) -> None:
+    """
+    Records a slow aggregation of `module` in the query_diagnostics collection, in a background thread.
+
+    Aggregations with the same database, collection and normalized pipeline share one document with their
+    count and latency. The first time a shape is seen, and then at most once every
+    SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS, the pipeline is run again with explain("executionStats") on the
+    database it was sent to and the summary of the plan is stored.
+    """
+    executor = get_capture_executor()
+    with capture_state_lock:
+        if capture_state["queued"] >= MAX_QUEUED_CAPTURES:
+            return
+        capture_state["queued"] += 1
+    executor.submit(save_slow_query, database_name, collection, pipeline, milliseconds, module)
+
+
+def get_capture_executor() -> ThreadPoolExecutor:
+    pid = os.getpid()
+    with capture_state_lock:
+        if capture_state["pid"] != pid:
+            capture_state["executor"] = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query")
+            capture_state["pid"] = pid
+            capture_state["queued"] = 0
+            capture_state["explained_at"] = {}
+        executor: ThreadPoolExecutor = capture_state["executor"]
+    return executor
+
+
+def save_slow_query(database_name: str, collection: str, pipeline: list, milliseconds: float, module: str) -> None:
+    try:
+        # Shapes are kept as JSON, since their field names start with $ and contain dots.
+        shape = json.dumps(normalize_pipeline(pipeline), default=str)
+        fingerprint = hashlib.sha1(f"{database_name}.{collection}:{shape}".encode("utf-8")).hexdigest()[:16]
+        now = datetime.now(timezone.utc)
+        update: Dict[str, Any] = {
+            "$setOnInsert": {
+                "database": database_name,
+                "collection": collection,
+                "module": module,
+                "shape": shape,
+                "first_seen": now,
+            },
+            "$set": {"last_seen": now},
+            "$inc": {"count": 1, "total_ms": milliseconds},
+            "$max": {"max_ms": milliseconds},
+        }
+        if is_explain_due(fingerprint) and not any(next(iter(stage)) in WRITE_STAGES for stage in pipeline):
+            update["$set"]["explained_at"] = now
+            try:
+                explain = get_client()[database_name].command(
+                    "explain",
+                    {"aggregate": collection, "pipeline": pipeline, "cursor": {}, "allowDiskUse": True},
+                    verbosity="executionStats",
+                )
+                update["$set"]["explain"] = get_explain_summary(explain)
+            except OperationFailure as error:
+                update["$set"]["explain"] = {"error": str(error)}
+        calculations_database["query_diagnostics"].update_one({"_id": fingerprint}, update, upsert=True)
+    except Exception as e:
+        capture_exception(e)
+    finally:
+        with capture_state_lock:
+            capture_state["queued"] -= 1
+
+
+def is_explain_due(fingerprint: str) -> bool:
+    now = time.monotonic()
+    with capture_state_lock:
+        explained_at = capture_state["explained_at"].get(fingerprint)
+        if explained_at is not None and now - explained_at < settings.SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS:
+            return False
+        capture_state["explained_at"][fingerprint] = now
+    return True
+
+
+def normalize_pipeline(pipeline: list) -> list:
+    """
+    Shape of a pipeline: the values compared by its $match stages, pagination values and ids anywhere
+    else are replaced by placeholders of their type, and arrays of values collapse to one placeholder,
+    so the same query for different entities or pages has the same shape.
+    """
+    return [
+        {name: normalize_lookup(body) if name == "$lookup" else normalize_value(body, name in LITERAL_STAGES)}
+        for stage in pipeline
+        for name, body in stage.items()
+    ]
+
+
+def normalize_lookup(lookup: dict) -> dict:
+    return {
+        key: normalize_pipeline(value) if key == "pipeline" else normalize_value(value, False)
+        for key, value in lookup.items()
+    }
+
+
+def normalize_value(value: Any, literals: bool) -> Any:
+    if isinstance(value, dict):
+        return {key: normalize_value(item, literals) for key, item in value.items()}
+    if isinstance(value, list):
+        items = [normalize_value(item, literals) for item in value]
+        if items and all(not isinstance(item, (dict, list)) for item in items) and literals:
+            return list(dict.fromkeys(items))
+        return items
+    if isinstance(value, ObjectId):
+        return "<ObjectId>"
+    if isinstance(value, str):
+        if value.startswith("$"):
+            return value
+        if OBJECT_ID_PATTERN.match(value):
+            return "<id>"
+        return "<str>" if literals else value
+    if literals and value is not None:
+        return f"<{type(value).__name__}>"
+    return value
+
+
+def get_explain_summary(explain: dict) -> dict:
+    """
+    Plan stages, indexes used and execution counters of an aggregation explain, with flags for the
+    stages that usually call for an index: collection scans, sorts in memory and blocking $group stages.
+    """
+    pipeline_stages = [next(iter(stage)) for stage in explain.get("stages", []) if "$cursor" not in stage]
+    plan_stages: List[str] = []
+    index_names: List[str] = []
+    counters = {"docs_examined": 0, "keys_examined": 0, "returned": 0, "execution_ms": 0}
+    used_disk = False
+
+    def walk(node: Any) -> None:
+        nonlocal used_disk
+        if isinstance(node, list):
+            for item in node:
+                walk(item)
+            return
+        if not isinstance(node, dict):
+            return
+        if isinstance(node.get("stage"), str):
+            plan_stages.append(node["stage"])
+        if isinstance(node.get("indexName"), str):
+            index_names.append(node["indexName"])
+        if node.get("usedDisk") is True:
+            used_disk = True
+        for key, value in node.items():
+            if key in EXPLAIN_COUNTERS and isinstance(value, int):
+                counters[EXPLAIN_COUNTERS[key]] = max(counters[EXPLAIN_COUNTERS[key]], value)
+            elif key not in EXPLAIN_SKIPPED_KEYS:
+                walk(value)
+
+    walk(explain)
+    stages = {stage.upper() for stage in plan_stages}
+    return {
+        "plan_stages": list(dict.fromkeys(plan_stages)),
+        "pipeline_stages": pipeline_stages,
+        "indexes": list(dict.fromkeys(index_names)),
+        **counters,
+        "used_disk": used_disk,
+        "collscan": "COLLSCAN" in stages,
+        "in_memory_sort": "SORT" in stages or "$sort" in pipeline_stages,
+        "blocking_group": "GROUP" in stages or "$group" in pipeline_stages,
+    }
+
+
+def get_candidate_index(shape: list) -> Dict[str, int] | None:
+    """
+    Index for the leading $match and the $sort right after it: equality fields first, then the sort
+    fields and then the range fields. Conditions by $text, $expr or $or are not considered.
+    """
+    if not shape or "$match" not in shape[0]:
+        return None
+    equality: List[str] = []
+    ranges: List[str] = []
+    for field, condition in shape[0]["$match"].items():
+        if field.startswith("$"):
+            continue
+        operators = set(condition) if isinstance(condition, dict) else set()
+        if operators & RANGE_OPERATORS:
+            ranges.append(field)
+        elif operators <= {"$eq", "$in", "$all", "$elemMatch"}:
+            equality.append(field)
+    keys: Dict[str, int] = {field: 1 for field in equality}
+    following: dict = next((stage for stage in shape[1:] if "$match" not in stage), {})
+    keys.update({field: direction for field, direction in following.get("$sort", {}).items() if field not in keys})
+    keys.update({field: 1 for field in ranges if field not in keys})
+    return keys or None
+
+
+def get_slow_queries(limit: int, collection: str | None = None) -> List[dict]:
+    query = {"collection": collection} if collection else {}
+    return list(calculations_database["query_diagnostics"].find(query).sort("total_ms", DESCENDING).limit(limit))
+
+
+def clear_slow_queries() -> None:
+    calculations_database["query_diagnostics"].delete_many({})
@@ -0,0 +1,73 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+
+from pymongo.errors import PyMongoError
+from sentry_sdk import capture_exception
+
+from quyca.domain.models.base_model import QueryParams
+from quyca.infrastructure.mongo import calculations_database
+
+FILTER_FIELDS = [
+    "product_types",
+    "years",
+    "status",
+    "subjects",
+    "topics",
+    "countries",
+    "groups_ranking",
+    "authors_ranking",
+]
+
+
+def get_normalized_filters(query_params: QueryParams) -> dict:
+    """
+    Product filters of the request in a canonical form.
+
+    Every filter is a comma separated set, so its values are deduplicated and sorted
+    so that equivalent requests share the same stored facets.
+    """
+    filters = {}
+    for field in FILTER_FIELDS:
+        value = getattr(query_params, field)
+        if value:
+            filters[field] = ",".join(sorted(set(value.split(","))))
+    return filters
+
+
+def get_filters_key(entity: str, entity_id: str, filters: dict) -> str:
+    if not filters:
+        return f"{entity}:{entity_id}"
+    digest = hashlib.sha1(json.dumps(filters, sort_keys=True).encode("utf-8")).hexdigest()
+    return f"{entity}:{entity_id}:{digest}"
+
+
+def get_available_filters(entity: str, entity_id: str, filters: dict, db_update: int) -> dict | None:
+    document = calculations_database["works_filters"].find_one(
+        {"_id": get_filters_key(entity, entity_id, filters), "db_update": db_update},
+        {"available_filters": 1},
+    )
+    if not document:
+        return None
+    available_filters: dict = document["available_filters"]
+    return available_filters
+
+
+def save_available_filters(entity: str, entity_id: str, filters: dict, db_update: int, available_filters: dict) -> None:
+    key = get_filters_key(entity, entity_id, filters)
+    document = {
+        "entity": entity,
+        "entity_id": entity_id,
+        "filters": filters,
+        "db_update": db_update,
+        "available_filters": available_filters,
+        "updated_at": datetime.now(timezone.utc),
+    }
+    try:
+        calculations_database["works_filters"].replace_one({"_id": key}, document, upsert=True)
+    except PyMongoError as e:
+        capture_exception(e)
+
+
+def delete_outdated_filters(db_update: int) -> int:
+    return calculations_database["works_filters"].delete_many({"db_update": {"$ne": db_update}}).deleted_count
@@ -0,0 +1,121 @@
+import threading
+from typing import Any, Dict, List
+
+from sentry_sdk import capture_exception
+
+from quyca.infrastructure.mongo import database, calculations_database
+from quyca.infrastructure.repositories import affiliation_repository, info_repository, postcalculations_repository
+
+_hierarchy_index: Dict[str, Any] = {"db_update": None}
+_hierarchy_index_lock = threading.Lock()
+
+
+def get_hierarchy_index() -> Dict[str, Any]:
+    """
+    Returns the process-wide index of the affiliations hierarchy, building it on first use.
+
+    The index holds, for every affiliation, its parent ids and its child ids by type, the name of each
+    affiliation and the groups of every faculty and department. It is rebuilt when the db update changes
+    and swapped in a single assignment, so requests keep reading the previous index meanwhile.
+    """
+    global _hierarchy_index
+    db_update = info_repository.get_current_db_update()
+    if _hierarchy_index["db_update"] == db_update:
+        return _hierarchy_index
+    with _hierarchy_index_lock:
+        if _hierarchy_index["db_update"] != db_update:
+            _hierarchy_index = build_hierarchy_index(db_update)
+    return _hierarchy_index
+
+
+def load_hierarchy_index() -> None:
+    """
+    Loads the index in a background thread, so a worker has it ready before its first plot.
+    """
+
+    def load() -> None:
+        try:
+            get_hierarchy_index()
+        except Exception as e:
+            capture_exception(e)
+
+    threading.Thread(target=load, name="hierarchy-index", daemon=True).start()
+
+
+def build_hierarchy_index(db_update: int) -> Dict[str, Any]:
+    children: Dict[str, Dict[str, List[str]]] = {}
+    parents: Dict[str, List[str]] = {}
+    names: Dict[str, str | None] = {}
+    projection = {"names": 1, "types.type": 1, "relations.id": 1}
+    for affiliation in database["affiliations"].find({"relations.id": {"$exists": True}}, projection):
+        affiliation_id = affiliation["_id"]
+        names[affiliation_id] = get_affiliation_name(affiliation.get("names"))
+        relations = affiliation.get("relations")
+        relations = [relations] if isinstance(relations, dict) else relations or []
+        parent_ids = list(dict.fromkeys(relation["id"] for relation in relations if relation.get("id")))
+        parents[affiliation_id] = parent_ids
+        types = list(dict.fromkeys(affiliation_type.get("type") for affiliation_type in affiliation.get("types") or []))
+        for parent_id in parent_ids:
+            for affiliation_type in types:
+                children.setdefault(parent_id, {}).setdefault(affiliation_type, []).append(affiliation_id)
+
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    has_groups = postcalculations_repository.is_postcalculation_done("affiliations_groups")
+    if has_groups:
+        for unit in calculations_database["affiliations_groups"].find({"db_update": db_update}):
+            groups[unit["_id"]] = unit["groups"]
+    return {
+        "db_update": db_update,
+        "children": children,
+        "parents": parents,
+        "names": names,
+        "groups": groups,
+        "has_groups": has_groups,
+    }
+
+
+def get_affiliation_name(names: list | None) -> str | None:
+    """
+    Name of an affiliation as the Affiliation model picks it: the spanish name or else the first one.
+    """
+    normalized_names = [
+        {"name": name, "lang": None} if isinstance(name, str) else name
+        for name in names or []
+        if isinstance(name, (str, dict))
+    ]
+    if not normalized_names:
+        return None
+    es_name = next((name for name in normalized_names if name.get("lang") == "es"), None)
+    return (es_name or normalized_names[0]).get("name")
+
+
+def get_child_ids(parent_id: str, affiliation_type: str) -> List[str]:
+    return list(get_hierarchy_index()["children"].get(parent_id, {}).get(affiliation_type, []))
+
+
+def get_child_affiliations(parent_id: str, affiliation_type: str) -> List[Dict[str, Any]]:
+    names = get_hierarchy_index()["names"]
+    return [{"id": child_id, "name": names.get(child_id)} for child_id in get_child_ids(parent_id, affiliation_type)]
+
+
+def get_parent_ids(affiliation_id: str) -> List[str]:
+    return list(get_hierarchy_index()["parents"].get(affiliation_id, []))
+
+
+def get_group_affiliations(affiliation_id: str) -> List[Dict[str, Any]]:
+    """
+    Groups of the institution of a faculty or department that have members in it, from the
+    affiliations_groups postcalculation. Before it runs, they are computed from the person collection
+    once per faculty or department and db update.
+    """
+    index = get_hierarchy_index()
+    if affiliation_id not in index["groups"]:
+        if index["has_groups"]:
+            return []
+        groups = affiliation_repository.get_groups_by_faculty_or_department(affiliation_id)
+        index["groups"][affiliation_id] = [{"id": group.id, "name": group.name} for group in groups]
+    return list(index["groups"][affiliation_id])
+
+
+def get_group_ids(affiliation_id: str) -> List[str]:
+    return [group["id"] for group in get_group_affiliations(affiliation_id)]
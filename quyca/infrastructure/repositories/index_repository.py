@@ -0,0 +1,126 @@
+import time
+from typing import Any, Dict, Generator, List
+
+from pymongo.database import Database
+
+from quyca.domain.constants.indexes import TEXT, index_catalog
+from quyca.infrastructure.mongo import database, calculations_database
+
+databases: Dict[str, Database] = {"main": database, "calculations": calculations_database}
+
+
+def get_index_diff(collections: List[str] | None = None) -> List[Dict[str, Any]]:
+    """
+    Compares the catalog with the indexes of the databases.
+
+    Returns one item per catalog index with status "ok", "hidden" or "missing", and one per index of
+    a catalog collection that is not in the catalog, with status "extra". Indexes are compared by
+    their keys, so they may have any name.
+    """
+    diff: List[Dict[str, Any]] = []
+    for database_name, catalog in index_catalog.items():
+        for collection, indexes in catalog.items():
+            if collections and collection not in collections:
+                continue
+            existing = get_existing_indexes(database_name, collection)
+            matched: set[str] = set()
+            for keys in indexes:
+                name = get_matching_index(keys, existing)
+                status = "missing" if name is None else "hidden" if existing[name].get("hidden") else "ok"
+                diff.append(
+                    {"database": database_name, "collection": collection, "keys": keys, "name": name, "status": status}
+                )
+                if name is not None:
+                    matched.add(name)
+            for name, index in existing.items():
+                if name != "_id_" and name not in matched:
+                    keys = [(field, direction) for field, direction in index["key"]]
+                    diff.append(
+                        {
+                            "database": database_name,
+                            "collection": collection,
+                            "keys": keys,
+                            "name": name,
+                            "status": "extra",
+                        }
+                    )
+    return diff
+
+
+def get_existing_indexes(database_name: str, collection: str) -> Dict[str, Dict[str, Any]]:
+    indexes: Dict[str, Dict[str, Any]] = dict(databases[database_name][collection].index_information())
+    return indexes
+
+
+def get_matching_index(keys: List[tuple], existing: Dict[str, Dict[str, Any]]) -> str | None:
+    is_text = any(direction == TEXT for _, direction in keys)
+    for name, index in existing.items():
+        index_keys = [(field, direction) for field, direction in index["key"]]
+        if is_text and any(direction == TEXT for _, direction in index_keys):
+            return name
+        if not is_text and index_keys == [(field, direction) for field, direction in keys]:
+            return name
+    return None
+
+
+def ensure_indexes(
+    diff: List[Dict[str, Any]], hidden: bool = False, commit_quorum: str | int | None = None, pause_seconds: float = 0
+) -> Generator[Dict[str, Any], None, None]:
+    """
+    Builds the missing indexes of a diff one at a time and yields each one with its build time.
+
+    Indexes built with `hidden` are not used by queries until they are unhidden, so a large build can be
+    checked on every member before the planner picks it. Without it, hidden catalog indexes are unhidden.
+    The pause between builds leaves room for secondaries to catch up with the oplog.
+    """
+    for item in diff:
+        if item["status"] != "missing" and (item["status"] != "hidden" or hidden):
+            continue
+        collection = databases[item["database"]][item["collection"]]
+        start = time.time()
+        if item["status"] == "hidden":
+            databases[item["database"]].command(
+                "collMod", item["collection"], index={"name": item["name"], "hidden": False}
+            )
+        else:
+            options: Dict[str, Any] = {"hidden": True} if hidden else {}
+            if commit_quorum is not None:
+                options["commitQuorum"] = commit_quorum
+            item["name"] = collection.create_index(item["keys"], **options)
+        yield {**item, "seconds": time.time() - start}
+        if pause_seconds:
+            time.sleep(pause_seconds)
+
+
+def create_indexes(database_name: str, collection: str, indexes: List[List[tuple]]) -> None:
+    diff = [
+        {"database": database_name, "collection": collection, "keys": keys, "name": None, "status": "missing"}
+        for keys in indexes
+        if get_matching_index(keys, get_existing_indexes(database_name, collection)) is None
+    ]
+    for _ in ensure_indexes(diff):
+        pass
+
+
+def is_index_backed(database_name: str, collection: str, fields: List[str]) -> bool:
+    """
+    Whether a leading $match on `fields` can use an index of the catalog: one whose first key is among
+    the fields, the text index for a $text match, or the _id index. An $or ("$or:field|field") is backed
+    when every branch is.
+    """
+    if "_id" in fields:
+        return True
+    for field in fields:
+        if field.startswith("$or:"):
+            branches = field.removeprefix("$or:").split("|")
+            if all(is_index_backed(database_name, collection, [branch]) for branch in branches):
+                return True
+        elif field.startswith("$and:"):
+            if is_index_backed(database_name, collection, field.removeprefix("$and:").split("|")):
+                return True
+    for keys in index_catalog.get(database_name, {}).get(collection, []):
+        if "$text" in fields and any(direction == TEXT for _, direction in keys):
+            return True
+        if keys[0][0] in fields and keys[0][1] != TEXT:
+            return True
+    return False
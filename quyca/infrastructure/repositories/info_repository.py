@@ -1,6 +1,11 @@
+import time
+
+from quyca.config import settings
 from quyca.domain.constants.institutions import institutions_list
 from quyca.infrastructure.mongo import database
 
+db_update_state: dict = {"db_update": None, "checked_at": 0.0}
+
 
 def get_last_db_update() -> int:
     doc = database["log"].find_one(sort=[("time", -1)], projection={"time": 1})
@@ -11,6 +16,19 @@ def get_last_db_update() -> int:
     return 0
 
 
+def get_current_db_update() -> int:
+    """
+    Last db update, read from the log collection at most once every DB_UPDATE_CHECK_SECONDS.
+
+    Precomputed data is tagged with this value, so a new ETL run invalidates it once the check expires.
+    """
+    now = time.monotonic()
+    if db_update_state["db_update"] is None or now - db_update_state["checked_at"] >= settings.DB_UPDATE_CHECK_SECONDS:
+        db_update_state["db_update"] = get_last_db_update()
+        db_update_state["checked_at"] = now
+    return int(db_update_state["db_update"])
+
+
 def get_entity_count(entity: str, affiliation_type: str | None = None) -> int:
     if affiliation_type:
         if affiliation_type == "institution":
@@ -0,0 +1,81 @@
+from contextvars import ContextVar
+from typing import Any, Callable, Iterable, TypeVar
+
+from bson import ObjectId
+
+from quyca.domain.models.affiliation_model import Affiliation
+from quyca.domain.models.person_model import Person
+from quyca.domain.models.source_model import Source
+from quyca.infrastructure.mongo import database
+
+Entity = TypeVar("Entity")
+
+loader_cache: ContextVar[dict[str, dict] | None] = ContextVar("loader_cache", default=None)
+
+
+def start_loader_cache() -> None:
+    """
+    Starts the cache of the entities loaded during a request. Entities referenced by the documents of the
+    request (authors, relations, sources) are loaded in one $in query per collection with minimal projections,
+    and later lookups of the same ids, found or not, are answered from the cache until clear_loader_cache.
+    """
+    loader_cache.set({"person": {}, "affiliations": {}, "sources": {}})
+
+
+def clear_loader_cache(*args: Any) -> None:
+    loader_cache.set(None)
+
+
+def get_persons_by_ids(person_ids: Iterable[str]) -> dict[str, Person]:
+    """
+    Returns the persons with their external_ids by id. Ids of the previous ObjectId format are matched
+    against `_id_old`, like person_repository.get_person_by_id.
+    """
+
+    def find_persons(ids: list[str]) -> Iterable[tuple[str, Person]]:
+        old_ids = [ObjectId(person_id) for person_id in ids if ObjectId.is_valid(person_id)]
+        query = {"$or": [{"_id": {"$in": ids}}, {"_id_old": {"$in": old_ids}}]} if old_ids else {"_id": {"$in": ids}}
+        for person in database["person"].find(query, {"_id": 1, "_id_old": 1, "full_name": 1, "external_ids": 1}):
+            loaded_person = Person(**person)
+            yield str(person["_id"]), loaded_person
+            if person.get("_id_old"):
+                yield str(person["_id_old"]), loaded_person
+
+    return load_entities("person", person_ids, find_persons)
+
+
+def get_affiliations_by_ids(affiliation_ids: Iterable[str]) -> dict[str, Affiliation]:
+    def find_affiliations(ids: list[str]) -> Iterable[tuple[str, Affiliation]]:
+        for affiliation in database["affiliations"].find({"_id": {"$in": ids}}, {"_id": 1, "external_urls": 1}):
+            yield str(affiliation["_id"]), Affiliation(**affiliation)
+
+    return load_entities("affiliations", affiliation_ids, find_affiliations)
+
+
+def get_sources_by_ids(source_ids: Iterable[str]) -> dict[str, Source]:
+    def find_sources(ids: list[str]) -> Iterable[tuple[str, Source]]:
+        object_ids = [ObjectId(source_id) for source_id in ids if ObjectId.is_valid(source_id)]
+        for source in database["sources"].find(
+            {"_id": {"$in": object_ids}}, {"_id": 1, "external_ids": 1, "ranking": 1}
+        ):
+            yield str(source["_id"]), Source(**source)
+
+    return load_entities("sources", source_ids, find_sources)
+
+
+def load_entities(
+    collection: str, ids: Iterable[str], find_entities: Callable[[list[str]], Iterable[tuple[str, Entity]]]
+) -> dict[str, Entity]:
+    """
+    Answers the ids already loaded in the request from the cache and finds the rest in a single query.
+    Without a request cache (commands, tests) the ids are still loaded together, but not memoized.
+    """
+    cache = loader_cache.get()
+    entities: dict[str, Any] = cache[collection] if cache is not None else {}
+    ids = list(dict.fromkeys(str(entity_id) for entity_id in ids if entity_id))
+    missing_ids = [entity_id for entity_id in ids if entity_id not in entities]
+    if missing_ids:
+        found = dict(find_entities(missing_ids))
+        for entity_id in missing_ids:
+            entities[entity_id] = found.get(entity_id)
+    return {entity_id: entities[entity_id] for entity_id in ids if entities[entity_id] is not None}
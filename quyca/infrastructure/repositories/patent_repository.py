@@ -1,4 +1,4 @@
-from typing import Any, Dict, Generator, List, Tuple
+from typing import Generator, Tuple
 
 from bson import ObjectId
 
@@ -17,64 +17,48 @@ def get_patent_by_id(patent_id: str) -> Patent:
     return Patent(**patent)
 
 
-def get_patents_by_affiliation(
-    affiliation_id: str,
-    query_params: QueryParams,
-    pipeline_params: dict | None = None,
-) -> Generator:
-    if pipeline_params is None:
-        pipeline_params = {}
-    pipeline = [
-        {
-            "$match": {
-                "authors.affiliations.id": affiliation_id,
-            },
-        },
-    ]
-    if sort := query_params.sort:
-        base_repository.set_sort(sort, pipeline)
-    base_repository.set_pagination(pipeline, query_params)
-    base_repository.set_project(pipeline, pipeline_params.get("project"))
-    cursor = database["patents"].aggregate(pipeline)
-    return patent_generator.get(cursor)
+def get_patents_page_by_affiliation(
+    affiliation_id: str, query_params: QueryParams, pipeline_params: dict | None = None
+) -> Tuple[Generator, int, str | None]:
+    pipeline = get_patents_by_affiliation_pipeline(affiliation_id)
+    return get_patents_page(pipeline, query_params, pipeline_params)
 
 
-def get_patents_count_by_affiliation(affiliation_id: str) -> int:
-    pipeline = get_patents_by_affiliation_pipeline(affiliation_id)
-    pipeline += [{"$count": "total"}]
-    return next(database["patents"].aggregate(pipeline), {"total": 0}).get("total", 0)
+def get_patents_page_by_person(
+    person_id: str, query_params: QueryParams, pipeline_params: dict | None = None
+) -> Tuple[Generator, int, str | None]:
+    pipeline = [{"$match": {"authors.id": person_id}}]
+    return get_patents_page(pipeline, query_params, pipeline_params)
 
 
-def get_patents_by_person(person_id: str, query_params: QueryParams, pipeline_params: dict | None = None) -> Generator:
+def get_patents_page(
+    pipeline: list, query_params: QueryParams, pipeline_params: dict | None = None
+) -> Tuple[Generator, int, str | None]:
     if pipeline_params is None:
         pipeline_params = {}
-    pipeline = [
-        {"$match": {"authors.id": person_id}},
-    ]
+    page_stages: list = []
     if sort := query_params.sort:
-        base_repository.set_sort(sort, pipeline)
-    base_repository.set_pagination(pipeline, query_params)
-    base_repository.set_project(pipeline, pipeline_params.get("project"))
-    cursor = database["patents"].aggregate(pipeline)
-    return patent_generator.get(cursor)
-
-
-def get_patents_count_by_person(person_id: str) -> int:
-    pipeline: List[Dict[str, Any]] = [{"$match": {"authors.id": person_id}}, {"$count": "total"}]
-    result = next(database["patents"].aggregate(pipeline), {"total": 0})
-    return result.get("total", 0)
+        base_repository.set_sort(sort, page_stages)
+    base_repository.set_pagination(page_stages, query_params)
+    base_repository.set_project(page_stages, pipeline_params.get("project"))
+    patents, total_results, next_cursor = base_repository.get_page_and_total(
+        "patents", pipeline, page_stages, query_params
+    )
+    return patent_generator.get(patents), total_results, next_cursor
 
 
-def search_patents(query_params: QueryParams, pipeline_params: dict | None = None) -> Tuple[Generator, int]:
+def search_patents(query_params: QueryParams, pipeline_params: dict | None = None) -> Tuple[Generator, int, str | None]:
     pipeline = [{"$match": {"$text": {"$search": query_params.keywords}}}] if query_params.keywords else []
     base_repository.set_search_end_stages(pipeline, query_params, pipeline_params)
-    patents = database["patents"].aggregate(pipeline)
+    patents, next_cursor = base_repository.get_page_documents(
+        database["patents"].aggregate(pipeline), pipeline, query_params
+    )
     count_pipeline = [{"$match": {"$text": {"$search": query_params.keywords}}}] if query_params.keywords else []
     count_pipeline += [
         {"$count": "total_results"},  # type: ignore
     ]
     total_results = next(database["patents"].aggregate(count_pipeline), {"total_results": 0}).get("total_results", 0)
-    return patent_generator.get(patents), total_results
+    return patent_generator.get(patents), total_results, next_cursor
 
 
 def get_patents_by_affiliation_pipeline(affiliation_id: str) -> list:
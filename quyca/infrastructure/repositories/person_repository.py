@@ -85,7 +85,7 @@ def get_persons_by_affiliation(affiliation_id: str) -> Generator:
     return person_generator.get(cursor)
 
 
-def search_persons(query_params: QueryParams, pipeline_params: dict | None = None) -> Tuple[Generator, int]:
+def search_persons(query_params: QueryParams, pipeline_params: dict | None = None) -> Tuple[Generator, int, str | None]:
     if pipeline_params is None:
         pipeline_params = {}
     pipeline: List[Dict[str, Any]] = []
@@ -129,7 +129,9 @@ def search_persons(query_params: QueryParams, pipeline_params: dict | None = Non
     ]
 
     base_repository.set_search_end_stages(pipeline, query_params, pipeline_params)
-    persons = database["person"].aggregate(pipeline)
+    persons, next_cursor = base_repository.get_page_documents(
+        database["person"].aggregate(pipeline), pipeline, query_params
+    )
 
     count_pipeline: List[Dict[str, Any]] = []
     if query_params.keywords:
@@ -138,4 +140,4 @@ def search_persons(query_params: QueryParams, pipeline_params: dict | None = Non
         {"$count": "total_results"},
     ]
     total_results = next(database["person"].aggregate(count_pipeline), {"total_results": 0})["total_results"]
-    return person_generator.get(persons), total_results
+    return person_generator.get(persons), total_results, next_cursor
@@ -0,0 +1,41 @@
+from datetime import datetime, timezone
+
+from pymongo.errors import PyMongoError
+from sentry_sdk import capture_exception
+
+from quyca.infrastructure.mongo import calculations_database
+
+
+def get_cached_plot(key: str, db_update: int) -> str | None:
+    try:
+        document = calculations_database["plots_cache"].find_one({"_id": key, "db_update": db_update}, {"plot": 1})
+    except PyMongoError as e:
+        capture_exception(e)
+        return None
+    if not document:
+        return None
+    plot: str = document["plot"]
+    return plot
+
+
+def save_cached_plot(key: str, entity: str, entity_id: str, plot_name: str, db_update: int, plot: str) -> None:
+    document = {
+        "entity": entity,
+        "entity_id": entity_id,
+        "plot_name": plot_name,
+        "db_update": db_update,
+        "plot": plot,
+        "updated_at": datetime.now(timezone.utc),
+    }
+    try:
+        calculations_database["plots_cache"].replace_one({"_id": key}, document, upsert=True)
+    except PyMongoError as e:
+        capture_exception(e)
+
+
+def delete_outdated_plots(db_update: int) -> int:
+    try:
+        return calculations_database["plots_cache"].delete_many({"db_update": {"$ne": db_update}}).deleted_count
+    except PyMongoError as e:
+        capture_exception(e)
+        return 0
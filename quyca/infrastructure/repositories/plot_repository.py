@@ -3,11 +3,13 @@ from typing import Any, Dict, Generator, List, Tuple
 from bson import ObjectId
 from pymongo.command_cursor import CommandCursor
 
+from quyca.domain.constants.plot_specs import plot_specs
 from quyca.domain.models.base_model import QueryParams
 from quyca.infrastructure.generators import work_generator
 from quyca.infrastructure.mongo import database, calculations_database
+from quyca.infrastructure.repositories import base_repository
 from quyca.infrastructure.repositories import work_repository
-from quyca.infrastructure.repositories import affiliation_repository
+from quyca.infrastructure.repositories import hierarchy_repository
 
 
 def get_affiliations_scienti_works_count_by_institution(
@@ -570,106 +572,117 @@ def get_annual_scimago_quartile_by_source(source_id: str) -> CommandCursor:
     return database["sources"].aggregate(pipeline)
 
 
-def get_products_by_database_by_affiliation(affiliation_id: str, query_params: QueryParams) -> dict:
+def get_works_plot_buckets_by_affiliation(affiliation_id: str, plot: str, query_params: QueryParams) -> list:
     pipeline: list[dict[str, Any]] = [{"$match": {"authors.affiliations.id": affiliation_id}}]
-
-    work_repository.set_product_filters(pipeline, query_params)
-
-    return {
-        "minciencias": count_sources_affiliation(pipeline, ["minciencias"]),
-        "openalex": count_sources_affiliation(pipeline, ["openalex"]),
-        "scholar": count_sources_affiliation(pipeline, ["scholar"]),
-        "scienti": count_sources_affiliation(pipeline, ["scienti"]),
-        "scienti_minciencias": count_sources_affiliation(pipeline, ["scienti", "minciencias"]),
-        "scienti_openalex": count_sources_affiliation(pipeline, ["scienti", "openalex"]),
-        "scienti_scholar": count_sources_affiliation(pipeline, ["scienti", "scholar"]),
-        "minciencias_openalex": count_sources_affiliation(pipeline, ["minciencias", "openalex"]),
-        "minciencias_scholar": count_sources_affiliation(pipeline, ["minciencias", "scholar"]),
-        "openalex_scholar": count_sources_affiliation(pipeline, ["openalex", "scholar"]),
-        "scienti_minciencias_openalex": count_sources_affiliation(pipeline, ["scienti", "minciencias", "openalex"]),
-        "scienti_minciencias_scholar": count_sources_affiliation(pipeline, ["scienti", "minciencias", "scholar"]),
-        "scienti_openalex_scholar": count_sources_affiliation(pipeline, ["scienti", "openalex", "scholar"]),
-        "minciencias_openalex_scholar": count_sources_affiliation(pipeline, ["minciencias", "openalex", "scholar"]),
-        "minciencias_openalex_scholar_scienti": count_sources_affiliation(
-            pipeline, ["minciencias", "openalex", "scholar", "scienti"]
-        ),
-    }
+    return get_works_plot_buckets(pipeline, plot, query_params)
 
 
-def get_products_by_database_by_person(person_id: str, query_params: QueryParams) -> dict:
+def get_works_plot_buckets_by_person(person_id: str, plot: str, query_params: QueryParams) -> list:
     pipeline: list[dict[str, Any]] = [{"$match": {"authors.id": person_id}}]
+    return get_works_plot_buckets(pipeline, plot, query_params)
 
-    work_repository.set_product_filters(pipeline, query_params)
 
-    return {
-        "minciencias": count_sources_person(pipeline, person_id, ["minciencias"]),
-        "openalex": count_sources_person(pipeline, person_id, ["openalex"]),
-        "scholar": count_sources_person(pipeline, person_id, ["scholar"]),
-        "scienti": count_sources_person(pipeline, person_id, ["scienti"]),
-        "scienti_minciencias": count_sources_person(pipeline, person_id, ["scienti", "minciencias"]),
-        "scienti_openalex": count_sources_person(pipeline, person_id, ["scienti", "openalex"]),
-        "scienti_scholar": count_sources_person(pipeline, person_id, ["scienti", "scholar"]),
-        "minciencias_openalex": count_sources_person(pipeline, person_id, ["minciencias", "openalex"]),
-        "minciencias_scholar": count_sources_person(pipeline, person_id, ["minciencias", "scholar"]),
-        "openalex_scholar": count_sources_person(pipeline, person_id, ["openalex", "scholar"]),
-        "scienti_minciencias_openalex": count_sources_person(
-            pipeline, person_id, ["scienti", "minciencias", "openalex"]
-        ),
-        "scienti_minciencias_scholar": count_sources_person(pipeline, person_id, ["scienti", "minciencias", "scholar"]),
-        "scienti_openalex_scholar": count_sources_person(pipeline, person_id, ["scienti", "openalex", "scholar"]),
-        "minciencias_openalex_scholar": count_sources_person(
-            pipeline, person_id, ["minciencias", "openalex", "scholar"]
-        ),
-        "minciencias_openalex_scholar_scienti": count_sources_person(
-            pipeline, person_id, ["minciencias", "openalex", "scholar", "scienti"]
-        ),
-    }
+def get_works_plot_buckets(pipeline: list, plot: str, query_params: QueryParams) -> list:
+    """
+    Compiles the spec of the plot on top of the entity pipeline and returns only the final buckets.
 
+    Parameters:
+    pipeline (list): Pipeline starting with the match of the entity works.
+    plot (str): Name of the plot in plot_specs.
+    query_params (QueryParams): Product filters of the request.
 
-def pipeline_to_filter_for_affiliation(pipeline: list[dict[str, Any]], sources: list[str]) -> dict[str, Any]:
-    filters: list[dict[str, Any]] = []
-    valid_sources = ["minciencias", "openalex", "scholar", "scienti"]
-
-    for stage in pipeline:
-        if "$match" in stage:
-            filters.append(stage["$match"])
+    Returns:
+    list: Buckets of the plot, already folded by the database.
+    """
+    spec = plot_specs[plot]
+    work_repository.set_product_filters(pipeline, query_params)
+    base_repository.set_match(pipeline, spec.get("match"))
+    pipeline += spec["stages"]
+    return list(database["works"].aggregate(pipeline, allowDiskUse=True))
+
+
+PRODUCTS_BY_DATABASE_SOURCES = {"scienti": 1, "minciencias": 2, "openalex": 4, "scholar": 8}
+
+PRODUCTS_BY_DATABASE_REGIONS = {
+    "minciencias": ["minciencias"],
+    "openalex": ["openalex"],
+    "scholar": ["scholar"],
+    "scienti": ["scienti"],
+    "scienti_minciencias": ["scienti", "minciencias"],
+    "scienti_openalex": ["scienti", "openalex"],
+    "scienti_scholar": ["scienti", "scholar"],
+    "minciencias_openalex": ["minciencias", "openalex"],
+    "minciencias_scholar": ["minciencias", "scholar"],
+    "openalex_scholar": ["openalex", "scholar"],
+    "scienti_minciencias_openalex": ["scienti", "minciencias", "openalex"],
+    "scienti_minciencias_scholar": ["scienti", "minciencias", "scholar"],
+    "scienti_openalex_scholar": ["scienti", "openalex", "scholar"],
+    "minciencias_openalex_scholar": ["minciencias", "openalex", "scholar"],
+    "minciencias_openalex_scholar_scienti": ["minciencias", "openalex", "scholar", "scienti"],
+}
 
-    expr_filter = {
-        "$expr": {
-            "$setEquals": [
-                {"$setIntersection": ["$updated.source", valid_sources]},
-                sources,
-            ]
-        }
-    }
 
-    filters.append(expr_filter)
-    return {"$and": filters} if filters else expr_filter
+def get_products_by_database_by_affiliation(affiliation_id: str, query_params: QueryParams) -> dict:
+    pipeline: list[dict[str, Any]] = [{"$match": {"authors.affiliations.id": affiliation_id}}]
+    work_repository.set_product_filters(pipeline, query_params)
+    return get_products_by_database_regions(get_sources_masks_count(pipeline), single_source_containment=False)
 
 
-def pipeline_to_filter_for_person(pipeline: list[dict[str, Any]], person_id: str, sources: list[str]) -> dict[str, Any]:
-    filters: list[dict[str, Any]] = [{"authors.id": person_id}]
-    valid_sources = ["minciencias", "openalex", "scholar", "scienti"]
+def get_products_by_database_by_person(person_id: str, query_params: QueryParams) -> dict:
+    pipeline: list[dict[str, Any]] = [{"$match": {"authors.id": person_id}}]
+    work_repository.set_product_filters(pipeline, query_params)
+    return get_products_by_database_regions(get_sources_masks_count(pipeline), single_source_containment=True)
 
-    if len(sources) == 1:
-        filters.append({"updated.source": sources[0]})
-    else:
-        filters.append({"$expr": {"$setEquals": [{"$setIntersection": ["$updated.source", valid_sources]}, sources]}})
-    for stage in pipeline:
-        if "$match" in stage:
-            filters.append(stage["$match"])
 
-    return {"$and": filters}
+def get_sources_masks_count(pipeline: list[dict[str, Any]]) -> dict[int, int]:
+    """
+    Counts the works of the pipeline by the set of databases they come from.
 
+    Every work gets a 4 bit mask with one bit per source in PRODUCTS_BY_DATABASE_SOURCES,
+    so a single scan returns at most 16 groups from which every region of the Venn is derived.
+    """
+    pipeline += [
+        {
+            "$project": {
+                "_id": 0,
+                "sources": {
+                    "$setIntersection": [
+                        {"$ifNull": ["$updated.source", []]},
+                        list(PRODUCTS_BY_DATABASE_SOURCES.keys()),
+                    ]
+                },
+            }
+        },
+        {
+            "$group": {
+                "_id": {
+                    "$add": [
+                        {"$cond": [{"$in": [source, "$sources"]}, bit, 0]}
+                        for source, bit in PRODUCTS_BY_DATABASE_SOURCES.items()
+                    ]
+                },
+                "count": {"$sum": 1},
+            }
+        },
+    ]
+    return {int(group["_id"]): int(group["count"]) for group in database["works"].aggregate(pipeline)}
 
-def count_sources_affiliation(pipeline: list[dict[str, Any]], sources: list[str]) -> int:
-    filter_ = pipeline_to_filter_for_affiliation(pipeline, sources)
-    return int(database["works"].count_documents(filter_))
 
+def get_products_by_database_regions(masks_count: dict[int, int], single_source_containment: bool) -> dict:
+    """
+    Derives the regions of the products by database Venn from the works count by sources mask.
 
-def count_sources_person(pipeline: list[dict[str, Any]], person_id: str, sources: list[str]) -> int:
-    filter_ = pipeline_to_filter_for_person(pipeline, person_id, sources)
-    return int(database["works"].count_documents(filter_))
+    Regions count the works whose sources are exactly the ones of the region. With single_source_containment
+    the single source regions count every work coming from that source instead, as the person plot does.
+    """
+    regions = {}
+    for region, sources in PRODUCTS_BY_DATABASE_REGIONS.items():
+        region_mask = sum(PRODUCTS_BY_DATABASE_SOURCES[source] for source in sources)
+        if single_source_containment and len(sources) == 1:
+            regions[region] = sum(count for mask, count in masks_count.items() if mask & region_mask)
+        else:
+            regions[region] = masks_count.get(region_mask, 0)
+    return regions
 
 
 def project_pipeline_params_for_filter() -> Dict[str, List[str]]:
@@ -692,13 +705,11 @@ def project_pipeline_params_for_filter() -> Dict[str, List[str]]:
 
 
 def affiliation_ids_for_institution(institution_id: str, relation_type: str) -> List[str]:
-    affiliations = affiliation_repository.get_affiliations_by_institution(institution_id, relation_type)
-    return [affiliation.id for affiliation in affiliations] if affiliations else []
+    return hierarchy_repository.get_child_ids(institution_id, relation_type)
 
 
 def group_ids_for_faculty_or_department(affiliation_id: str) -> List[str]:
-    groups = affiliation_repository.get_groups_by_faculty_or_department(affiliation_id)
-    return [group.id for group in groups] if groups else []
+    return hierarchy_repository.get_group_ids(affiliation_id)
 
 
 def build_project_stage(dynamic_fields: list[str]) -> dict:
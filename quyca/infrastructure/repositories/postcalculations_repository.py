@@ -1,5 +1,20 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from typing import Any, Dict, List
-from quyca.infrastructure.mongo import database
+
+from bson import ObjectId
+from pymongo import ReplaceOne
+
+from quyca.config import settings
+from quyca.domain.constants.indexes import SORT_KEYS_INDEXES
+from quyca.infrastructure.mongo import database, calculations_database
+from quyca.infrastructure.repositories import base_repository, index_repository, info_repository, work_repository
+
+SOURCES_PROFILE_BATCH_SIZE = 200
+SOURCES_PROFILE_WORKERS = 4
+SOURCES_PROFILE_TOPICS_THRESHOLD = 0.02
+
+postcalculations_done: dict = {"db_update": None, "names": set()}
 
 
 def set_works_authors_affiliations_country() -> None:
@@ -356,3 +371,289 @@ def set_works_authors_ranking() -> None:
         },
     ]
     database["works"].aggregate(pipeline)
+
+
+def set_works_sort_keys() -> None:
+    set_sort_keys("works")
+    create_sort_keys_indexes("works")
+    set_postcalculation_done("works_sort_keys")
+
+
+def set_sources_sort_keys() -> None:
+    set_sort_keys("sources")
+    create_sort_keys_indexes("sources")
+    set_postcalculation_done("sources_sort_keys")
+
+
+def set_sort_keys(collection: str, match: dict | None = None) -> None:
+    """
+    Stores the sort keys of the documents of `collection` selected by `match`, all of them by default.
+    """
+    pipeline: List[Dict[str, Any]] = [{"$match": match}] if match else []
+    pipeline += [
+        {"$project": get_sort_keys_expressions(collection)},
+        {"$merge": {"into": collection, "whenMatched": "merge", "whenNotMatched": "fail"}},
+    ]
+    database[collection].aggregate(pipeline)
+
+
+def get_sort_keys_expressions(collection: str) -> Dict[str, dict]:
+    if collection == "sources":
+        return {
+            "citations_count_openalex": base_repository.get_citations_count_openalex_expression(),
+            "sort_name": base_repository.get_sort_name_expression(),
+        }
+    return {
+        "sort_title": base_repository.get_sort_title_expression(),
+        "sort_year": base_repository.get_sort_year_expression(),
+    }
+
+
+def set_works_source_issn() -> None:
+    set_source_issn()
+    set_postcalculation_done("works_source_issn")
+
+
+def set_source_issn(match: dict | None = None) -> None:
+    """
+    Stores `source.issn_l` and `source.issn` on the works selected by `match`, all of them by default.
+    """
+    pipeline: List[Dict[str, Any]] = [{"$match": match}] if match else []
+    pipeline += work_repository.get_issn_stages()
+    pipeline += [
+        {"$project": {"source": 1}},
+        {"$merge": {"into": "works", "whenMatched": "merge", "whenNotMatched": "fail"}},
+    ]
+    database["works"].aggregate(pipeline)
+
+
+def set_sources_profile() -> None:
+    """
+    Stores in the calculations database a profile per source with its works count, the share of
+    every primary topic among its works and the topics over the 2% threshold shown by the source.
+
+    The job is incremental: sources already profiled for the last db update are skipped, so an
+    interrupted run continues where it stopped. Batches of sources are profiled in parallel.
+    """
+    db_update = info_repository.get_last_db_update()
+    profiled_ids = set(calculations_database["sources_profile"].distinct("_id", {"db_update": db_update}))
+    source_ids = [
+        source["_id"] for source in database["sources"].find({}, {"_id": 1}) if source["_id"] not in profiled_ids
+    ]
+    batches = [
+        source_ids[start : start + SOURCES_PROFILE_BATCH_SIZE]
+        for start in range(0, len(source_ids), SOURCES_PROFILE_BATCH_SIZE)
+    ]
+    with ThreadPoolExecutor(max_workers=SOURCES_PROFILE_WORKERS) as executor:
+        list(executor.map(lambda batch: set_sources_profile_batch(batch, db_update), batches))
+    calculations_database["sources_profile"].delete_many({"db_update": {"$ne": db_update}})
+    set_postcalculation_done("sources_profile")
+
+
+def set_sources_profile_batch(source_ids: List[ObjectId], db_update: int) -> None:
+    profiles = compute_sources_profiles(source_ids)
+    empty_profile = {"works_count": 0, "topics_shares": [], "topics": []}
+    operations = [
+        ReplaceOne(
+            {"_id": source_id},
+            {**profiles.get(str(source_id), empty_profile), "_id": source_id, "db_update": db_update},
+            upsert=True,
+        )
+        for source_id in source_ids
+    ]
+    if operations:
+        calculations_database["sources_profile"].bulk_write(operations, ordered=False)
+
+
+def compute_sources_profiles(source_ids: List[ObjectId]) -> Dict[str, Dict[str, Any]]:
+    """
+    Computes the profile of each source from its works in a single aggregation over all the sources.
+    Works without a primary topic count for the works count but not for any topic. Sources without works
+    are left out.
+    """
+    if not source_ids:
+        return {}
+    topic_fields = {field: f"$$topic.topic.{field}" for field in ["id", "display_name", "subfield", "field", "domain"]}
+    pipeline: List[Dict[str, Any]] = [
+        {"$match": {"source.id": {"$in": source_ids}}},
+        {"$project": {"_id": 0, "source.id": 1, "primary_topic": 1}},
+        {
+            "$group": {
+                "_id": {
+                    "source_id": "$source.id",
+                    "has_topic": {"$ne": [{"$ifNull": ["$primary_topic", None]}, None]},
+                    "topic_id": "$primary_topic.id",
+                },
+                "count": {"$sum": 1},
+                "topic": {"$first": "$primary_topic"},
+            }
+        },
+        {
+            "$group": {
+                "_id": "$_id.source_id",
+                "works_count": {"$sum": "$count"},
+                "topics": {"$push": {"has_topic": "$_id.has_topic", "count": "$count", "topic": "$topic"}},
+            }
+        },
+        {"$set": {"topics": {"$filter": {"input": "$topics", "as": "topic", "cond": "$$topic.has_topic"}}}},
+        {
+            "$project": {
+                "works_count": 1,
+                "topics_shares": {
+                    "$map": {
+                        "input": "$topics",
+                        "as": "topic",
+                        "in": {
+                            **topic_fields,
+                            "count": "$$topic.count",
+                            "share": {"$divide": ["$$topic.count", "$works_count"]},
+                        },
+                    }
+                },
+                "topics": {
+                    "$map": {
+                        "input": {
+                            "$filter": {
+                                "input": "$topics",
+                                "as": "topic",
+                                "cond": {
+                                    "$gte": [
+                                        "$$topic.count",
+                                        {"$multiply": ["$works_count", SOURCES_PROFILE_TOPICS_THRESHOLD]},
+                                    ]
+                                },
+                            }
+                        },
+                        "as": "topic",
+                        "in": topic_fields,
+                    }
+                },
+            }
+        },
+    ]
+    profiles = {}
+    for profile in database["works"].aggregate(pipeline, allowDiskUse=True):
+        profile["topics_shares"].sort(key=lambda topic: topic["count"], reverse=True)
+        profiles[str(profile.pop("_id"))] = profile
+    return profiles
+
+
+def set_affiliations_groups() -> None:
+    """
+    Stores in the calculations database the groups of every faculty and department: the groups of its
+    institution that have at least one member affiliated to it. It is the mapping computed live by
+    affiliation_repository.get_groups_by_faculty_or_department, for all of them in one pass over person.
+    """
+    db_update = info_repository.get_last_db_update()
+    education_relation = {
+        "$arrayElemAt": [
+            {
+                "$filter": {
+                    "input": {"$ifNull": ["$unit.relations", []]},
+                    "as": "relation",
+                    "cond": {"$in": ["Education", {"$ifNull": ["$$relation.types.type", []]}]},
+                }
+            },
+            0,
+        ]
+    }
+    pipeline: List[Dict[str, Any]] = [
+        {"$match": {"affiliations.types.type": "group"}},
+        {
+            "$project": {
+                "_id": 0,
+                "unit_id": "$affiliations.id",
+                "groups": {
+                    "$filter": {
+                        "input": "$affiliations",
+                        "as": "affiliation",
+                        "cond": {"$in": ["group", {"$ifNull": ["$$affiliation.types.type", []]}]},
+                    }
+                },
+            }
+        },
+        {"$unwind": "$unit_id"},
+        {"$unwind": "$groups"},
+        {
+            "$group": {
+                "_id": {"unit_id": "$unit_id", "group_id": "$groups.id"},
+                "name": {"$first": "$groups.name"},
+                "relations_ids": {"$addToSet": {"$ifNull": ["$groups.relations.id", []]}},
+            }
+        },
+        {
+            "$lookup": {
+                "from": "affiliations",
+                "localField": "_id.unit_id",
+                "foreignField": "_id",
+                "as": "unit",
+                "pipeline": [
+                    {"$match": {"types.type": {"$in": ["faculty", "department"]}}},
+                    {"$project": {"relations.id": 1, "relations.types.type": 1}},
+                ],
+            }
+        },
+        {"$unwind": "$unit"},
+        {
+            "$project": {
+                "name": 1,
+                "institution_id": {"$getField": {"field": "id", "input": education_relation}},
+                "relations_ids": {
+                    "$reduce": {
+                        "input": "$relations_ids",
+                        "initialValue": [],
+                        "in": {"$setUnion": ["$$value", {"$cond": [{"$isArray": "$$this"}, "$$this", ["$$this"]]}]},
+                    }
+                },
+            }
+        },
+        {"$match": {"$expr": {"$in": ["$institution_id", "$relations_ids"]}}},
+        {"$group": {"_id": "$_id.unit_id", "groups": {"$push": {"id": "$_id.group_id", "name": "$name"}}}},
+        {"$set": {"db_update": db_update}},
+        {
+            "$merge": {
+                "into": {"db": settings.MONGO_CALCULATIONS_DATABASE, "coll": "affiliations_groups"},
+                "whenMatched": "replace",
+                "whenNotMatched": "insert",
+            }
+        },
+    ]
+    database["person"].aggregate(pipeline, allowDiskUse=True)
+    calculations_database["affiliations_groups"].delete_many({"db_update": {"$ne": db_update}})
+    set_postcalculation_done("affiliations_groups")
+
+
+def create_sort_keys_indexes(collection: str) -> None:
+    index_repository.create_indexes("main", collection, SORT_KEYS_INDEXES[collection])
+
+
+def has_sort_keys(collection: str) -> bool:
+    return is_postcalculation_done(f"{collection}_sort_keys")
+
+
+def has_source_issn() -> bool:
+    return is_postcalculation_done("works_source_issn")
+
+
+def set_postcalculation_done(name: str) -> None:
+    calculations_database["postcalculations"].replace_one(
+        {"_id": name},
+        {"db_update": info_repository.get_last_db_update(), "updated_at": datetime.now(timezone.utc)},
+        upsert=True,
+    )
+    postcalculations_done["db_update"] = None
+
+
+def is_postcalculation_done(name: str) -> bool:
+    """
+    Whether a postcalculation already ran on the data of the current db update.
+
+    A new ETL run rewrites the collections and drops the stored fields, so markers of older db
+    updates are ignored. Markers are read once per db update and worker.
+    """
+    db_update = info_repository.get_current_db_update()
+    if postcalculations_done["db_update"] != db_update:
+        markers = calculations_database["postcalculations"].find({"db_update": db_update}, {"_id": 1})
+        postcalculations_done["names"] = {marker["_id"] for marker in markers}
+        postcalculations_done["db_update"] = db_update
+    return name in postcalculations_done["names"]
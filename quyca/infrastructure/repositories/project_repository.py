@@ -1,4 +1,4 @@
-from typing import Any, Dict, Generator, List, Tuple
+from typing import Generator, Tuple
 
 from bson import ObjectId
 
@@ -17,64 +17,50 @@ def get_project_by_id(project_id: str) -> Project:
     return Project(**project)
 
 
-def get_projects_by_affiliation(
-    affiliation_id: str,
-    query_params: QueryParams,
-    pipeline_params: dict | None = None,
-) -> Generator:
-    if pipeline_params is None:
-        pipeline_params = {}
-    pipeline = [
-        {
-            "$match": {
-                "authors.affiliations.id": affiliation_id,
-            },
-        },
-    ]
-    if sort := query_params.sort:
-        base_repository.set_sort(sort, pipeline)
-    base_repository.set_pagination(pipeline, query_params)
-    base_repository.set_project(pipeline, pipeline_params.get("project"))
-    cursor = database["projects"].aggregate(pipeline)
-    return project_generator.get(cursor)
+def get_projects_page_by_affiliation(
+    affiliation_id: str, query_params: QueryParams, pipeline_params: dict | None = None
+) -> Tuple[Generator, int, str | None]:
+    pipeline = get_projects_by_affiliation_pipeline(affiliation_id)
+    return get_projects_page(pipeline, query_params, pipeline_params)
 
 
-def get_projects_count_by_affiliation(affiliation_id: str) -> int:
-    pipeline = get_projects_by_affiliation_pipeline(affiliation_id)
-    pipeline += [{"$count": "total"}]
-    return next(database["projects"].aggregate(pipeline), {"total": 0}).get("total", 0)
+def get_projects_page_by_person(
+    person_id: str, query_params: QueryParams, pipeline_params: dict | None = None
+) -> Tuple[Generator, int, str | None]:
+    pipeline = [{"$match": {"authors.id": person_id}}]
+    return get_projects_page(pipeline, query_params, pipeline_params)
 
 
-def get_projects_by_person(person_id: str, query_params: QueryParams, pipeline_params: dict | None = None) -> Generator:
+def get_projects_page(
+    pipeline: list, query_params: QueryParams, pipeline_params: dict | None = None
+) -> Tuple[Generator, int, str | None]:
     if pipeline_params is None:
         pipeline_params = {}
-    pipeline = [
-        {"$match": {"authors.id": person_id}},
-    ]
+    page_stages: list = []
     if sort := query_params.sort:
-        base_repository.set_sort(sort, pipeline)
-    base_repository.set_pagination(pipeline, query_params)
-    base_repository.set_project(pipeline, pipeline_params.get("project"))
-    cursor = database["projects"].aggregate(pipeline)
-    return project_generator.get(cursor)
-
-
-def get_projects_count_by_person(person_id: str) -> int:
-    pipeline: List[Dict[str, Any]] = [{"$match": {"authors.id": person_id}}, {"$count": "total"}]
-    result = next(database["projects"].aggregate(pipeline), {"total": 0})
-    return result.get("total", 0)
-
-
-def search_projects(query_params: QueryParams, pipeline_params: dict | None = None) -> Tuple[Generator, int]:
+        base_repository.set_sort(sort, page_stages)
+    base_repository.set_pagination(page_stages, query_params)
+    base_repository.set_project(page_stages, pipeline_params.get("project"))
+    projects, total_results, next_cursor = base_repository.get_page_and_total(
+        "projects", pipeline, page_stages, query_params
+    )
+    return project_generator.get(projects), total_results, next_cursor
+
+
+def search_projects(
+    query_params: QueryParams, pipeline_params: dict | None = None
+) -> Tuple[Generator, int, str | None]:
     pipeline = [{"$match": {"$text": {"$search": query_params.keywords}}}] if query_params.keywords else []
     base_repository.set_search_end_stages(pipeline, query_params, pipeline_params)
-    projects = database["projects"].aggregate(pipeline)
+    projects, next_cursor = base_repository.get_page_documents(
+        database["projects"].aggregate(pipeline), pipeline, query_params
+    )
     count_pipeline = [{"$match": {"$text": {"$search": query_params.keywords}}}] if query_params.keywords else []
     count_pipeline += [
         {"$count": "total_results"},  # type: ignore
     ]
     total_results = next(database["projects"].aggregate(count_pipeline), {"total_results": 0}).get("total_results", 0)
-    return project_generator.get(projects), total_results
+    return project_generator.get(projects), total_results, next_cursor
 
 
 def get_projects_by_affiliation_pipeline(affiliation_id: str) -> list:
@@ -3,6 +3,7 @@ from bson import ObjectId
 
 from infrastructure.mongo import database
 from infrastructure.repositories import base_repository
+from quyca.infrastructure.repositories import calculations_repository, postcalculations_repository
 from infrastructure.generators import source_generator
 from domain.models.source_model import Source
 from domain.exceptions.not_entity_exception import NotEntityException
@@ -30,37 +31,11 @@ def get_source_by_id(source_id: str) -> Source:
     if not source_data:
         raise NotEntityException(f"The source with id {source_id} does not exist.")
 
-    works_count = database["works"].count_documents({"source.id": source_object_id})
-    if works_count == 0:
-        source_data["topics"] = []
-        return Source(**source_data)
-
-    topics_limit = works_count * 0.02
-    pipeline = [
-        {"$match": {"source.id": source_object_id}},
-        {"$project": {"_id": 0, "primary_topic": 1}},
-        {"$match": {"primary_topic": {"$exists": True, "$ne": None}}},
-        {"$group": {"_id": "$primary_topic.id", "count": {"$sum": 1}, "topic": {"$first": "$primary_topic"}}},
-        {"$match": {"count": {"$gte": topics_limit}}},
-        {
-            "$project": {
-                "_id": 0,
-                "id": "$topic.id",
-                "display_name": "$topic.display_name",
-                "subfield": "$topic.subfield",
-                "field": "$topic.field",
-                "domain": "$topic.domain",
-            }
-        },
-    ]
-
-    topics = list(database["works"].aggregate(pipeline))
-    source_data["topics"] = topics
-
+    source_data["topics"] = get_sources_topics([source_object_id]).get(str(source_object_id), [])
     return Source(**source_data)
 
 
-def search_sources(query_params: QueryParams, pipeline_params: dict) -> Tuple[Generator, int]:
+def search_sources(query_params: QueryParams, pipeline_params: dict) -> Tuple[Generator, int, str | None]:
     """
     Parameters:
     -----------
@@ -71,42 +46,23 @@ def search_sources(query_params: QueryParams, pipeline_params: dict) -> Tuple[Ge
 
     Returns:
     --------
-    Tuple[Generator, int]
-        A tuple containing a generator for the search results and the total number of results.
+    Tuple[Generator, int, str | None]
+        A tuple containing a generator for the search results, the total number of results
+        and the cursor of the next page when keyset pagination is requested.
     """
     pipeline: list[dict[str, Any]] = []
     if query_params.keywords:
         pipeline.append({"$match": {"$text": {"$search": query_params.keywords}}})
     set_source_filters(pipeline, query_params)
     base_repository.set_search_end_stages(pipeline, query_params, pipeline_params)
-    raw_sources = database["sources"].aggregate(pipeline)
+    raw_sources, next_cursor = base_repository.get_page_documents(
+        database["sources"].aggregate(pipeline), pipeline, query_params
+    )
 
-    # Topics for each source
     sources = [Source(**source) for source in raw_sources]
+    sources_topics = get_sources_topics([ObjectId(source.id) for source in sources])
     for source in sources:
-        s_id = ObjectId(source.id)
-        works_count = database["works"].count_documents({"source.id": s_id})
-        if works_count == 0:
-            source.topics = []
-            continue
-        topics_limit = works_count * 0.02
-        topic_pipeline = [
-            {"$match": {"source.id": s_id, "primary_topic": {"$exists": True, "$ne": None}}},
-            {"$project": {"_id": 0, "primary_topic": 1}},
-            {"$group": {"_id": "$primary_topic.id", "count": {"$sum": 1}, "topic": {"$first": "$primary_topic"}}},
-            {"$match": {"count": {"$gte": topics_limit}}},
-            {
-                "$project": {
-                    "_id": 0,
-                    "id": "$topic.id",
-                    "display_name": "$topic.display_name",
-                    "subfield": "$topic.subfield",
-                    "field": "$topic.field",
-                    "domain": "$topic.domain",
-                }
-            },
-        ]
-        source.topics = list(database["works"].aggregate(topic_pipeline))
+        source.topics = sources_topics.get(str(source.id), [])
 
     count_pipeline: list[dict[str, Any]] = []
     if query_params.keywords:
@@ -115,7 +71,31 @@ def search_sources(query_params: QueryParams, pipeline_params: dict) -> Tuple[Ge
 
     count_pipeline += [{"$count": "total_results"}]
     total_results = next(database["sources"].aggregate(count_pipeline), {"total_results": 0})["total_results"]
-    return source_generator.generate_sources(sources), total_results
+    return source_generator.generate_sources(sources), total_results, next_cursor
+
+
+def get_sources_topics(source_ids: list[ObjectId]) -> dict[str, list]:
+    """
+    Returns the main topics of each source, the ones that are the primary topic of at least 2% of its works.
+
+    Topics are read from the profiles stored by the sources_profile postcalculation for the current db update,
+    and only the sources without a profile are computed live, all of them in a single aggregation.
+
+    Parameters:
+    -----------
+    source_ids : list[ObjectId]
+        The ids of the sources, usually the sources of a page.
+
+    Returns:
+    --------
+    dict[str, list]
+        The topics of each source by source id. Sources without works are left out.
+    """
+    profiles = calculations_repository.get_sources_profiles(source_ids)
+    missing_ids = [source_id for source_id in source_ids if str(source_id) not in profiles]
+    if missing_ids:
+        profiles.update(postcalculations_repository.compute_sources_profiles(missing_ids))
+    return {source_id: profile["topics"] for source_id, profile in profiles.items()}
 
 
 def get_search_sources_available_filters(query_params: QueryParams) -> dict:
@@ -177,6 +157,10 @@ def get_search_sources_available_filters(query_params: QueryParams) -> dict:
     return available_filters
 
 
+def get_sources_ids() -> list[str]:
+    return [str(source["_id"]) for source in database["sources"].find({}, {"_id": 1})]
+
+
 def set_source_filters(pipeline: list, query_params: QueryParams) -> None:
     set_source_types(pipeline, query_params.source_types)
     set_scimago_quartiles(pipeline, query_params.scimago_quartiles)
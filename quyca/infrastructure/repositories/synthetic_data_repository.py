@@ -0,0 +1,76 @@
+import time
+from typing import Any, Dict, List
+
+from quyca.infrastructure.mongo import database
+
+
+def insert_documents(collection: str, documents: List[Dict[str, Any]]) -> int:
+    if not documents:
+        return 0
+    result = database[collection].insert_many(documents, ordered=False, bypass_document_validation=True)
+    return len(result.inserted_ids)
+
+
+def get_non_empty_collections(collections: List[str]) -> List[str]:
+    return [collection for collection in collections if database[collection].find_one({}, {"_id": 1}) is not None]
+
+
+def drop_collections(collections: List[str]) -> None:
+    for collection in collections:
+        database[collection].drop()
+
+
+def set_products_counts() -> None:
+    """
+    Stores the products_count the ETL keeps on persons, affiliations and sources, counting every work once
+    per entity even when several of its authors share an affiliation.
+    """
+    merge = {"on": "_id", "whenMatched": "merge", "whenNotMatched": "discard"}
+    database["works"].aggregate(
+        [
+            {"$project": {"authors.id": 1}},
+            {"$unwind": "$authors"},
+            {"$group": {"_id": {"work": "$_id", "id": "$authors.id"}}},
+            {"$group": {"_id": "$_id.id", "products_count": {"$sum": 1}}},
+            {"$merge": {"into": "person", **merge}},
+        ],
+        allowDiskUse=True,
+    )
+    database["works"].aggregate(
+        [
+            {"$project": {"ids": "$authors.affiliations.id"}},
+            {"$unwind": "$ids"},
+            {"$unwind": "$ids"},
+            {"$group": {"_id": {"work": "$_id", "id": "$ids"}}},
+            {"$group": {"_id": "$_id.id", "products_count": {"$sum": 1}}},
+            {"$merge": {"into": "affiliations", **merge}},
+        ],
+        allowDiskUse=True,
+    )
+    database["works"].aggregate(
+        [
+            {"$project": {"groups.id": 1}},
+            {"$unwind": "$groups"},
+            {"$group": {"_id": {"work": "$_id", "id": "$groups.id"}}},
+            {"$group": {"_id": "$_id.id", "products_count": {"$sum": 1}}},
+            {"$merge": {"into": "affiliations", **merge}},
+        ],
+        allowDiskUse=True,
+    )
+    database["works"].aggregate(
+        [
+            {"$match": {"source.id": {"$exists": True}}},
+            {"$group": {"_id": "$source.id", "products_count": {"$sum": 1}}},
+            {"$merge": {"into": "sources", **merge}},
+        ],
+        allowDiskUse=True,
+    )
+
+
+def set_db_update() -> int:
+    """
+    Logs a db update, as the ETL does at the end of a run, so precomputed data is tagged with it.
+    """
+    db_update = int(time.time())
+    database["log"].insert_one({"time": db_update, "source": "synthetic"})
+    return db_update
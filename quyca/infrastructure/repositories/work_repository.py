@@ -1,12 +1,13 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any, Generator, Tuple
+from collections import Counter, defaultdict
+from typing import Any, Generator, Iterable, Tuple
 
 from bson import ObjectId
+from pymongo.errors import OperationFailure
 
 from quyca.infrastructure.generators import work_generator
 from quyca.domain.models.base_model import QueryParams
 from quyca.domain.models.work_model import Work
-from quyca.infrastructure.repositories import base_repository
+from quyca.infrastructure.repositories import base_repository, postcalculations_repository
 from quyca.infrastructure.mongo import database
 from quyca.domain.exceptions.not_entity_exception import NotEntityException
 
@@ -43,13 +44,20 @@ def get_works_by_affiliation(
     base_repository.set_match(pipeline, pipeline_params.get("match"))
     set_issn_to_pipeline(pipeline)
     if sort := query_params.sort:
-        base_repository.set_sort(sort, pipeline)
+        base_repository.set_sort(sort, pipeline, "works")
     base_repository.set_pagination(pipeline, query_params)
     base_repository.set_project(pipeline, pipeline_params.get("project"))
     cursor = database["works"].aggregate(pipeline)
     return work_generator.get(cursor)
 
 
+def get_works_page_by_affiliation(
+    affiliation_id: str, query_params: QueryParams, pipeline_params: dict | None = None
+) -> Tuple[Generator, int, str | None]:
+    pipeline = [{"$match": {"authors.affiliations.id": affiliation_id}}]
+    return get_works_page(pipeline, query_params, pipeline_params)
+
+
 def get_works_with_source_by_affiliation(
     affiliation_id: str, query_params: QueryParams, pipeline_params: dict | None = None
 ) -> Generator:
@@ -66,19 +74,6 @@ def get_works_with_source_by_affiliation(
     return work_generator.get(cursor)
 
 
-def get_works_count_by_affiliation(affiliation_id: str, query_params: QueryParams) -> int:
-    pipeline: list[dict[str, Any]] = [
-        {
-            "$match": {
-                "authors.affiliations.id": affiliation_id,
-            },
-        },
-    ]
-    set_product_filters(pipeline, query_params)
-    pipeline += [{"$count": "total"}]
-    return next(database["works"].aggregate(pipeline), {"total": 0}).get("total", 0)
-
-
 def get_works_by_person(person_id: str, query_params: QueryParams, pipeline_params: dict | None = None) -> Generator:
     if pipeline_params is None:
         pipeline_params = {}
@@ -89,13 +84,20 @@ def get_works_by_person(person_id: str, query_params: QueryParams, pipeline_para
     base_repository.set_match(pipeline, pipeline_params.get("match"))
     set_issn_to_pipeline(pipeline)
     if sort := query_params.sort:
-        base_repository.set_sort(sort, pipeline)
+        base_repository.set_sort(sort, pipeline, "works")
     base_repository.set_pagination(pipeline, query_params)
     base_repository.set_project(pipeline, pipeline_params.get("project"))
     cursor = database["works"].aggregate(pipeline)
     return work_generator.get(cursor)
 
 
+def get_works_page_by_person(
+    person_id: str, query_params: QueryParams, pipeline_params: dict | None = None
+) -> Tuple[Generator, int, str | None]:
+    pipeline = [{"$match": {"authors.id": person_id}}]
+    return get_works_page(pipeline, query_params, pipeline_params)
+
+
 def get_works_with_source_by_person(
     person_id: str, query_params: QueryParams, pipeline_params: dict | None = None
 ) -> Generator:
@@ -112,13 +114,6 @@ def get_works_with_source_by_person(
     return work_generator.get(cursor)
 
 
-def get_works_count_by_person(person_id: str, query_params: QueryParams) -> int:
-    pipeline: list[dict[str, Any]] = [{"$match": {"authors.id": person_id}}]
-    set_product_filters(pipeline, query_params)
-    pipeline += [{"$count": "total"}]
-    return next(database["works"].aggregate(pipeline), {"total": 0}).get("total", 0)
-
-
 def get_works_by_source(source_id: str, query_params: QueryParams, pipeline_params: dict) -> Generator:
     if pipeline_params is None:
         pipeline_params = {}
@@ -128,32 +123,56 @@ def get_works_by_source(source_id: str, query_params: QueryParams, pipeline_para
     base_repository.set_match(pipeline, pipeline_params.get("match"))
     set_issn_to_pipeline(pipeline)
     if sort := query_params.sort:
-        base_repository.set_sort(sort, pipeline)
+        base_repository.set_sort(sort, pipeline, "works")
     base_repository.set_pagination(pipeline, query_params)
     base_repository.set_project(pipeline, pipeline_params.get("project"))
     cursor = database["works"].aggregate(pipeline)
     return work_generator.get(cursor)
 
 
-def get_works_count_by_source(source_id: str, query_params: QueryParams) -> int:
-    pipeline: list[dict[str, Any]] = [{"$match": {"source.id": ObjectId(source_id)}}]
+def get_works_page_by_source(
+    source_id: str, query_params: QueryParams, pipeline_params: dict | None = None
+) -> Tuple[Generator, int, str | None]:
+    pipeline = [{"$match": {"source.id": ObjectId(source_id)}}]
+    return get_works_page(pipeline, query_params, pipeline_params)
+
+
+def get_works_page(
+    pipeline: list, query_params: QueryParams, pipeline_params: dict | None = None
+) -> Tuple[Generator, int, str | None]:
+    """
+    Page of the works selected by an entity $match and the product filters, together with their total.
+
+    The ISSN fields are only derived for the works of the page, since none of the sort keys depend on them.
+    """
+    if pipeline_params is None:
+        pipeline_params = {}
     set_product_filters(pipeline, query_params)
-    pipeline += [{"$count": "total"}]
-    return next(database["works"].aggregate(pipeline), {"total": 0}).get("total", 0)
+    base_repository.set_match(pipeline, pipeline_params.get("match"))
+    page_stages: list = []
+    if sort := query_params.sort:
+        base_repository.set_sort(sort, page_stages, "works")
+    base_repository.set_pagination(page_stages, query_params)
+    set_issn_to_pipeline(page_stages)
+    base_repository.set_project(page_stages, pipeline_params.get("project"))
+    works, total_results, next_cursor = base_repository.get_page_and_total("works", pipeline, page_stages, query_params)
+    return work_generator.get(works), total_results, next_cursor
 
 
-def search_works(query_params: QueryParams, pipeline_params: dict | None = None) -> Tuple[Generator, int]:
+def search_works(query_params: QueryParams, pipeline_params: dict | None = None) -> Tuple[Generator, int, str | None]:
     pipeline = []
     if query_params.keywords:
         pipeline.append({"$match": {"$text": {"$search": query_params.keywords}}})
     set_product_filters(pipeline, query_params)
     set_issn_to_pipeline(pipeline)
-    base_repository.set_search_end_stages(pipeline, query_params, pipeline_params)
-    works = database["works"].aggregate(pipeline)
+    base_repository.set_search_end_stages(pipeline, query_params, {**(pipeline_params or {}), "collection": "works"})
+    works, next_cursor = base_repository.get_page_documents(
+        database["works"].aggregate(pipeline), pipeline, query_params
+    )
 
     query_dict = query_params.model_dump(exclude_none=True)
     base_params = {"page", "limit", "sort"}
-    is_full_scan = set(query_dict.keys()) == base_params
+    is_full_scan = set(query_dict.keys()) - {"cursor"} == base_params
 
     if is_full_scan:
         total_results = database["works"].estimated_document_count()
@@ -165,7 +184,7 @@ def search_works(query_params: QueryParams, pipeline_params: dict | None = None)
         count_pipeline.append({"$count": "total_results"})
         total_results = next(database["works"].aggregate(count_pipeline), {"total_results": 0}).get("total_results", 0)
 
-    return work_generator.get(works), total_results
+    return work_generator.get(works), total_results, next_cursor
 
 
 def get_works_available_filters_by_person(person_id: str, query_params: QueryParams) -> dict:
@@ -191,16 +210,54 @@ def get_search_works_available_filters(query_params: QueryParams, pipeline_param
     return get_works_available_filters(pipeline, query_params)
 
 
+AVAILABLE_FILTERS_PROJECT = {
+    "types.source": 1,
+    "types.type": 1,
+    "types.code": 1,
+    "types.level": 1,
+    "year_published": 1,
+    "open_access.open_access_status": 1,
+    "subjects.source": 1,
+    "subjects.subjects.id": 1,
+    "subjects.subjects.name": 1,
+    "subjects.subjects.level": 1,
+    "authors.affiliations.addresses.country_code": 1,
+    "authors.ranking.source": 1,
+    "authors.ranking.rank": 1,
+    "groups.ranking.rank": 1,
+    "groups.ranking.source": 1,
+    "primary_topic": 1,
+}
+
+
 def get_works_available_filters(pipeline: list, query_params: QueryParams) -> dict:
+    """
+    Computes every filter of the products sidebar in a single scan of the matched works.
+
+    All facets share the base $match and product filters through one $facet stage. If the
+    resulting document would exceed MongoDB's size limits the same facets are folded in
+    Python over a streamed projection of the matched works.
+    """
     set_product_filters(pipeline, query_params)
-    available_filters = {}
-    collection = database["works"]
-
-    pipelines = {
-        "product_types": pipeline.copy()
-        + [
-            {"$project": {"types": 1}},
-            {"$project": {"types.provenance": 0}},
+    facet_pipeline = pipeline + [
+        {"$project": AVAILABLE_FILTERS_PROJECT},
+        {"$facet": get_available_filters_facets()},
+    ]
+    try:
+        available_filters: dict = next(database["works"].aggregate(facet_pipeline, allowDiskUse=True), {})
+    except OperationFailure as error:
+        if error.code not in base_repository.FACET_SIZE_ERROR_CODES:
+            raise
+        cursor = database["works"].aggregate(pipeline + [{"$project": AVAILABLE_FILTERS_PROJECT}], allowDiskUse=True)
+        return fold_available_filters(cursor)
+    years = available_filters.get("years") or [{"min_year": None, "max_year": None}]
+    available_filters["years"] = years[0]
+    return available_filters
+
+
+def get_available_filters_facets() -> dict:
+    return {
+        "product_types": [
             {"$unwind": "$types"},
             {
                 "$group": {
@@ -227,29 +284,16 @@ def get_works_available_filters(pipeline: list, query_params: QueryParams) -> di
                 }
             },
         ],
-        "years": pipeline.copy()
-        + [
-            {"$project": {"year_published": 1}},
+        "years": [
             {"$match": {"year_published": {"$type": "number"}}},
             {"$group": {"_id": None, "min_year": {"$min": "$year_published"}, "max_year": {"$max": "$year_published"}}},
             {"$project": {"_id": 0, "min_year": 1, "max_year": 1}},
         ],
-        "status": pipeline.copy()
-        + [
-            {"$project": {"open_access": 1}},
+        "status": [
             {"$group": {"_id": "$open_access.open_access_status", "count": {"$sum": 1}}},
             {"$sort": {"count": -1}},
         ],
-        "subjects": pipeline.copy()
-        + [
-            {
-                "$project": {
-                    "subjects.source": 1,
-                    "subjects.subjects.id": 1,
-                    "subjects.subjects.name": 1,
-                    "subjects.subjects.level": 1,
-                }
-            },
+        "subjects": [
             {"$unwind": "$subjects"},
             {"$unwind": "$subjects.subjects"},
             {
@@ -277,8 +321,7 @@ def get_works_available_filters(pipeline: list, query_params: QueryParams) -> di
                 }
             },
         ],
-        "countries": pipeline.copy()
-        + [
+        "countries": [
             {"$match": {"authors.affiliations.addresses.country_code": {"$ne": None}}},
             {"$project": {"_id": 1, "authors.affiliations.addresses.country_code": 1}},
             {"$unwind": "$authors"},
@@ -288,17 +331,14 @@ def get_works_available_filters(pipeline: list, query_params: QueryParams) -> di
             {"$group": {"_id": "$_id.country_code", "count": {"$sum": 1}}},
             {"$sort": {"count": -1}},
         ],
-        "authors_ranking": pipeline.copy()
-        + [
+        "authors_ranking": [
             {"$project": {"authors.ranking.source": 1, "authors.ranking.rank": 1}},
             {"$unwind": "$authors"},
             {"$unwind": "$authors.ranking"},
             {"$match": {"authors.ranking.source": "minciencias"}},
             {"$group": {"_id": "$authors.ranking"}},
         ],
-        "groups_ranking": pipeline.copy()
-        + [
-            {"$project": {"groups.ranking.rank": 1, "groups.ranking.source": 1}},
+        "groups_ranking": [
             {"$unwind": "$groups"},
             {"$project": {"rank_val": "$groups.ranking.rank", "source_val": "$groups.ranking.source"}},
             {"$match": {"source_val": "minciencias"}},
@@ -315,10 +355,8 @@ def get_works_available_filters(pipeline: list, query_params: QueryParams) -> di
             },
             {"$group": {"_id": "$rank_val"}},
         ],
-        "topics": pipeline.copy()
-        + [
+        "topics": [
             {"$match": {"primary_topic": {"$ne": {}}}},
-            {"$project": {"primary_topic.id": 1, "primary_topic.display_name": 1}},
             {
                 "$group": {
                     "_id": {"id": "$primary_topic.id", "display_name": "$primary_topic.display_name"},
@@ -330,20 +368,123 @@ def get_works_available_filters(pipeline: list, query_params: QueryParams) -> di
         ],
     }
 
-    def run_pipeline(key: str, pipe: list) -> Tuple[str, list | dict]:
-        if key == "years":
-            cursor = collection.aggregate(pipe)
-            return key, next(cursor, {"min_year": None, "max_year": None})
-        else:
-            return key, list(collection.aggregate(pipe))
 
-    with ThreadPoolExecutor(max_workers=8) as executor:
-        futures = [executor.submit(run_pipeline, k, v) for k, v in pipelines.items()]
-        for future in as_completed(futures):
-            key, result = future.result()
-            available_filters[key] = result
+def fold_available_filters(works: Iterable[dict]) -> dict:
+    """
+    Python counterpart of the $facet stages, folded over a stream of projected works.
+
+    It returns the same structure as the aggregation so `work_parser.parse_available_filters`
+    can consume either of them.
+    """
+    product_types: Counter = Counter()
+    subjects: Counter = Counter()
+    status: Counter = Counter()
+    countries: Counter = Counter()
+    topics: Counter = Counter()
+    authors_ranking: dict[str, dict] = {}
+    groups_ranking: dict[str, Any] = {}
+    min_year = max_year = None
+
+    for work in works:
+        for work_type in as_documents(work.get("types")):
+            product_types[
+                (work_type.get("source"), work_type.get("type"), work_type.get("code"), work_type.get("level"))
+            ] += 1
+
+        year = work.get("year_published")
+        if isinstance(year, (int, float)) and not isinstance(year, bool):
+            min_year = year if min_year is None or year < min_year else min_year
+            max_year = year if max_year is None or year > max_year else max_year
+
+        status[(work.get("open_access") or {}).get("open_access_status")] += 1
+
+        for subject in as_documents(work.get("subjects")):
+            for content in as_documents(subject.get("subjects")):
+                subjects[(subject.get("source"), content.get("id"), content.get("name"), content.get("level"))] += 1
+
+        country_codes = get_work_country_codes(work)
+        if country_codes is not None:
+            countries.update(country_codes)
+
+        for author in as_documents(work.get("authors")):
+            for ranking in as_documents(author.get("ranking")):
+                if isinstance(ranking, dict) and ranking.get("source") == "minciencias":
+                    authors_ranking.setdefault(str(ranking), ranking)
+
+        for group in as_documents(work.get("groups")):
+            rank = get_group_minciencias_rank(group)
+            if rank is not False:
+                groups_ranking.setdefault(str(rank), rank)
+
+        primary_topic = work.get("primary_topic")
+        if primary_topic != {}:
+            primary_topic = primary_topic if isinstance(primary_topic, dict) else {}
+            topics[(primary_topic.get("id"), primary_topic.get("display_name"))] += 1
+
+    return {
+        "product_types": group_counts_by_source(product_types, "types", ["type", "code", "level"]),
+        "years": {"min_year": min_year, "max_year": max_year},
+        "status": [{"_id": _id, "count": count} for _id, count in status.most_common()],
+        "subjects": group_counts_by_source(subjects, "subjects", ["id", "name", "level"]),
+        "countries": [{"_id": _id, "count": count} for _id, count in countries.most_common()],
+        "authors_ranking": [{"_id": ranking} for ranking in authors_ranking.values()],
+        "groups_ranking": [{"_id": rank} for rank in groups_ranking.values()],
+        "topics": [
+            {"id": _id, "display_name": display_name, "count": count}
+            for (_id, display_name), count in topics.most_common()
+        ],
+    }
 
-    return available_filters
+
+def group_counts_by_source(counts: Counter, items_key: str, fields: list[str]) -> list:
+    grouped: dict[Any, list] = defaultdict(list)
+    for (source, *values), count in counts.items():
+        item = {field: value for field, value in zip(fields, values) if value is not None}
+        grouped[source].append({**item, "count": count})
+    return [{"_id": source, items_key: items} for source, items in grouped.items()]
+
+
+def get_work_country_codes(work: dict) -> set | None:
+    """
+    Distinct country codes of a work, or None when any affiliation address lacks one,
+    mirroring the `$ne: None` match of the countries facet.
+    """
+    country_codes = set()
+    for author in as_documents(work.get("authors")):
+        if "affiliations" not in author:
+            return None
+        for affiliation in as_documents(author.get("affiliations")):
+            if "addresses" not in affiliation:
+                return None
+            for address in as_documents(affiliation.get("addresses")):
+                if address.get("country_code") is None:
+                    return None
+                country_codes.add(address["country_code"])
+    return country_codes
+
+
+def get_group_minciencias_rank(group: dict) -> Any:
+    """
+    Rank a group contributes to the groups_ranking facet, or False when it has no minciencias ranking.
+    """
+    ranking = group.get("ranking")
+    if isinstance(ranking, dict):
+        return ranking.get("rank") if ranking.get("source") == "minciencias" else False
+    if isinstance(ranking, list):
+        rankings = [rank for rank in ranking if isinstance(rank, dict)]
+        if "minciencias" not in [rank.get("source") for rank in rankings]:
+            return False
+        ranks = [rank["rank"] for rank in rankings if "rank" in rank]
+        return ranks[0] if ranks else None
+    return False
+
+
+def as_documents(value: Any) -> list:
+    """
+    Elements an $unwind of the value would yield, keeping only embedded documents.
+    """
+    items = value if isinstance(value, list) else [value]
+    return [item for item in items if isinstance(item, dict)]
 
 
 def set_product_filters(pipeline: list, query_params: QueryParams) -> None:
@@ -476,11 +617,22 @@ def set_issn_to_pipeline(pipeline: list) -> None:
     """
     Adds derived ISSN fields to the aggregation pipeline.
 
+    Nothing is added once the source ISSN postcalculation stored `source.issn_l`
+    and `source.issn` on the works of the current db update.
+    """
+    if postcalculations_repository.has_source_issn():
+        return
+    pipeline += get_issn_stages()
+
+
+def get_issn_stages() -> list:
+    """
     Extracts `issn_l` as a single string and builds the `issn` list
     (pISSN/eISSN/issn_l) from `source.external_ids`. If no ISSN data exists,
     it safely returns null and an empty list.
     """
-    pipeline.append(
+    stages: list = []
+    stages.append(
         {
             "$set": {
                 "_issn_data": {
@@ -494,7 +646,7 @@ def set_issn_to_pipeline(pipeline: list) -> None:
         }
     )
 
-    pipeline.append(
+    stages.append(
         {
             "$set": {
                 "source.issn_l": {
@@ -578,4 +730,5 @@ def set_issn_to_pipeline(pipeline: list) -> None:
         }
     )
 
-    pipeline.append({"$unset": "_issn_data"})
+    stages.append({"$unset": "_issn_data"})
+    return stages
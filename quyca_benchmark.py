@@ -0,0 +1,399 @@
+import argparse
+import inspect
+import json
+import math
+import platform
+import re
+import resource
+import statistics
+import threading
+import time
+from os import environ
+from sys import exit
+from typing import Any, Callable, Dict, List
+
+if "QUYCA_CONFIG_FILE" in environ:
+    print("Using configuration file:", environ["QUYCA_CONFIG_FILE"])
+else:
+    print("No configuration file set, please export QUYCA_CONFIG_FILE with the path to your config file.")
+    exit(1)
+
+# Cached plots and the explains of slow queries would make the runs after the first one measure
+# something else than the route; export them to override.
+environ.setdefault("PLOT_CACHE_ENABLED", "false")
+environ.setdefault("SLOW_QUERY_THRESHOLD_MS", "0")
+
+from pymongo import monitoring
+from pymongo.monitoring import CommandFailedEvent, CommandStartedEvent, CommandSucceededEvent
+
+from quyca.app import create_app
+from quyca.config import settings
+from quyca.domain.constants.institutions import institutions_list
+from quyca.domain.services import affiliation_plot_service, person_plot_service
+from quyca.infrastructure.mongo import database
+from quyca.infrastructure.repositories import hierarchy_repository
+
+FAMILIES = ["search", "entity", "listing", "filters", "plot", "csv", "api", "news"]
+# Plots of an institution, faculty or department computed over their child affiliations.
+AFFILIATION_RELATION_PLOTS = [
+    "faculties_by_product_type",
+    "departments_by_product_type",
+    "research_groups_by_product_type",
+    "citations_by_faculty",
+    "citations_by_department",
+    "citations_by_research_group",
+    "apc_expenses_by_faculty",
+    "apc_expenses_by_department",
+    "apc_expenses_by_group",
+    "h_index_by_faculty",
+    "h_index_by_department",
+    "h_index_by_research_group",
+]
+PAGE_QUERY = "page=1&max=10"
+MEMORY_SAMPLE_SECONDS = 0.005
+
+
+class CommandCounter(monitoring.CommandListener):
+    """
+    Counts the commands sent to MongoDB and the time spent in them, from every thread of the process.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.ops = 0
+        self.ms = 0.0
+
+    def started(self, event: CommandStartedEvent) -> None:
+        with self.lock:
+            self.ops += 1
+
+    def succeeded(self, event: CommandSucceededEvent) -> None:
+        with self.lock:
+            self.ms += event.duration_micros / 1000
+
+    def failed(self, event: CommandFailedEvent) -> None:
+        with self.lock:
+            self.ms += event.duration_micros / 1000
+
+    def read(self) -> tuple[int, float]:
+        with self.lock:
+            return self.ops, self.ms
+
+
+class MemorySampler:
+    """
+    Samples the resident memory of the process while a request runs, to get its peak over the memory
+    before it. Without /proc the growth of the peak RSS of the process is taken instead.
+    """
+
+    def __init__(self) -> None:
+        self.start = 0
+        self.peak = 0
+        self.running = False
+        self.thread: threading.Thread | None = None
+
+    def __enter__(self) -> "MemorySampler":
+        self.start = get_rss_bytes()
+        self.peak = self.start
+        self.running = True
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+        self.peak = max(self.peak, get_rss_bytes())
+
+    def sample(self) -> None:
+        while self.running:
+            self.peak = max(self.peak, get_rss_bytes())
+            time.sleep(MEMORY_SAMPLE_SECONDS)
+
+    @property
+    def growth(self) -> int:
+        return max(self.peak - self.start, 0)
+
+
+def get_rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        # ru_maxrss is in kilobytes on Linux, and only ever grows.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def get_percentile(values: List[float], percentile: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(math.ceil(percentile / 100 * len(ordered)) - 1, 0)]
+
+
+def get_first_id(collection: str, query: dict, sort_field: str = "products_count") -> Any:
+    """
+    Id of the entity of a collection with most products, so every dataset benchmarks its heaviest pages.
+    """
+    document = next(database[collection].find(query, {"_id": 1}).sort(sort_field, -1).limit(1), None)
+    return document["_id"] if document else None
+
+
+def get_news_person_id() -> Any:
+    for professor in database["news_professors_collection"].find({}, {"professor_id": 1}).limit(20):
+        professor_id = professor.get("professor_id")
+        person = database["person"].find_one(
+            {"external_ids.id": {"$in": [professor_id, str(professor_id)]}}, {"_id": 1}
+        )
+        if person:
+            return person["_id"]
+    return None
+
+
+def get_entity_ids() -> Dict[str, Any]:
+    return {
+        "person": get_first_id("person", {}),
+        "news_person": get_news_person_id() or get_first_id("person", {}),
+        "institution": get_first_id("affiliations", {"types.type": {"$in": institutions_list}}),
+        "faculty": get_first_id("affiliations", {"types.type": "faculty"}),
+        "department": get_first_id("affiliations", {"types.type": "department"}),
+        "group": get_first_id("affiliations", {"types.type": "group"}),
+        "source": get_first_id("sources", {}),
+        "work": get_first_id("works", {}, "author_count"),
+        "patent": get_first_id("patents", {}, "_id"),
+        "project": get_first_id("projects", {}, "_id"),
+    }
+
+
+def get_plot_names(service: Any) -> List[str]:
+    """
+    Plots served by a plot service: its plot_<name> functions taking the entity id and the query params.
+    """
+    return sorted(
+        name.removeprefix("plot_")
+        for name, function in inspect.getmembers(service, inspect.isfunction)
+        if name.startswith("plot_")
+        and function.__module__ == service.__name__
+        and len(inspect.signature(function).parameters) == 2
+    )
+
+
+def get_routes(ids: Dict[str, Any], keywords: str) -> List[Dict[str, str]]:
+    """
+    Routes to benchmark by family, named without ids so results of different datasets can be compared.
+    """
+    app = settings.APP_URL_PREFIX
+    api = settings.API_URL_PREFIX
+    routes: List[Dict[str, str]] = []
+
+    def add(family: str, name: str, url: str, *entities: str) -> None:
+        if all(ids.get(entity) is not None for entity in entities):
+            routes.append({"family": family, "name": name, "url": url.format(**ids)})
+
+    search = f"keywords={keywords}&{PAGE_QUERY}"
+    for entity in ["person", "works", "patents", "projects", "sources"]:
+        add("search", f"search.{entity}", f"{app}/search/{entity}?{search}")
+    for affiliation_type in ["institution", "faculty", "department", "group"]:
+        add(
+            "search",
+            f"search.affiliations.{affiliation_type}",
+            f"{app}/search/affiliations/{affiliation_type}?{search}",
+        )
+    add("filters", "search.works.filters", f"{app}/search/works/filters?keywords={keywords}")
+    add("filters", "search.sources.filters", f"{app}/search/sources/filters?keywords={keywords}")
+
+    add("entity", "person", f"{app}/person/{{person}}", "person")
+    add("entity", "source", f"{app}/source/{{source}}", "source")
+    add("entity", "work", f"{app}/work/{{work}}", "work")
+    add("entity", "work.authors", f"{app}/work/{{work}}/authors", "work")
+    add("entity", "patent", f"{app}/patent/{{patent}}", "patent")
+    add("entity", "project", f"{app}/project/{{project}}", "project")
+    add("listing", "person.products", f"{app}/person/{{person}}/research/products?{PAGE_QUERY}", "person")
+    add("listing", "person.patents", f"{app}/person/{{person}}/research/patents?{PAGE_QUERY}", "person")
+    add("listing", "person.projects", f"{app}/person/{{person}}/research/projects?{PAGE_QUERY}", "person")
+    add("listing", "source.products", f"{app}/source/{{source}}/products?{PAGE_QUERY}", "source")
+    add("filters", "person.products.filters", f"{app}/person/{{person}}/research/products/filters", "person")
+    add("filters", "source.products.filters", f"{app}/source/{{source}}/products/filters", "source")
+    add("csv", "person.products.csv", f"{app}/person/{{person}}/research/products/csv", "person")
+    add("csv", "source.products.csv", f"{app}/source/{{source}}/products/csv", "source")
+    add("news", "person.news", f"{app}/person/{{news_person}}/research/news", "news_person")
+
+    for affiliation_type in ["institution", "faculty", "department", "group"]:
+        prefix = f"{app}/affiliation/{affiliation_type}/{{{affiliation_type}}}"
+        name = f"affiliation.{affiliation_type}"
+        add("entity", name, prefix, affiliation_type)
+        add("entity", f"{name}.affiliations", f"{prefix}/affiliations", affiliation_type)
+        add("listing", f"{name}.products", f"{prefix}/research/products?{PAGE_QUERY}", affiliation_type)
+        add("listing", f"{name}.patents", f"{prefix}/research/patents?{PAGE_QUERY}", affiliation_type)
+        add("listing", f"{name}.projects", f"{prefix}/research/projects?{PAGE_QUERY}", affiliation_type)
+        add("filters", f"{name}.products.filters", f"{prefix}/research/products/filters", affiliation_type)
+        add("csv", f"{name}.products.csv", f"{prefix}/research/products/csv", affiliation_type)
+        add("news", f"{name}.news", f"{prefix}/research/news", affiliation_type)
+        add(
+            "api",
+            f"api.{name}.products",
+            f"{api}/affiliation/{affiliation_type}/{{{affiliation_type}}}/research/products?{PAGE_QUERY}",
+            affiliation_type,
+        )
+
+    for plot_name in get_plot_names(person_plot_service):
+        add("plot", f"plot.person.{plot_name}", f"{app}/person/{{person}}/research/products?plot={plot_name}", "person")
+    for plot_name in get_plot_names(affiliation_plot_service) + AFFILIATION_RELATION_PLOTS:
+        add(
+            "plot",
+            f"plot.institution.{plot_name}",
+            f"{app}/affiliation/institution/{{institution}}/research/products?plot={plot_name}",
+            "institution",
+        )
+    for plot_name in AFFILIATION_RELATION_PLOTS:
+        if plot_name.endswith(("department", "group")) or plot_name.startswith(("departments", "research_groups")):
+            add(
+                "plot",
+                f"plot.faculty.{plot_name}",
+                f"{app}/affiliation/faculty/{{faculty}}/research/products?plot={plot_name}",
+                "faculty",
+            )
+
+    add("api", "api.person", f"{api}/person/{{person}}", "person")
+    add("api", "api.person.products", f"{api}/person/{{person}}/research/products?{PAGE_QUERY}", "person")
+    add("api", "api.source.products", f"{api}/source/{{source}}/products?{PAGE_QUERY}", "source")
+    add("news", "api.person.news", f"{api}/person/{{news_person}}/research/news", "news_person")
+    for entity in ["person", "works", "sources"]:
+        add("api", f"api.search.{entity}", f"{api}/search/{entity}?{search}")
+    add("api", "api.search.affiliations.institution", f"{api}/search/affiliations/institution?{search}")
+    return routes
+
+
+def measure_route(
+    request: Callable[[str], Any], counter: CommandCounter, url: str, runs: int, warmup: int
+) -> Dict[str, Any]:
+    """
+    Latency percentiles, peak memory over the memory before the request and MongoDB commands of a route.
+    Bodies are read whole, so streamed responses (CSV) are measured until their last row.
+    """
+    for _ in range(warmup):
+        request(url).get_data()
+    latencies: List[float] = []
+    peaks: List[int] = []
+    ops: List[int] = []
+    mongo_ms: List[float] = []
+    status = 0
+    size = 0
+    for _ in range(runs):
+        start_ops, start_ms = counter.read()
+        with MemorySampler() as sampler:
+            start = time.perf_counter()
+            response = request(url)
+            size = len(response.get_data())
+            latencies.append((time.perf_counter() - start) * 1000)
+        end_ops, end_ms = counter.read()
+        status = response.status_code
+        peaks.append(sampler.growth)
+        ops.append(end_ops - start_ops)
+        mongo_ms.append(end_ms - start_ms)
+    return {
+        "status": status,
+        "bytes": size,
+        "p50_ms": round(get_percentile(latencies, 50), 2),
+        "p95_ms": round(get_percentile(latencies, 95), 2),
+        "p99_ms": round(get_percentile(latencies, 99), 2),
+        "mongo_ms": round(statistics.median(mongo_ms), 2),
+        "mongo_ops": max(ops),
+        "peak_memory_mb": round(max(peaks) / 2**20, 2),
+    }
+
+
+def get_regressions(
+    results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, min_ms: float, min_mb: float
+) -> List[str]:
+    """
+    Routes slower, heavier or chattier than the baseline beyond the tolerance. Small absolute changes
+    (min_ms, min_mb) are ignored, so fast routes do not fail on timer noise.
+    """
+    regressions: List[str] = []
+    for name, current in results["routes"].items():
+        previous = baseline["routes"].get(name)
+        if previous is None:
+            continue
+        if current["status"] >= 400 and previous["status"] < 400:
+            regressions.append(f"{name}: status {previous['status']} -> {current['status']}")
+        for metric, floor in [("p95_ms", min_ms), ("p99_ms", min_ms), ("peak_memory_mb", min_mb), ("mongo_ops", 0)]:
+            if current[metric] > previous[metric] * (1 + tolerance) and current[metric] - previous[metric] > floor:
+                regressions.append(f"{name}: {metric} {previous[metric]} -> {current[metric]}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Mide la latencia (p50/p95/p99), la memoria y las operaciones de MongoDB de las rutas de la API "
+        "y las compara con una línea base."
+    )
+    parser.add_argument("--runs", type=int, default=20, help="Peticiones medidas por ruta")
+    parser.add_argument("--warmup", type=int, default=1, help="Peticiones previas por ruta que no se miden")
+    parser.add_argument("--families", nargs="*", choices=FAMILIES, default=FAMILIES, help="Familias de rutas")
+    parser.add_argument("--routes", help="Expresión regular sobre los nombres de las rutas a medir")
+    parser.add_argument("--keywords", default="universidad", help="Texto de las búsquedas")
+    parser.add_argument("--output", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--baseline", help="Archivo JSON de la línea base con la que comparar")
+    parser.add_argument("--save-baseline", action="store_true", help="Guarda los resultados como la línea base")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Aumento relativo permitido sobre la base")
+    parser.add_argument("--min-ms", type=float, default=10, help="Aumento de latencia en ms que siempre se permite")
+    parser.add_argument("--min-mb", type=float, default=5, help="Aumento de memoria en MB que siempre se permite")
+    args = parser.parse_args()
+    if args.save_baseline and not args.baseline:
+        parser.error("--save-baseline requires --baseline")
+
+    counter = CommandCounter()
+    monitoring.register(counter)
+    client = create_app().test_client()
+    hierarchy_repository.get_hierarchy_index()
+    ids = get_entity_ids()
+    routes = [
+        route
+        for route in get_routes(ids, args.keywords)
+        if route["family"] in args.families and (not args.routes or re.search(args.routes, route["name"]))
+    ]
+    print(f"Benchmarking {len(routes)} routes, {args.runs} runs each")
+
+    results: Dict[str, Any] = {
+        "meta": {
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "runs": args.runs,
+            "counts": {
+                collection: database[collection].estimated_document_count()
+                for collection in ["works", "person", "affiliations", "sources"]
+            },
+        },
+        "routes": {},
+    }
+    failed: List[str] = []
+    for route in routes:
+        result = measure_route(client.get, counter, route["url"], args.runs, args.warmup)
+        results["routes"][route["name"]] = {"family": route["family"], **result}
+        if result["status"] >= 400:
+            failed.append(f"{route['name']}: status {result['status']}")
+        print(
+            f"{route['name']:<64} {result['status']} p50 {result['p50_ms']:>9.1f}ms  p95 {result['p95_ms']:>9.1f}ms  "
+            f"p99 {result['p99_ms']:>9.1f}ms  {result['peak_memory_mb']:>7.1f}MB  {result['mongo_ops']:>4} ops"
+        )
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as output:
+            json.dump(results, output, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    elif args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        failed += get_regressions(results, baseline, args.tolerance, args.min_ms, args.min_mb)
+    if failed:
+        print("\nFailures:")
+        for failure in failed:
+            print(f"  {failure}")
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
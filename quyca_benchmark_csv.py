@@ -0,0 +1,62 @@
+import argparse
+import time
+from os import environ
+from sys import exit
+from typing import Callable, Iterable
+
+if "QUYCA_CONFIG_FILE" in environ:
+    print("Using configuration file:", environ["QUYCA_CONFIG_FILE"])
+else:
+    print("No configuration file set, please export QUYCA_CONFIG_FILE with the path to your config file.")
+    exit(1)
+
+from quyca.domain.models.work_model import Work
+from quyca.domain.parsers import work_parser
+from quyca.domain.services import csv_service
+from quyca.infrastructure.mongo import database
+
+
+def get_model_rows(documents: list, columns: list) -> Iterable[dict]:
+    return csv_service.get_export_rows(csv_service.get_csv_data(Work(**document) for document in documents), columns)
+
+
+def get_raw_rows(documents: list, columns: list) -> Iterable[dict]:
+    return csv_service.get_csv_rows(documents, columns)
+
+
+def measure(get_rows: Callable[[list, list], Iterable[dict]], documents: list, columns: list, rounds: int) -> tuple:
+    best = float("inf")
+    output = ""
+    for _ in range(rounds):
+        start = time.perf_counter()
+        output = "".join(work_parser.parse_csv(get_rows(documents, columns), columns))
+        best = min(best, time.perf_counter() - start)
+    return len(documents) / best, output
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compara las filas por segundo del CSV de productos construido con modelos y con documentos."
+    )
+    parser.add_argument("--size", type=int, default=10000, help="Productos tomados al azar de la colección works")
+    parser.add_argument("--rounds", type=int, default=3, help="Repeticiones de cada medición, se toma la mejor")
+    args = parser.parse_args()
+
+    columns = list(csv_service.WORKS_EXPORT_COLUMNS)
+    project = csv_service.get_works_project_pipeline_params(columns)["project"]
+    pipeline = [{"$sample": {"size": args.size}}, {"$project": {"_id": 1, **{field: 1 for field in project}}}]
+    documents = list(database["works"].aggregate(pipeline, allowDiskUse=True))
+    print(f"Loaded {len(documents)} works")
+
+    model_rows_per_second, model_output = measure(get_model_rows, documents, columns, args.rounds)
+    raw_rows_per_second, raw_output = measure(get_raw_rows, documents, columns, args.rounds)
+    print(f"Work models:   {model_rows_per_second:,.0f} rows/s")
+    print(f"Raw documents: {raw_rows_per_second:,.0f} rows/s ({raw_rows_per_second / model_rows_per_second:.1f}x)")
+    if model_output != raw_output:
+        print("The CSV built from the raw documents differs from the one built from the Work models.")
+        exit(1)
+    print("Both CSV are identical.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from os import environ
+from sys import exit
+
+if "QUYCA_CONFIG_FILE" in environ:
+    print("Using configuration file:", environ["QUYCA_CONFIG_FILE"])
+else:
+    print("No configuration file set, please export QUYCA_CONFIG_FILE with the path to your config file.")
+    exit(1)
+
+from quyca.domain.services import work_service
+from quyca.infrastructure.repositories import affiliation_repository, filters_repository, info_repository
+from quyca.infrastructure.repositories import source_repository
+
+ENTITY_TYPES = ["institution", "faculty", "department", "group", "source"]
+
+
+def get_entities(entity_types: list[str]) -> list[tuple[str, str]]:
+    entities = []
+    for entity_type in entity_types:
+        if entity_type == "source":
+            entities += [("source", source_id) for source_id in source_repository.get_sources_ids()]
+        else:
+            entities += [
+                ("affiliation", affiliation_id)
+                for affiliation_id in affiliation_repository.get_affiliations_ids(entity_type)
+            ]
+    return entities
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Precalcula los filtros de productos de instituciones, facultades, departamentos, grupos y fuentes."
+    )
+    parser.add_argument(
+        "--types",
+        nargs="+",
+        choices=ENTITY_TYPES,
+        default=ENTITY_TYPES,
+        help="Tipos de entidad a procesar (por defecto todos)",
+    )
+    parser.add_argument("--workers", type=int, default=8, help="Número de hilos en paralelo (por defecto 8)")
+    parser.add_argument(
+        "--keep-outdated",
+        action="store_true",
+        help="No borrar los filtros calculados para actualizaciones anteriores de la base de datos",
+    )
+    args = parser.parse_args()
+
+    start_total = time.time()
+    db_update = info_repository.get_last_db_update()
+    entities = get_entities(args.types)
+    print(f"Building filters of {len(entities)} entities for db update {db_update}")
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = {
+            executor.submit(work_service.build_available_filters, entity, entity_id, db_update): (entity, entity_id)
+            for entity, entity_id in entities
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            entity, entity_id = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                failed += 1
+                print(f"Error building filters of {entity} {entity_id}: {e}")
+            if done % 100 == 0 or done == len(futures):
+                print(f"{done}/{len(futures)} entities — Total time: {time.time() - start_total:.2f}s")
+
+    if not args.keep_outdated:
+        deleted = filters_repository.delete_outdated_filters(db_update)
+        print(f"Deleted {deleted} outdated filters")
+    print(f"Done with {failed} errors in {time.time() - start_total:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
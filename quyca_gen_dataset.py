@@ -0,0 +1,81 @@
+import argparse
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from os import environ
+from sys import exit
+
+if "QUYCA_CONFIG_FILE" in environ:
+    print("Using configuration file:", environ["QUYCA_CONFIG_FILE"])
+else:
+    print("No configuration file set, please export QUYCA_CONFIG_FILE with the path to your config file.")
+    exit(1)
+
+from quyca.config import settings
+from quyca.domain.services import synthetic_data_service
+from quyca.infrastructure.repositories import index_repository, synthetic_data_repository
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Genera un conjunto de datos sintético y reproducible de works, person, affiliations, sources, "
+        "patents, projects y noticias, con inserciones masivas en paralelo."
+    )
+    parser.add_argument("--scale", type=float, default=1, help="Escala del conjunto de datos (1, 10, 100...)")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla; la misma semilla y escala dan los mismos datos")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Procesos que generan en paralelo")
+    parser.add_argument("--chunk-size", type=int, default=20000, help="Documentos generados por cada tarea")
+    parser.add_argument(
+        "--collections",
+        nargs="*",
+        choices=synthetic_data_service.COLLECTIONS,
+        default=synthetic_data_service.COLLECTIONS,
+        help="Colecciones a generar",
+    )
+    parser.add_argument("--drop", action="store_true", help="Borra las colecciones antes de generarlas")
+    parser.add_argument("--indexes", action="store_true", help="Construye los índices del catálogo al terminar")
+    args = parser.parse_args()
+
+    non_empty = synthetic_data_repository.get_non_empty_collections(args.collections)
+    if non_empty and not args.drop:
+        print(f"The collections {', '.join(non_empty)} of {settings.MONGO_DATABASE} are not empty, use --drop.")
+        exit(1)
+    if args.drop:
+        synthetic_data_repository.drop_collections(args.collections)
+
+    start_total = time.time()
+    plan = synthetic_data_service.get_plan(args.scale, args.seed)
+    chunks = synthetic_data_service.get_chunks(plan, args.collections, args.chunk_size)
+    for collection in args.collections:
+        print(f"{collection}: {plan['counts'][collection]} documents")
+
+    counts: Counter = Counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(synthetic_data_service.generate_chunk, chunk, plan) for chunk in chunks]
+        for future in as_completed(futures):
+            stats = future.result()
+            counts[stats["collection"]] += stats["count"]
+            print(
+                f"{stats['collection']} [{stats['start']}, {stats['end']}): {stats['count']} documents in "
+                f"{stats['seconds']:.2f}s ({stats['count'] / max(stats['seconds'], 1e-9):.0f} docs/s) — "
+                f"Total time: {time.time() - start_total:.2f}s"
+            )
+
+    start_counts = time.time()
+    synthetic_data_repository.set_products_counts()
+    print(f"Products counts set in {time.time() - start_counts:.2f}s")
+    print(f"Db update {synthetic_data_repository.set_db_update()} logged")
+
+    if args.indexes:
+        diff = index_repository.get_index_diff(args.collections)
+        for item in index_repository.ensure_indexes(diff):
+            print(f"Index {item['name']} built on {item['collection']} in {item['seconds']:.2f}s")
+
+    for collection, count in counts.items():
+        print(f"{collection}: {count} documents")
+    print(f"Total time: {time.time() - start_total:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
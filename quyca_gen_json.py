@@ -1,38 +1,38 @@
-import json
-from pymongo import MongoClient
+import argparse
+import shutil
+import time
+import warnings
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from os import environ, path
 from sys import exit
-import warnings
-import argparse
 
 warnings.filterwarnings("ignore", message="Pydantic serializer warnings:")
 warnings.filterwarnings("ignore")
-import time
 
 if "QUYCA_CONFIG_FILE" in environ:
     print("Using configuration file:", environ["QUYCA_CONFIG_FILE"])
 else:
-    print("No configuration file set, please export QUYCA_CONFIG_FILE with th e path to your config file.")
+    print("No configuration file set, please export QUYCA_CONFIG_FILE with the path to your config file.")
     exit(1)
 
-from quyca.domain.services.api_expert_service import search_works
-from quyca.domain.models.base_model import QueryParams
-
-qp = QueryParams()
-qp.page = 1
-qp.limit = 250
-qp.sort = None
+from quyca.domain.services import bulk_export_service
 
 
 def main() -> None:
-    parser = argparse.ArgumentParser(description="Exportar works de MongoDB a un archivo JSON.")
+    parser = argparse.ArgumentParser(
+        description="Exporta los works de MongoDB a un archivo JSON o NDJSON, por rangos de _id en paralelo."
+    )
     parser.add_argument("output_file", help="Nombre del archivo de salida (ej. impactu.json)")
-    parser.add_argument("database_name", help="Nombre de la base de datos MongoDB (ej. kahi_dev)")
+    parser.add_argument("--format", choices=["json", "ndjson"], default="json", help="Formato del archivo de salida")
+    parser.add_argument("--workers", type=int, default=4, help="Procesos que exportan rangos en paralelo")
+    parser.add_argument("--partitions", type=int, default=64, help="Rangos de _id en que se divide la colección")
+    parser.add_argument("--work-dir", help="Carpeta de fragmentos y checkpoints (por defecto <output_file>.parts)")
+    parser.add_argument("--restart", action="store_true", help="Descarta los checkpoints de una ejecución anterior")
+    parser.add_argument("--keep-parts", action="store_true", help="Conserva los fragmentos después de unirlos")
     args = parser.parse_args()
 
-    MongoClient()[args.database_name]["works"].count_documents({})
-
-    start_total = time.time()
+    work_dir = args.work_dir or f"{args.output_file}.parts"
     if path.exists(args.output_file):
         confirm = (
             input(f"The file '{args.output_file}' already exists. Do you want to overwrite it? [y/N]: ").strip().lower()
@@ -40,28 +40,47 @@ def main() -> None:
         if confirm != "y":
             print("Operation canceled.")
             exit(0)
-    with open(args.output_file, "w", encoding="utf-8") as f:
-        f.truncate(0)  # Borra el contenido del archivo
-        f.seek(0)
-        f.write("[\n")
-        first = True
-        qp.page = 1
-        works = search_works(qp)
-        while works["data"]:
-            start_iter = time.time()
-            for item in works["data"]:
-                if not first:
-                    f.write(",\n")
-                json.dump(item, f, ensure_ascii=False)
-                first = False
-            qp.page += 1
-            works = search_works(qp)
-            end_iter = time.time()
-            elapsed_iter = end_iter - start_iter
-            elapsed_total = end_iter - start_total
-            print(f"Time for page {qp.page-1}: {elapsed_iter:.2f}s — Total time: {elapsed_total:.2f}s")
+    if args.restart and path.exists(work_dir):
+        shutil.rmtree(work_dir)
+
+    start_total = time.time()
+    manifest = bulk_export_service.load_manifest(work_dir)
+    if manifest:
+        print(f"Resuming the export in {work_dir} with {len(manifest['partitions'])} partitions")
+    else:
+        manifest = {"partitions": bulk_export_service.get_partitions(args.partitions)}
+        bulk_export_service.save_manifest(work_dir, manifest)
+        print(f"Exporting to {work_dir} with {len(manifest['partitions'])} partitions")
+
+    workers: dict[int, dict[str, float]] = defaultdict(lambda: {"count": 0, "seconds": 0.0})
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [
+            executor.submit(bulk_export_service.export_partition, partition, work_dir)
+            for partition in manifest["partitions"]
+        ]
+        for future in as_completed(futures):
+            stats = future.result()
+            if stats["skipped"]:
+                print(f"Partition {stats['index']} already exported")
+                continue
+            workers[stats["pid"]]["count"] += stats["count"]
+            workers[stats["pid"]]["seconds"] += stats["seconds"]
+            print(
+                f"Partition {stats['index']}{' (resumed)' if stats['resumed'] else ''}: {stats['count']} works in "
+                f"{stats['seconds']:.2f}s ({stats['count'] / stats['seconds']:.0f} works/s) — "
+                f"Total time: {time.time() - start_total:.2f}s"
+            )
+
+    for pid, worker in sorted(workers.items()):
+        throughput = worker["count"] / worker["seconds"] if worker["seconds"] else 0
+        print(f"Worker {pid}: {worker['count']:.0f} works in {worker['seconds']:.2f}s ({throughput:.0f} works/s)")
 
-        f.write("\n]")
+    start_merge = time.time()
+    count = bulk_export_service.merge_shards(work_dir, len(manifest["partitions"]), args.output_file, args.format)
+    print(f"Merged {count} works into {args.output_file} in {time.time() - start_merge:.2f}s")
+    if not args.keep_parts:
+        shutil.rmtree(work_dir)
+    print(f"Total time: {time.time() - start_total:.2f}s")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,47 @@
+import argparse
+import json
+from os import environ
+from sys import exit
+
+if "QUYCA_CONFIG_FILE" in environ:
+    print("Using configuration file:", environ["QUYCA_CONFIG_FILE"])
+else:
+    print("No configuration file set, please export QUYCA_CONFIG_FILE with the path to your config file.")
+    exit(1)
+
+from quyca.infrastructure.repositories import index_repository
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compara el catálogo de índices con la base de datos y crea los que faltan."
+    )
+    parser.add_argument(
+        "command", choices=["diff", "ensure"], help="diff muestra las diferencias, ensure crea los índices"
+    )
+    parser.add_argument("--collections", nargs="*", help="Colecciones a revisar (por defecto todas las del catálogo)")
+    parser.add_argument(
+        "--hidden", action="store_true", help="Crea los índices ocultos; un ensure posterior los muestra"
+    )
+    parser.add_argument("--commit-quorum", help="commitQuorum de cada creación (ej. majority o votingMembers)")
+    parser.add_argument("--pause", type=float, default=0, help="Segundos de espera entre la creación de cada índice")
+    args = parser.parse_args()
+
+    diff = index_repository.get_index_diff(args.collections)
+    for item in diff:
+        if item["status"] != "ok" or args.command == "diff":
+            keys = json.dumps(dict(item["keys"]))
+            print(f"{item['status']:>8} {item['database']}.{item['collection']} {keys} {item['name'] or ''}")
+    if args.command == "diff":
+        exit(1 if any(item["status"] in ["missing", "hidden"] for item in diff) else 0)
+
+    commit_quorum = (
+        int(args.commit_quorum) if args.commit_quorum and args.commit_quorum.isdigit() else args.commit_quorum
+    )
+    for item in index_repository.ensure_indexes(diff, args.hidden, commit_quorum, args.pause):
+        action = "Unhid" if item["status"] == "hidden" else "Built hidden" if args.hidden else "Built"
+        print(f"{action} {item['name']} on {item['database']}.{item['collection']} in {item['seconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
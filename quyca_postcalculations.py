@@ -0,0 +1,47 @@
+import argparse
+import time
+from os import environ
+from sys import exit
+
+if "QUYCA_CONFIG_FILE" in environ:
+    print("Using configuration file:", environ["QUYCA_CONFIG_FILE"])
+else:
+    print("No configuration file set, please export QUYCA_CONFIG_FILE with the path to your config file.")
+    exit(1)
+
+from quyca.infrastructure.repositories import postcalculations_repository
+
+JOBS = {
+    "authors_affiliations_country": postcalculations_repository.set_works_authors_affiliations_country,
+    "authors_affiliations_country_code": postcalculations_repository.set_works_authors_affiliations_country_code,
+    "groups_ranking": postcalculations_repository.set_works_groups_ranking,
+    "authors_ranking": postcalculations_repository.set_works_authors_ranking,
+    "works_source_issn": postcalculations_repository.set_works_source_issn,
+    "works_sort_keys": postcalculations_repository.set_works_sort_keys,
+    "sources_sort_keys": postcalculations_repository.set_sources_sort_keys,
+    "sources_profile": postcalculations_repository.set_sources_profile,
+    "affiliations_groups": postcalculations_repository.set_affiliations_groups,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ejecuta los postcálculos sobre la base de datos después del ETL.")
+    parser.add_argument(
+        "jobs",
+        nargs="*",
+        choices=list(JOBS),
+        default=list(JOBS),
+        help="Postcálculos a ejecutar en orden (por defecto todos)",
+    )
+    args = parser.parse_args()
+
+    start_total = time.time()
+    for job in args.jobs:
+        start_job = time.time()
+        print(f"Running {job}...")
+        JOBS[job]()
+        print(f"Time for {job}: {time.time() - start_job:.2f}s — Total time: {time.time() - start_total:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
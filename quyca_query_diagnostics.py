@@ -0,0 +1,61 @@
+import argparse
+import json
+from os import environ
+from sys import exit
+
+if "QUYCA_CONFIG_FILE" in environ:
+    print("Using configuration file:", environ["QUYCA_CONFIG_FILE"])
+else:
+    print("No configuration file set, please export QUYCA_CONFIG_FILE with the path to your config file.")
+    exit(1)
+
+from quyca.config import settings
+from quyca.infrastructure.repositories import diagnostics_repository
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Resume las agregaciones lentas capturadas por la API y sugiere índices para ellas."
+    )
+    parser.add_argument("--limit", type=int, default=20, help="Número de formas de consulta a mostrar")
+    parser.add_argument("--collection", help="Muestra solo las consultas de esta colección")
+    parser.add_argument("--clear", action="store_true", help="Borra las consultas capturadas")
+    args = parser.parse_args()
+
+    if args.clear:
+        diagnostics_repository.clear_slow_queries()
+        print("Slow queries cleared.")
+        return
+
+    slow_queries = diagnostics_repository.get_slow_queries(args.limit, args.collection)
+    if not slow_queries:
+        print("No slow queries captured.")
+        return
+    for slow_query in slow_queries:
+        explain = slow_query.get("explain", {})
+        flags = [flag for flag in ["collscan", "in_memory_sort", "blocking_group", "used_disk"] if explain.get(flag)]
+        shape = json.loads(slow_query["shape"])
+        print(
+            f"\n{slow_query['_id']} {slow_query.get('database', settings.MONGO_DATABASE)}.{slow_query['collection']} "
+            f"({slow_query['module']}): {slow_query['count']} calls, "
+            f"total {slow_query['total_ms']:.0f}ms, avg {slow_query['total_ms'] / slow_query['count']:.0f}ms, "
+            f"max {slow_query['max_ms']:.0f}ms"
+        )
+        if "error" in explain:
+            print(f"  explain failed: {explain['error']}")
+        elif explain:
+            print(f"  flags: {', '.join(flags) or 'none'}")
+            print(f"  plan: {' > '.join(explain['plan_stages'])}  pipeline: {' > '.join(explain['pipeline_stages'])}")
+            print(f"  indexes: {', '.join(explain['indexes']) or 'none'}")
+            print(
+                f"  examined {explain['docs_examined']} docs and {explain['keys_examined']} keys "
+                f"to return {explain['returned']} in {explain['execution_ms']}ms"
+            )
+        candidate_index = diagnostics_repository.get_candidate_index(shape)
+        if candidate_index and (not explain or "collscan" in flags or "in_memory_sort" in flags):
+            print(f"  candidate index: {json.dumps(candidate_index)}")
+        print(f"  shape: {json.dumps(shape)[:300]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+from quyca.infrastructure.mongo import database
+from quyca.infrastructure.repositories import affiliation_repository, hierarchy_repository
+
+
+def test_hierarchy_index_children_match_affiliations_by_institution():
+    pipeline = [{"$match": {"types.type": {"$in": ["faculty", "department", "group"]}}}, {"$sample": {"size": 5}}]
+    for affiliation in database["affiliations"].aggregate(pipeline):
+        for relation in affiliation.get("relations") or []:
+            for affiliation_type in ["faculty", "department", "group"]:
+                expected = [
+                    child.model_dump(include={"id", "name"})
+                    for child in affiliation_repository.get_affiliations_by_institution(
+                        relation["id"], affiliation_type
+                    )
+                ]
+                assert hierarchy_repository.get_child_affiliations(relation["id"], affiliation_type) == expected
+
+
+def test_hierarchy_index_groups_match_groups_by_faculty_or_department():
+    pipeline = [
+        {"$match": {"types.type": {"$in": ["faculty", "department"]}, "relations.types.type": "Education"}},
+        {"$sample": {"size": 5}},
+    ]
+    for affiliation in database["affiliations"].aggregate(pipeline):
+        expected = sorted(
+            group.id for group in affiliation_repository.get_groups_by_faculty_or_department(affiliation["_id"])
+        )
+        assert sorted(hierarchy_repository.get_group_ids(affiliation["_id"])) == expected
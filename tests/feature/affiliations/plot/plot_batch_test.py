@@ -0,0 +1,25 @@
+import json
+
+from quyca.infrastructure.mongo import database
+
+
+def test_it_can_plot_a_batch_by_institution(client):
+    random_institution_id = (
+        database["affiliations"]
+        .aggregate([{"$match": {"types.type": "education"}}, {"$sample": {"size": 1}}])
+        .next()["_id"]
+    )
+    plots = ["annual_citation_count", "products_by_subject", "faculties_by_product_type", "citations_by_faculty"]
+    response = client.get(
+        f"/app/affiliation/institution/{random_institution_id}/research/products/plots?plots={','.join(plots)}"
+    )
+    assert response.status_code == 200
+    assert response.content_type == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert sorted(line["plot"] for line in lines) == sorted(plots)
+    assert all("data" in line for line in lines)
+
+
+def test_it_rejects_an_empty_plot_batch(client):
+    response = client.get("/app/affiliation/institution/any/research/products/plots")
+    assert response.status_code == 400
@@ -0,0 +1,30 @@
+from quyca.domain.models.base_model import QueryParams
+from quyca.infrastructure.mongo import database
+from quyca.infrastructure.repositories import plot_repository
+
+valid_sources = list(plot_repository.PRODUCTS_BY_DATABASE_SOURCES.keys())
+
+
+def count_exact_sources(match: dict, sources: list[str]) -> int:
+    expr = {"$setEquals": [{"$setIntersection": ["$updated.source", valid_sources]}, sources]}
+    return database["works"].count_documents({"$and": [match, {"$expr": expr}]})
+
+
+def test_products_by_database_masks_match_exact_source_counts():
+    random_institution_id = (
+        database["affiliations"]
+        .aggregate([{"$match": {"types.type": "education"}}, {"$sample": {"size": 1}}])
+        .next()["_id"]
+    )
+    match = {"authors.affiliations.id": random_institution_id}
+    regions = plot_repository.get_products_by_database_by_affiliation(random_institution_id, QueryParams(plot="plot"))
+    for region in ["scienti", "openalex", "scienti_openalex", "minciencias_openalex_scholar_scienti"]:
+        assert regions[region] == count_exact_sources(match, plot_repository.PRODUCTS_BY_DATABASE_REGIONS[region])
+
+
+def test_person_products_by_database_single_sources_count_containment():
+    random_person_id = database["person"].aggregate([{"$sample": {"size": 1}}]).next()["_id"]
+    match = {"authors.id": random_person_id}
+    regions = plot_repository.get_products_by_database_by_person(random_person_id, QueryParams(plot="plot"))
+    assert regions["scienti"] == database["works"].count_documents({**match, "updated.source": "scienti"})
+    assert regions["scienti_openalex"] == count_exact_sources(match, ["scienti", "openalex"])
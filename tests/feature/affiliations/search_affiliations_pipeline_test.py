@@ -0,0 +1,44 @@
+from quyca.domain.models.base_model import QueryParams
+from quyca.infrastructure.repositories import affiliation_repository
+
+
+def search_affiliations_page(affiliation_type, query_params):
+    pipeline_params = {"project": ["_id", "names", "relations", "types", "products_count", "relations_data"]}
+    affiliations, total_results, next_cursor = affiliation_repository.search_affiliations(
+        affiliation_type, query_params, pipeline_params
+    )
+    return [affiliation.model_dump() for affiliation in affiliations], total_results, next_cursor
+
+
+def test_search_affiliations_with_lookup_after_pagination_returns_the_same_page(monkeypatch):
+    for query_params in [
+        QueryParams(page=2, max=10, sort="products_desc"),
+        QueryParams(keywords="fisica", page=1, max=10, sort="alphabetical_asc"),
+        QueryParams(cursor="", max=10, sort="citations_desc"),
+    ]:
+        optimized = search_affiliations_page("faculty", query_params)
+        with monkeypatch.context() as patch:
+            patch.setattr(affiliation_repository.base_repository, "optimize_pipeline", lambda pipeline: None)
+            expected = search_affiliations_page("faculty", query_params)
+
+        assert optimized == expected
+
+
+def test_lookup_is_moved_after_pagination():
+    lookup = {"$lookup": {"from": "affiliations", "localField": "relations.id", "foreignField": "_id", "as": "data"}}
+    pipeline = [{"$match": {"types.type": "group"}}, lookup]
+
+    affiliation_repository.base_repository.set_search_end_stages(
+        pipeline, QueryParams(page=2, max=10, sort="products_desc"), {"project": ["_id", "relations", "data"]}
+    )
+
+    assert [next(iter(stage)) for stage in pipeline] == ["$match", "$sort", "$skip", "$limit", "$lookup", "$project"]
+
+
+def test_stage_computing_the_sort_key_is_not_moved():
+    pipeline = [{"$match": {"types.type": "group"}}, {"$addFields": {"key": "$names.name"}}]
+    pipeline += [{"$sort": {"key": 1, "_id": 1}}, {"$skip": 0}, {"$limit": 10}]
+
+    affiliation_repository.base_repository.optimize_pipeline(pipeline)
+
+    assert [next(iter(stage)) for stage in pipeline] == ["$match", "$addFields", "$sort", "$skip", "$limit"]
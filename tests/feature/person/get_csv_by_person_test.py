@@ -1,3 +1,7 @@
+import gzip
+import json
+import re
+
 from quyca.infrastructure.mongo import database
 
 random_person_id = database["person"].aggregate([{"$sample": {"size": 1}}]).next()["_id"]
@@ -7,3 +11,49 @@ def test_get_works_csv_by_person(client):
     response = client.get(f"/app/person/{random_person_id}/research/products/csv")
 
     assert response.status_code == 200
+
+
+def test_get_works_csv_by_person_is_streamed_and_gzipped(client):
+    response = client.get(f"/app/person/{random_person_id}/research/products/csv")
+    gzip_response = client.get(f"/app/person/{random_person_id}/research/products/csv?compression=gzip")
+
+    assert response.is_streamed
+    assert gzip_response.status_code == 200
+    assert gzip_response.content_type == "application/gzip"
+    assert gzip.decompress(gzip_response.get_data()) == response.get_data()
+
+
+def test_get_works_ndjson_by_person_with_columns(client):
+    response = client.get(
+        f"/app/person/{random_person_id}/research/products/csv?format=ndjson&columns=title,year_published"
+    )
+
+    assert response.status_code == 200
+    assert response.content_type == "application/x-ndjson"
+    for line in response.get_data(as_text=True).splitlines():
+        row = json.loads(line)
+        assert set(row) == {"title", "year_published"}
+        assert row["year_published"] is None or isinstance(row["year_published"], int)
+
+
+def test_get_works_csv_by_person_rejects_unknown_columns(client):
+    response = client.get(f"/app/person/{random_person_id}/research/products/csv?columns=title,unknown")
+
+    assert response.status_code == 400
+
+
+def test_get_works_ndjson_by_person_with_columns_and_filters(client):
+    work = database["works"].find_one(
+        {"authors.id": {"$regex": "^[0-9]{10}$"}, "year_published": {"$ne": None}, "types.source": "openalex"},
+        {"authors.id": 1, "year_published": 1},
+    )
+    person_id = next(author["id"] for author in work["authors"] if re.fullmatch("[0-9]{10}", str(author["id"])))
+    response = client.get(
+        f"/app/person/{person_id}/research/products/csv?format=ndjson&columns=title"
+        f"&years={work['year_published']}&product_types=openalex"
+    )
+
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert rows
+    assert all(set(row) == {"title"} for row in rows)
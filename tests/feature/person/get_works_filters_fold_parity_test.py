@@ -0,0 +1,16 @@
+from quyca.domain.models.base_model import QueryParams
+from quyca.infrastructure.mongo import database
+from quyca.infrastructure.repositories import work_repository
+
+
+def test_works_filters_fold_matches_facet():
+    random_person_id = database["person"].aggregate([{"$sample": {"size": 1}}]).next()["_id"]
+    pipeline = [{"$match": {"authors.id": random_person_id}}]
+    facet_filters = work_repository.get_works_available_filters(list(pipeline), QueryParams())
+    works = database["works"].aggregate(pipeline + [{"$project": work_repository.AVAILABLE_FILTERS_PROJECT}])
+    fold_filters = work_repository.fold_available_filters(works)
+    assert facet_filters["years"] == fold_filters["years"]
+    for key in ["status", "countries", "topics"]:
+        assert sorted(map(str, facet_filters[key])) == sorted(map(str, fold_filters[key]))
+    for key in ["product_types", "subjects", "authors_ranking", "groups_ranking"]:
+        assert len(facet_filters[key]) == len(fold_filters[key])
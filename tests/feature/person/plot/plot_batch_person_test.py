@@ -0,0 +1,28 @@
+import json
+
+from quyca.domain.services import plot_batch_service
+from quyca.infrastructure.mongo import database
+from quyca.infrastructure.repositories import loader_repository
+
+
+def test_it_can_plot_a_batch_by_person(client):
+    random_person_id = database["person"].aggregate([{"$sample": {"size": 1}}]).next()["_id"]
+    plots = ["annual_citation_count", "articles_by_publisher", "products_by_database"]
+    response = client.get(f"/app/person/{random_person_id}/research/products/plots?plots={','.join(plots)}")
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert sorted(line["plot"] for line in lines) == sorted(plots)
+    assert all("data" in line for line in lines)
+
+
+def test_a_plot_batch_shares_the_loader_cache_of_the_request():
+    loader_repository.start_loader_cache()
+    cache = loader_repository.loader_cache.get()
+    tasks = {plot: lambda: loader_repository.loader_cache.get() is cache for plot in ["first", "second", "third"]}
+    batch = plot_batch_service.stream_plots(tasks)
+    # The body of a streamed response is read after the request is torn down.
+    loader_repository.clear_loader_cache()
+
+    lines = [json.loads(line) for line in batch]
+    assert sorted(line["plot"] for line in lines) == ["first", "second", "third"]
+    assert all(line["data"] is True for line in lines)
@@ -0,0 +1,84 @@
+import json
+
+from quyca.domain.constants.articles_types import articles_types_list
+from quyca.domain.models.base_model import QueryParams
+from quyca.domain.parsers import bar_parser, pie_parser
+from quyca.domain.services import person_plot_service
+from quyca.infrastructure.mongo import database
+from quyca.infrastructure.repositories import work_repository
+
+articles_match = {"types.type": {"$in": articles_types_list}}
+
+
+def normalize(plot: list) -> list:
+    return sorted(plot, key=lambda item: json.dumps(item, sort_keys=True, default=str))
+
+
+def get_random_person_id() -> str:
+    return database["person"].aggregate([{"$sample": {"size": 1}}]).next()["_id"]
+
+
+def test_bar_plots_buckets_match_works_parsers():
+    person_id = get_random_person_id()
+    query_params = QueryParams(plot="plot")
+    expected = {
+        "annual_evolution_by_scienti_classification": bar_parser.parse_annual_evolution_by_scienti_classification(
+            work_repository.get_works_by_person(person_id, query_params, {"project": ["year_published", "types"]})
+        ),
+        "annual_citation_count": bar_parser.parse_annual_citation_count(
+            work_repository.get_works_by_person(person_id, query_params, {"project": ["citations_by_year"]})
+        ),
+        "annual_articles_open_access": bar_parser.parse_annual_articles_open_access(
+            work_repository.get_works_by_person(
+                person_id, query_params, {"project": ["year_published", "open_access"], "match": articles_match}
+            )
+        ),
+        "annual_articles_by_top_publishers": bar_parser.parse_annual_articles_by_top_publishers(
+            work_repository.get_works_with_source_by_person(
+                person_id,
+                query_params,
+                {
+                    "work_project": ["source.id", "source.name", "source.publisher.name", "year_published"],
+                    "match": {**articles_match, "source.publisher.name": {"$ne": None}},
+                },
+            )
+        ),
+    }
+    for plot, expected_plot in expected.items():
+        plot_function = getattr(person_plot_service, f"plot_{plot}")
+        actual_plot = plot_function(person_id, query_params)
+        assert normalize(actual_plot["plot"]) == normalize(expected_plot["plot"]), plot
+
+
+def test_pie_plots_buckets_match_works_parsers():
+    person_id = get_random_person_id()
+    query_params = QueryParams(plot="plot")
+    expected = {
+        "articles_by_publisher": pie_parser.parse_articles_by_publisher(
+            work_repository.get_works_with_source_by_person(
+                person_id,
+                query_params,
+                {"work_project": ["source.id", "source.name", "source.publisher.name"], "match": articles_match},
+            )
+        ),
+        "products_by_subject": pie_parser.parse_products_by_subject(
+            work_repository.get_works_by_person(
+                person_id,
+                query_params,
+                {
+                    "project": ["primary_topic.display_name"],
+                    "match": {"primary_topic.display_name": {"$exists": True, "$ne": None}},
+                },
+            )
+        ),
+        "articles_by_access_route": pie_parser.parse_products_by_access_route(
+            work_repository.get_works_by_person(
+                person_id, query_params, {"project": ["open_access"], "match": articles_match}
+            )
+        ),
+    }
+    for plot, expected_plot in expected.items():
+        plot_function = getattr(person_plot_service, f"plot_{plot}")
+        actual_plot = plot_function(person_id, query_params)
+        assert actual_plot["sum"] == expected_plot["sum"], plot
+        assert normalize(actual_plot["plot"]) == normalize(expected_plot["plot"]), plot
@@ -0,0 +1,22 @@
+from quyca.domain.models.base_model import QueryParams
+from quyca.infrastructure.repositories import person_repository
+
+
+def search_persons_page(query_params):
+    pipeline_params = {"project": ["_id", "full_name", "affiliations", "products_count", "logo"]}
+    persons, total_results, next_cursor = person_repository.search_persons(query_params, pipeline_params)
+    return [person.model_dump() for person in persons], total_results, next_cursor
+
+
+def test_search_persons_with_logo_after_pagination_returns_the_same_page(monkeypatch):
+    for query_params in [
+        QueryParams(page=3, max=10, sort="products_desc"),
+        QueryParams(keywords="maria", page=1, max=10, sort="citations_desc"),
+        QueryParams(cursor="", max=10, sort="products_asc"),
+    ]:
+        optimized = search_persons_page(query_params)
+        with monkeypatch.context() as patch:
+            patch.setattr(person_repository.base_repository, "optimize_pipeline", lambda pipeline: None)
+            expected = search_persons_page(query_params)
+
+        assert optimized == expected
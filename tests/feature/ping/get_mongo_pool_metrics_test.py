@@ -0,0 +1,9 @@
+from quyca.infrastructure.mongo import database
+
+
+def test_get_mongo_pool_metrics(client):
+    database["works"].find_one({}, {"_id": 1})
+    response = client.get("/ping/mongo")
+    assert response.status_code == 200
+    assert response.json["connected"] is True
+    assert all("checked_out" in pool for pool in response.json["pools"].values())
@@ -0,0 +1,30 @@
+import json
+
+from quyca.infrastructure.mongo import database
+
+
+def test_it_serves_repeated_plots_from_the_cache(client):
+    random_person_id = database["person"].aggregate([{"$sample": {"size": 1}}]).next()["_id"]
+    url = f"/app/person/{random_person_id}/research/products?plot=annual_citation_count&years=2020,2019"
+    first_response = client.get(url)
+    stats_before = client.get("/ping/plots").get_json()
+    second_response = client.get(url.replace("2020,2019", "2019,2020"))
+    stats_after = client.get("/ping/plots").get_json()
+
+    assert first_response.status_code == 200
+    assert second_response.get_json() == first_response.get_json()
+    assert stats_after["memory_hits"] == stats_before["memory_hits"] + 1
+    assert stats_after["misses"] == stats_before["misses"]
+    assert first_response.headers["X-Plot-Cache"] in ["miss", "shared-hit", "memory-hit"]
+    assert second_response.headers["X-Plot-Cache"] == "memory-hit"
+    assert "X-Plot-Cache" not in client.get("/ping/plots").headers
+
+
+def test_plot_batch_lines_report_the_plot_cache_outcome(client):
+    random_person_id = database["person"].aggregate([{"$sample": {"size": 1}}]).next()["_id"]
+    url = f"/app/person/{random_person_id}/research/products/plots?plots=annual_citation_count,products_by_database"
+    first_lines = [json.loads(line) for line in client.get(url).get_data(as_text=True).splitlines()]
+    second_lines = [json.loads(line) for line in client.get(url).get_data(as_text=True).splitlines()]
+
+    assert all(line["cache"] in ["miss", "shared-hit", "memory-hit"] for line in first_lines)
+    assert all(line["cache"] == "memory-hit" for line in second_lines)
@@ -0,0 +1,37 @@
+from unittest.mock import patch
+
+SERVICE_MOD = "quyca.domain.services.query_profile_service"
+
+
+def test_server_timing_header_reports_mongo_time(client):
+    response = client.get("/app/search/person?max=10&page=1&sort=products_desc")
+    assert response.status_code == 200
+    assert response.headers["Server-Timing"].startswith("mongo;dur=")
+    assert "mongo-person;dur=" in response.headers["Server-Timing"]
+
+
+def test_query_profile_breakdown_requires_admin(client):
+    response = client.get("/app/search/person?max=10&page=1", headers={"X-Query-Profile": "true"})
+    assert response.status_code == 200
+    assert "X-Query-Profile" not in response.headers
+    assert "query_profile" not in response.json
+
+
+def test_query_profile_breakdown_is_returned_in_the_body_for_admins(client):
+    plain_response = client.get("/app/search/person?max=10&page=1&sort=products_desc")
+    with patch(f"{SERVICE_MOD}.verify_jwt_in_request", return_value=True), patch(
+        f"{SERVICE_MOD}.get_jwt", return_value={"rol": "admin"}
+    ):
+        response = client.get(
+            "/app/search/person?max=10&page=1&sort=products_desc",
+            headers={"X-Query-Profile": "true", "Authorization": "Bearer fake.jwt.token"},
+        )
+
+    assert response.status_code == 200
+    assert "X-Query-Profile" not in response.headers
+    assert response.headers["Server-Timing"].startswith("mongo;dur=")
+    assert response.json["data"] == plain_response.json
+    breakdown = response.json["query_profile"]
+    assert breakdown["total"]["calls"] == sum(query["calls"] for query in breakdown["queries"])
+    assert breakdown["total"]["bytes"] > 0
+    assert any(query["collection"] == "person" for query in breakdown["queries"])
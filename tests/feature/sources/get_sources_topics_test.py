@@ -0,0 +1,47 @@
+import json
+
+from quyca.infrastructure.mongo import database
+from quyca.infrastructure.repositories import postcalculations_repository, source_repository
+
+
+def get_source_topics_one_by_one(source_id):
+    works_count = database["works"].count_documents({"source.id": source_id})
+    pipeline = [
+        {"$match": {"source.id": source_id, "primary_topic": {"$exists": True, "$ne": None}}},
+        {"$group": {"_id": "$primary_topic.id", "count": {"$sum": 1}, "topic": {"$first": "$primary_topic"}}},
+        {"$match": {"count": {"$gte": works_count * 0.02}}},
+        {"$project": {"_id": 0, "id": "$topic.id", "display_name": "$topic.display_name"}},
+    ]
+    return sorted(database["works"].aggregate(pipeline), key=lambda topic: json.dumps(topic, default=str))
+
+
+def test_sources_topics_in_one_aggregation_match_topics_by_source():
+    source_ids = [source["_id"] for source in database["sources"].aggregate([{"$sample": {"size": 10}}])]
+
+    sources_topics = source_repository.get_sources_topics(source_ids)
+
+    for source_id in source_ids:
+        topics = [
+            {"id": topic.get("id"), "display_name": topic.get("display_name")}
+            for topic in sources_topics.get(str(source_id), [])
+        ]
+        expected = [
+            {"id": topic.get("id"), "display_name": topic.get("display_name")}
+            for topic in get_source_topics_one_by_one(source_id)
+        ]
+        assert sorted(topics, key=lambda topic: json.dumps(topic, default=str)) == expected
+
+
+def test_sources_profiles_count_works_and_topics_shares():
+    source_ids = [source["_id"] for source in database["sources"].aggregate([{"$sample": {"size": 10}}])]
+
+    profiles = postcalculations_repository.compute_sources_profiles(source_ids)
+
+    for source_id in source_ids:
+        works_count = database["works"].count_documents({"source.id": source_id})
+        profile = profiles.get(str(source_id), {"works_count": 0, "topics_shares": [], "topics": []})
+        assert profile["works_count"] == works_count
+        assert sum(topic["count"] for topic in profile["topics_shares"]) <= works_count
+        assert sorted(str(topic.get("id")) for topic in profile["topics"]) == sorted(
+            str(topic.get("id")) for topic in profile["topics_shares"] if topic["count"] >= works_count * 0.02
+        )
@@ -0,0 +1,29 @@
+import json
+
+from quyca.domain.services import bulk_export_service
+from quyca.infrastructure.mongo import database
+
+
+def get_random_partition() -> tuple[dict, list]:
+    start_id = database["works"].aggregate([{"$sample": {"size": 1}}]).next()["_id"]
+    ids = [
+        work["_id"] for work in database["works"].find({"_id": {"$gte": start_id}}, {"_id": 1}).sort("_id").limit(21)
+    ]
+    return {"index": 0, "start_id": str(ids[0]), "end_id": str(ids[-1]) if len(ids) == 21 else None}, ids[:20]
+
+
+def test_export_partition_and_merge_shards(tmp_path):
+    partition, ids = get_random_partition()
+    work_dir = str(tmp_path / "parts")
+    bulk_export_service.save_manifest(work_dir, {"partitions": [partition]})
+
+    stats = bulk_export_service.export_partition(partition, work_dir)
+    resumed_stats = bulk_export_service.export_partition(partition, work_dir)
+    count = bulk_export_service.merge_shards(work_dir, 1, str(tmp_path / "works.json"), "json")
+
+    with open(tmp_path / "works.json", encoding="utf-8") as file:
+        works = json.load(file)
+    assert stats["count"] == count == len(ids)
+    assert resumed_stats["skipped"]
+    assert [work["id"] for work in works] == [str(_id) for _id in ids]
+    assert all("abstracts" not in work for work in works)
@@ -0,0 +1,71 @@
+from quyca.domain.models.work_model import Work
+from quyca.domain.parsers import work_parser
+from quyca.domain.services import csv_service
+from quyca.infrastructure.mongo import database
+
+columns = list(csv_service.WORKS_EXPORT_COLUMNS)
+
+
+def get_model_csv(documents: list) -> str:
+    works = (Work(**document) for document in documents)
+    return "".join(
+        work_parser.parse_csv(csv_service.get_export_rows(csv_service.get_csv_data(works), columns), columns)
+    )
+
+
+def get_raw_csv(documents: list) -> str:
+    return "".join(work_parser.parse_csv(csv_service.get_csv_rows(documents, columns), columns))
+
+
+def test_csv_rows_from_documents_match_work_models():
+    project = csv_service.get_works_project_pipeline_params(columns)["project"]
+    pipeline = [{"$sample": {"size": 500}}, {"$project": {"_id": 1, **{field: 1 for field in project}}}]
+    documents = list(database["works"].aggregate(pipeline))
+
+    assert get_raw_csv(documents) == get_model_csv(documents)
+
+
+def test_csv_rows_from_documents_match_work_models_on_edge_cases():
+    documents = [
+        {"_id": "5f8d0d55b54764421b7156c1"},
+        {
+            "_id": "5f8d0d55b54764421b7156c2",
+            "authors": [
+                {"full_name": "B", "affiliations": {"name": "Grupo", "types": [{"source": "x", "type": "group"}]}},
+                {"full_name": "A", "affiliations": [{"name": None, "types": [{"source": "x", "type": "education"}]}]},
+                {"full_name": None, "affiliations": None},
+            ],
+            "titles": [{"title": "T", "lang": "es", "source": "scienti"}, {"title": "U", "lang": None, "source": "x"}],
+            "ranking": [{"rank": float("nan"), "source": "publindex", "date": "2020"}],
+            "groups": [{"name": "G", "ranking": [{"rank": "A", "from_date": 1577836800, "to_date": 1609459200}]}],
+            "bibliographic_info": {"bibtex": "@article{\nx}", "volume": 3},
+            "citations_count": [{"source": "openalex", "count": None}, {"source": "scholar", "count": 7}],
+            "subjects": [{"source": "openalex", "subjects": [{"name": "B"}, {"name": "A"}, {"name": None}]}],
+            "types": [{"source": "openalex", "type": "article"}, {"source": "scienti", "type": "Artículo"}],
+            "primary_topic": {"display_name": "Topic", "subfield": "unknown", "field": {}, "domain": None},
+            "source": {
+                "name": float("nan"),
+                "apc": {"charges": 100, "currency": "USD"},
+                "ranking": [
+                    {"source": "scimago Best Quartile", "rank": "Q1", "from_date": 1500000000, "to_date": 1700000000}
+                ],
+            },
+            "date_published": 1600000000,
+            "year_published": "2020",
+            "open_access": None,
+            "doi": "",
+        },
+        {
+            "_id": "5f8d0d55b54764421b7156c3",
+            "ranking": "ranking",
+            "bibliographic_info": {},
+            "citations_count": "citations",
+            "subjects": [],
+            "types": [],
+            "primary_topic": {},
+            "source": {},
+            "open_access": {},
+        },
+    ]
+
+    assert get_raw_csv(documents) == get_model_csv(documents)
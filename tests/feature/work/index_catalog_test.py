@@ -0,0 +1,41 @@
+import re
+
+from quyca.config import settings
+from quyca.domain.models.base_model import QueryParams
+from quyca.infrastructure import mongo
+from quyca.infrastructure.mongo import database
+from quyca.infrastructure.repositories import (
+    index_repository,
+    news_repository,
+    person_repository,
+    plot_repository,
+    work_repository,
+)
+
+
+def test_catalog_indexes_exist():
+    diff = index_repository.get_index_diff()
+    assert [item for item in diff if item["status"] in ["missing", "hidden"]] == []
+
+
+def test_leading_matches_of_repositories_are_index_backed():
+    work = database["works"].find_one({"authors.affiliations.id": {"$exists": True}, "source.id": {"$exists": True}})
+    person_id = work["authors"][0]["id"]
+    affiliation_id = work["authors"][0]["affiliations"][0]["id"]
+    query_params = QueryParams(page=1, max=10, sort="citations_desc")
+
+    mongo.start_query_profile()
+    list(work_repository.get_works_by_person(person_id, query_params))
+    list(work_repository.get_works_by_source(str(work["source"]["id"]), query_params, {}))
+    person_repository.get_person_by_id(person_id)
+    plot_repository.affiliation_ids_for_institution(affiliation_id, "faculty")
+    list(news_repository.get_news_by_person(person_id, QueryParams(page=1, max=10)))
+    profile = mongo.stop_query_profile()
+
+    databases = {settings.MONGO_DATABASE: "main", settings.MONGO_CALCULATIONS_DATABASE: "calculations"}
+    for entry in profile["entries"].values():
+        leading_match = re.match(r"^(?:find|\$match)\(([^)]*)\)", entry["shape"])
+        if entry["database"] not in databases or not leading_match:
+            continue
+        fields = leading_match.group(1).split(",")
+        assert index_repository.is_index_backed(databases[entry["database"]], entry["collection"], fields), entry
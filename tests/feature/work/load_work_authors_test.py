@@ -0,0 +1,16 @@
+from quyca.infrastructure.mongo import database
+from quyca.infrastructure.repositories import loader_repository, person_repository
+
+
+def test_persons_loaded_in_batch_match_person_by_id():
+    work = database["works"].aggregate([{"$match": {"authors.1": {"$exists": True}}}, {"$sample": {"size": 1}}]).next()
+    author_ids = [str(author["id"]) for author in work["authors"] if author.get("id")]
+
+    loader_repository.start_loader_cache()
+    persons = loader_repository.get_persons_by_ids(author_ids)
+    cached_persons = loader_repository.get_persons_by_ids(author_ids)
+    loader_repository.clear_loader_cache()
+
+    assert cached_persons == persons
+    for person_id, person in persons.items():
+        assert person.external_ids == person_repository.get_person_by_id(person_id).external_ids
@@ -0,0 +1,56 @@
+from unittest.mock import patch
+
+from pymongo.collection import Collection
+from pymongo.errors import OperationFailure
+
+from quyca.config import settings
+from quyca.domain.models.base_model import QueryParams
+from quyca.infrastructure.mongo import database
+from quyca.infrastructure.repositories import base_repository, work_repository
+
+work = database["works"].find_one(
+    {"authors.id": {"$regex": "^[0-9]{10}$"}, "year_published": {"$ne": None}, "types.source": "openalex"},
+    {"authors.id": 1, "year_published": 1},
+)
+person_id = next(author["id"] for author in work["authors"] if len(str(author["id"])) == 10)
+query_params = QueryParams(
+    max=10,
+    page=1,
+    sort="year_desc",
+    years=f"{work['year_published'] - 5},{work['year_published']}",
+    product_types="openalex",
+)
+
+
+def get_page_and_total(max_match_size: int) -> tuple[list, int]:
+    base_repository.match_size_estimates.clear()
+    with patch.object(settings, "PAGE_FACET_MAX_MATCH_SIZE", max_match_size):
+        works, total, _ = work_repository.get_works_page_by_person(person_id, query_params, None)
+    return [work.id for work in works], total
+
+
+def test_facet_and_split_paths_return_the_same_page_and_total():
+    facet_page, facet_total = get_page_and_total(10**9)
+    split_page, split_total = get_page_and_total(0)
+
+    filters: list = []
+    work_repository.set_product_filters(filters, query_params)
+    count = database["works"].count_documents({"$and": [{"authors.id": person_id}] + [f["$match"] for f in filters]})
+    assert facet_page and facet_page == split_page
+    assert facet_total == split_total == count
+
+
+def test_facet_size_errors_fall_back_to_the_split_path():
+    aggregate = Collection.aggregate
+
+    def failing_facet_aggregate(collection: Collection, pipeline: list, *args, **kwargs):
+        if any("$facet" in stage for stage in pipeline):
+            raise OperationFailure("BSONObj size is too large", code=10334)
+        return aggregate(collection, pipeline, *args, **kwargs)
+
+    split_page, split_total = get_page_and_total(0)
+    with patch.object(Collection, "aggregate", autospec=True, side_effect=failing_facet_aggregate) as mocked:
+        fallback_page, fallback_total = get_page_and_total(10**9)
+
+    assert any("$facet" in stage for call in mocked.call_args_list for stage in call.args[1])
+    assert (fallback_page, fallback_total) == (split_page, split_total)
@@ -1,3 +1,8 @@
+import pytest
+
+from quyca.infrastructure.repositories import base_repository
+
+
 def test_search_works(client) -> None:
     response = client.get(f"/app/search/works?keywords=quantum&max=10&page=10&sort=citations_desc")
     assert response.status_code == 200
@@ -20,3 +25,31 @@ def test_search_works_without_keywords_with_filters(client) -> None:
         f"/app/search/works?max=10&page=10&product_type=scholar_article,scienti_Publicado en revista especializada"
     )
     assert response.status_code == 200
+
+
+def test_search_works_with_cursor(client) -> None:
+    response = client.get(f"/app/search/works?keywords=quantum&max=10&sort=citations_desc&cursor=")
+    assert response.status_code == 200
+    first_page = response.get_json()
+    assert first_page["next_cursor"]
+    response = client.get(
+        f"/app/search/works?keywords=quantum&max=10&sort=citations_desc&cursor={first_page['next_cursor']}"
+    )
+    assert response.status_code == 200
+    first_ids = {work["id"] for work in first_page["data"]}
+    assert not first_ids & {work["id"] for work in response.get_json()["data"]}
+
+
+def test_search_works_rejects_forged_cursors(client) -> None:
+    sort = {"citations_count_openalex": -1, "_id": -1}
+    forged_cursors = [
+        base_repository.encode_cursor(sort, [10], "citations_desc"),
+        base_repository.encode_cursor(sort, [{"$ne": None}, None], "citations_desc"),
+        base_repository.encode_cursor(sort, [10, {"$regex": "."}], "citations_desc"),
+    ]
+    for cursor in forged_cursors:
+        with pytest.raises(ValueError, match="Invalid cursor."):
+            base_repository.decode_cursor(cursor, sort, "citations_desc")
+        response = client.get(f"/app/search/works?keywords=quantum&max=10&sort=citations_desc&cursor={cursor}")
+        assert response.status_code == 400
+        assert response.get_json()["error"] == "Invalid cursor."
@@ -0,0 +1,48 @@
+from quyca.config import settings
+from quyca.infrastructure.mongo import calculations_database, database
+from quyca.infrastructure.repositories import diagnostics_repository
+
+
+def test_pipelines_for_different_entities_have_the_same_shape():
+    work = database["works"].find_one({"authors.id": {"$exists": True}}, {"authors.id": 1})
+    other_work = database["works"].find_one({"_id": {"$ne": work["_id"]}, "authors.id": {"$exists": True}})
+
+    shapes = [
+        diagnostics_repository.normalize_pipeline(
+            [{"$match": {"authors.id": author_id, "year_published": {"$gte": year}}}, {"$skip": skip}, {"$limit": 10}]
+        )
+        for author_id, year, skip in [(work["authors"][0]["id"], 2000, 0), (other_work["authors"][0]["id"], 2010, 20)]
+    ]
+
+    assert shapes[0] == shapes[1]
+
+
+def test_explain_summary_flags_collection_scan_and_suggests_index():
+    pipeline = [{"$match": {"unindexed_field": "value"}}, {"$sort": {"year_published": -1}}, {"$limit": 5}]
+    explain = database.command(
+        "explain", {"aggregate": "works", "pipeline": pipeline, "cursor": {}}, verbosity="executionStats"
+    )
+
+    summary = diagnostics_repository.get_explain_summary(explain)
+
+    assert summary["collscan"] is True
+    assert summary["in_memory_sort"] is True
+    candidate_index = diagnostics_repository.get_candidate_index(diagnostics_repository.normalize_pipeline(pipeline))
+    assert candidate_index == {"unindexed_field": 1, "year_published": -1}
+
+
+def test_slow_queries_are_explained_on_the_database_they_were_sent_to():
+    pipeline = [{"$match": {"names.name": "value"}}, {"$limit": 5}]
+    module = "slow_query_diagnostics_test"
+    for database_name in [settings.MONGO_DATABASE, settings.MONGO_CALCULATIONS_DATABASE]:
+        diagnostics_repository.capture_slow_query(database_name, "affiliations", pipeline, 5000.0, module)
+    diagnostics_repository.get_capture_executor().submit(lambda: None).result()
+
+    slow_queries = list(calculations_database["query_diagnostics"].find({"module": module}))
+    calculations_database["query_diagnostics"].delete_many({"module": module})
+
+    assert {slow_query["database"] for slow_query in slow_queries} == {
+        settings.MONGO_DATABASE,
+        settings.MONGO_CALCULATIONS_DATABASE,
+    }
+    assert all("error" not in slow_query["explain"] for slow_query in slow_queries)
@@ -0,0 +1,63 @@
+from unittest.mock import patch
+
+from quyca.domain.models.base_model import QueryParams
+from quyca.infrastructure.mongo import database
+from quyca.infrastructure.repositories import base_repository, postcalculations_repository
+
+SORTS = ["alphabetical_asc", "alphabetical_desc", "year_asc", "year_desc", "citations_asc", "citations_desc"]
+
+matches = {
+    collection: {
+        "_id": {
+            "$in": [
+                document["_id"]
+                for document in database[collection].aggregate([{"$sample": {"size": 300}}, {"$project": {"_id": 1}}])
+            ]
+        }
+    }
+    for collection in ["works", "sources"]
+}
+# The keys the postcalculation stores, for the sampled documents only.
+for collection, match in matches.items():
+    postcalculations_repository.set_sort_keys(collection, match)
+
+
+def get_sorted_ids(collection: str, sort: str, stored_keys: bool) -> list:
+    pipeline: list = [{"$match": matches[collection]}]
+    with patch.object(postcalculations_repository, "has_sort_keys", return_value=stored_keys):
+        base_repository.set_sort(sort, pipeline, collection)
+    return [document["_id"] for document in database[collection].aggregate(pipeline + [{"$project": {"_id": 1}}])]
+
+
+def get_keyset_ids(collection: str, sort: str, stored_keys: bool) -> list:
+    ids: list = []
+    cursor: str | None = ""
+    with patch.object(postcalculations_repository, "has_sort_keys", return_value=stored_keys):
+        while cursor is not None:
+            query_params = QueryParams(max=7, sort=sort, cursor=cursor)
+            pipeline: list = [{"$match": matches[collection]}]
+            base_repository.set_sort(sort, pipeline, collection)
+            base_repository.set_pagination(pipeline, query_params)
+            page, cursor = base_repository.get_page_documents(
+                database[collection].aggregate(pipeline), pipeline, query_params
+            )
+            ids += [document["_id"] for document in page]
+    return ids
+
+
+def test_stored_sort_keys_give_the_same_order_as_computed_ones():
+    for collection in matches:
+        for sort in SORTS:
+            stored_ids = get_sorted_ids(collection, sort, True)
+            assert stored_ids == get_sorted_ids(collection, sort, False), f"{collection} {sort}"
+            assert len(stored_ids) == len(matches[collection]["_id"]["$in"])
+
+
+def test_keyset_pages_cross_tied_keys_without_gaps_or_repeats():
+    for collection, sort, key in [("works", "year_desc", "year_published"), ("sources", "citations_desc", None)]:
+        sorted_ids = get_sorted_ids(collection, sort, False)
+        if key:
+            keys = [document.get(key) for document in database[collection].find(matches[collection], {key: 1})]
+            assert len(set(keys)) < len(keys)
+        for stored_keys in [True, False]:
+            assert get_keyset_ids(collection, sort, stored_keys) == sorted_ids, f"{collection} {sort}"
@@ -0,0 +1,44 @@
+from unittest.mock import patch
+
+from quyca.infrastructure.mongo import database
+from quyca.infrastructure.repositories import postcalculations_repository, work_repository
+
+work_ids = [
+    work["_id"]
+    for work in database["works"].aggregate(
+        [
+            {"$match": {"source.external_ids.source": {"$in": ["issn", "issn_l", "eissn", "pissn"]}}},
+            {"$sample": {"size": 200}},
+            {"$project": {"_id": 1}},
+        ]
+    )
+]
+match = {"_id": {"$in": work_ids}}
+# Until the postcalculation runs on this db update, the fields are stored for the sampled works only.
+if not postcalculations_repository.has_source_issn():
+    postcalculations_repository.set_source_issn(match)
+
+
+def test_stored_source_issn_matches_the_runtime_stages():
+    pipeline = [{"$match": match}, {"$unset": ["source.issn", "source.issn_l"]}] + work_repository.get_issn_stages()
+    computed = {
+        work["_id"]: work["source"]
+        for work in database["works"].aggregate(pipeline + [{"$project": {"source.issn": 1, "source.issn_l": 1}}])
+    }
+    stored = {
+        work["_id"]: work["source"] for work in database["works"].find(match, {"source.issn": 1, "source.issn_l": 1})
+    }
+
+    assert work_ids
+    assert stored == computed
+    assert any(source.get("issn") for source in stored.values())
+
+
+def test_works_have_the_same_issn_with_and_without_the_stored_fields():
+    for work_id in work_ids[:20]:
+        with patch.object(postcalculations_repository, "has_source_issn", return_value=True):
+            stored_work = work_repository.get_work_by_id(str(work_id))
+        with patch.object(postcalculations_repository, "has_source_issn", return_value=False):
+            computed_work = work_repository.get_work_by_id(str(work_id))
+
+        assert stored_work.source.model_dump() == computed_work.source.model_dump()
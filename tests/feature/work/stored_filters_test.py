@@ -0,0 +1,68 @@
+import json
+from unittest.mock import Mock, patch
+
+from quyca.domain.models.base_model import QueryParams
+from quyca.domain.services import work_service
+from quyca.infrastructure.mongo import database
+from quyca.infrastructure.repositories import filters_repository, info_repository, work_repository
+
+source_id = str(
+    database["works"]
+    .aggregate([{"$match": {"source.id": {"$exists": True}}}, {"$sample": {"size": 1}}])
+    .next()["source"]["id"]
+)
+
+
+def as_stored(available_filters: dict) -> dict:
+    normalized: dict = json.loads(json.dumps(available_filters, default=str))
+    return normalized
+
+
+def test_unfiltered_filters_are_read_from_the_stored_document():
+    db_update = info_repository.get_current_db_update()
+    work_service.build_available_filters("source", source_id, db_update)
+    compute = Mock(side_effect=AssertionError("the stored filters were not used"))
+
+    with patch.dict(work_service.available_filters_by_entity, {"source": compute}):
+        available_filters = work_service.get_stored_available_filters("source", source_id, QueryParams())
+
+    live_filters = work_repository.get_works_available_filters_by_source(source_id, QueryParams())
+    assert as_stored(available_filters) == as_stored(live_filters)
+
+
+def test_filters_in_another_order_share_the_stored_document():
+    query_params = QueryParams(product_types="openalex,scienti", years="2015,2020,2015")
+    reordered_query_params = QueryParams(product_types="scienti,openalex", years="2020,2015")
+    filters = filters_repository.get_normalized_filters(query_params)
+    reordered_filters = filters_repository.get_normalized_filters(reordered_query_params)
+    assert filters == reordered_filters
+    assert filters_repository.get_filters_key("source", source_id, filters) == filters_repository.get_filters_key(
+        "source", source_id, reordered_filters
+    )
+
+    available_filters = work_service.get_stored_available_filters("source", source_id, query_params)
+    compute = Mock(side_effect=AssertionError("the stored filters were not used"))
+    with patch.dict(work_service.available_filters_by_entity, {"source": compute}):
+        reordered_available_filters = work_service.get_stored_available_filters(
+            "source", source_id, reordered_query_params
+        )
+
+    assert as_stored(reordered_available_filters) == as_stored(available_filters)
+    live_filters = work_repository.get_works_available_filters_by_source(source_id, query_params)
+    assert as_stored(available_filters) == as_stored(live_filters)
+
+
+def test_a_new_db_update_recomputes_the_stored_filters():
+    db_update = info_repository.get_current_db_update()
+    work_service.build_available_filters("source", source_id, db_update)
+    compute = Mock(side_effect=work_repository.get_works_available_filters_by_source)
+
+    with patch.object(info_repository, "get_current_db_update", return_value=db_update + 1), patch.dict(
+        work_service.available_filters_by_entity, {"source": compute}
+    ):
+        work_service.get_stored_available_filters("source", source_id, QueryParams())
+
+    compute.assert_called_once()
+    assert filters_repository.get_available_filters("source", source_id, {}, db_update + 1) is not None
+    assert filters_repository.get_available_filters("source", source_id, {}, db_update) is None
+    work_service.build_available_filters("source", source_id, db_update)
@@ -0,0 +1,39 @@
+from quyca.domain.models.affiliation_model import Affiliation
+from quyca.domain.models.person_model import Person
+from quyca.domain.models.source_model import Source
+from quyca.domain.models.work_model import Work
+from quyca.domain.services import synthetic_data_service
+
+
+def test_synthetic_documents_are_seeded_and_match_the_models():
+    plan = synthetic_data_service.get_plan(0.1, 7)
+    models = {"works": Work, "person": Person, "affiliations": Affiliation, "sources": Source}
+    for collection, model in models.items():
+        step = max(plan["counts"][collection] // 50, 1)
+        for index in range(0, plan["counts"][collection], step):
+            document = synthetic_data_service.BUILDERS[collection](index, plan, {})
+            assert document == synthetic_data_service.BUILDERS[collection](index, plan, {})
+            model(**document)
+
+
+def test_synthetic_works_reference_the_generated_hierarchy():
+    plan = synthetic_data_service.get_plan(0.1, 7)
+    cache: dict = {}
+    affiliation_ids = {
+        synthetic_data_service.build_affiliation(index, plan, cache)["_id"]
+        for index in range(plan["counts"]["affiliations"])
+    }
+    person_ids = {
+        synthetic_data_service.build_person(index, plan, cache)["_id"] for index in range(plan["counts"]["person"])
+    }
+    authors_counts = []
+    for index in range(3000):
+        work = synthetic_data_service.build_work(index, plan, cache)
+        authors_counts.append(work["author_count"])
+        assert {author["id"] for author in work["authors"]} <= person_ids
+        assert {
+            affiliation["id"] for author in work["authors"] for affiliation in author["affiliations"]
+        } <= affiliation_ids
+        assert {group["id"] for group in work["groups"]} <= affiliation_ids
+    assert max(authors_counts) >= 1000 or plan["counts"]["person"] < 1000
+    assert sorted(authors_counts)[len(authors_counts) // 2] <= 5